@@ -0,0 +1,72 @@
+import os
+import sys
+import timeit
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, PROJECT_ROOT)
+
+from ruoyi_common.domain.entity import PermissionMatcher
+
+
+MODULES = ["system", "monitor", "tool", "museum", "exhibition", "collection", "activity", "media"]
+
+OBJECTS = ["user", "role", "menu", "dept", "post", "dict", "config", "notice", "job", "log"]
+
+ACTIONS = ["list", "query", "add", "edit", "remove", "export", "import"]
+
+
+def build_permissions():
+    """
+    构造一个拥有大量菜单权限的普通用户
+    """
+    return [f"{module}:{obj}:{action}" for module in MODULES for obj in OBJECTS for action in ACTIONS]
+
+
+def legacy_any_perm(user_authorities, permissions):
+    """
+    原实现：每次调用都拆分权限字符串，并在列表中逐个查找
+    """
+    for permission in permissions.split(","):
+        if "*:*:*" in user_authorities or permission.strip() in user_authorities:
+            return True
+    return False
+
+
+def legacy_has_role(role_keys, role):
+    """
+    原实现：每次调用都遍历用户的角色
+    """
+    for role_key in role_keys:
+        if role_key == "admin" or role_key == role.strip():
+            return True
+    return False
+
+
+def bench():
+    """
+    对比原实现与预编译匹配器在典型接口鉴权上的耗时
+    """
+    permissions = build_permissions()
+    role_keys = ["common", "museum_editor", "exhibition_editor", "auditor"]
+    matcher = PermissionMatcher(permissions, role_keys)
+    # 命中列表末尾的权限，与原实现线性查找的最坏情况相当
+    target = "media:log:import"
+    targets = ("tool:gen:code", target)
+    number = 100000
+
+    cases = [
+        ("has_perm", lambda: target in permissions or "*:*:*" in permissions, lambda: matcher.has_perm(target)),
+        ("any_perm", lambda: legacy_any_perm(permissions, "tool:gen:code, media:log:import"), lambda: matcher.any_perm(targets)),
+        ("has_role", lambda: legacy_has_role(role_keys, "auditor"), lambda: matcher.has_role("auditor")),
+    ]
+    print(f"权限数量: {len(permissions)}，每项执行 {number} 次")
+    for name, legacy, compiled in cases:
+        legacy_time = timeit.timeit(legacy, number=number)
+        compiled_time = timeit.timeit(compiled, number=number)
+        print(f"{name:<10} 原实现 {legacy_time * 1e6 / number:8.3f} us/次   "
+              f"预编译 {compiled_time * 1e6 / number:8.3f} us/次   "
+              f"提升 {legacy_time / compiled_time:6.1f} 倍")
+
+
+if __name__ == "__main__":
+    bench()
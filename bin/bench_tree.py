@@ -0,0 +1,94 @@
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, PROJECT_ROOT)
+
+from ruoyi_common.utils.base import TreeUtil
+
+
+def build_nodes(size, seed=42):
+    """
+    构造菜单列表：前若干个为顶级目录，其余节点随机挂在已有节点下，
+    按 parent_id、order_num 排序，与数据库查询结果的顺序一致
+    """
+    rnd = random.Random(seed)
+    nodes = []
+    for menu_id in range(1, size + 1):
+        parent_id = 0 if menu_id <= 20 else rnd.randint(max(1, menu_id - 2000), menu_id - 1)
+        nodes.append(SimpleNamespace(
+            menu_id=menu_id, parent_id=parent_id, order_num=rnd.randint(1, 50), children=[]
+        ))
+    nodes.sort(key=lambda node: (node.parent_id, node.order_num))
+    return nodes
+
+
+def legacy_build_tree(nodes):
+    """
+    原实现：在列表中判断父节点是否存在，并为每个节点重新扫描整个列表查找子节点
+    """
+    def get_child_list(t):
+        return [n for n in nodes if n.parent_id is not None and n.parent_id == t.menu_id]
+
+    def has_child(t):
+        for n in nodes:
+            if n.parent_id is not None and n.parent_id == t.menu_id:
+                return True
+        return False
+
+    def recursion_fn(t):
+        child_list = get_child_list(t)
+        t.children = child_list
+        for t_child in child_list:
+            if has_child(t_child):
+                recursion_fn(t_child)
+
+    return_list = []
+    temp_list = [node.menu_id for node in nodes]
+    for node in nodes:
+        if node.parent_id not in temp_list:
+            recursion_fn(node)
+            return_list.append(node)
+    return return_list
+
+
+def flatten(roots):
+    """
+    按前序遍历输出 (menu_id, 子节点ID列表)，用于校验两种实现结果一致
+    """
+    result = []
+    stack = list(reversed(roots))
+    while stack:
+        node = stack.pop()
+        result.append((node.menu_id, [child.menu_id for child in node.children]))
+        stack.extend(reversed(node.children))
+    return result
+
+
+def bench():
+    """
+    对比原递归实现与按父节点分组的 TreeUtil.build_tree 在不同规模菜单上的耗时
+    """
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 20000))
+    for size in (1000, 10000):
+        legacy_nodes = build_nodes(size)
+        start = time.perf_counter()
+        legacy_roots = legacy_build_tree(legacy_nodes)
+        legacy_time = time.perf_counter() - start
+
+        nodes = build_nodes(size)
+        start = time.perf_counter()
+        roots = TreeUtil.build_tree(nodes, "menu_id")
+        indexed_time = time.perf_counter() - start
+
+        assert flatten(roots) == flatten(legacy_roots), "两种实现构建的树不一致"
+        print(f"节点数 {size:>6}   原实现 {legacy_time * 1e3:10.2f} ms   "
+              f"分组实现 {indexed_time * 1e3:8.2f} ms   "
+              f"提升 {legacy_time / indexed_time:8.1f} 倍")
+
+
+if __name__ == "__main__":
+    bench()
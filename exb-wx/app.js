@@ -1,5 +1,5 @@
 // app.js
-import { api } from './utils/api.js'
+import { api, saveTokens } from './utils/api.js'
 
 App({
   onLaunch() {
@@ -17,8 +17,37 @@ App({
     });
   },
   
-  // 执行登录流程
+  // 执行登录流程，优先使用刷新令牌，刷新失败时再调用wx.login()
   performLogin() {
+    api.refreshToken().then(refreshed => {
+      if (refreshed) {
+        console.log('刷新令牌成功');
+        this.completeLogin({ user_info: wx.getStorageSync('user_info') });
+      } else {
+        this.loginWithCode();
+      }
+    });
+  },
+
+  // 登录完成，通知等待登录的页面
+  completeLogin(data) {
+    // 更新登录状态
+    this.globalData.isLoginCompleted = true;
+
+    // 通知其他页面登录已完成
+    if (this.onLoginSuccess) {
+      this.onLoginSuccess(data);
+    }
+
+    // 通知所有等待登录完成的页面
+    if (this.loginCallbacks && this.loginCallbacks.length > 0) {
+      this.loginCallbacks.forEach(callback => callback(data));
+      this.loginCallbacks = [];
+    }
+  },
+
+  // 调用wx.login()获取code换取令牌
+  loginWithCode() {
     wx.login({
       success: res => {
         if (res.code) {
@@ -26,8 +55,8 @@ App({
           api.login(res.code)
             .then(response => {
               if (response.code === 200) {
-                // 登录成功，保存 access_token
-                wx.setStorageSync('access_token', response.data.access_token);
+                // 登录成功，保存 access_token 与 refresh_token
+                saveTokens(response.data);
                 
                 // 可以选择性地保存其他用户信息
                 if (response.data.user_info) {
@@ -35,20 +64,7 @@ App({
                 }
                 
                 console.log('登录成功', response);
-                
-                // 更新登录状态
-                this.globalData.isLoginCompleted = true;
-                
-                // 通知其他页面登录已完成
-                if (this.onLoginSuccess) {
-                  this.onLoginSuccess(response.data);
-                }
-                
-                // 通知所有等待登录完成的页面
-                if (this.loginCallbacks && this.loginCallbacks.length > 0) {
-                  this.loginCallbacks.forEach(callback => callback(response.data));
-                  this.loginCallbacks = [];
-                }
+                this.completeLogin(response.data);
               } else {
                 console.error('登录失败', response);
                 // 即使登录失败也标记为完成，因为有些接口可能不需要登录
@@ -77,7 +93,8 @@ App({
   globalData: {
     userInfo: null,
     isLoginCompleted: false, // 添加登录状态标识
-    loginCallbacks: [] // 存储等待登录完成的回调函数
+    loginCallbacks: [], // 存储等待登录完成的回调函数
+    exhibitionBundles: {} // 展览导览包，按展览ID缓存，供展览单元详情页直接使用
   },
   
   // 等待登录完成的方法
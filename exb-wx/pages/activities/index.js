@@ -14,7 +14,9 @@ Page({
     canRegister: false,
     filters: ['全部', '讲座', '手工', '表演', '其他'],
     static_url: config.STATIC_URL,
-    isLoading: true
+    isLoading: true,
+    hasMore: false, // 是否还有更多数据
+    nextCursor: null // 下一页游标
   },
 
   /**
@@ -33,14 +35,15 @@ Page({
   /**
    * 加载教育活动列表数据
    */
-  loadEducations: async function () {
+  loadEducations: async function (loadMore = false) {
     try {
       this.setData({
         isLoading: true
       });
   
-      // 调用API获取教育活动列表
-      const response = await api.getEducations(this.data.museumId);
+      // 调用API获取教育活动列表，加载更多时带上一页返回的游标
+      const cursor = loadMore ? this.data.nextCursor : null;
+      const response = await api.getEducations(this.data.museumId, cursor);
   
       if (response.code === 200) {
         let educations = response.data || [];
@@ -54,12 +57,17 @@ Page({
           return item;
         });
         
-        // 设置教育活动数据并应用当前筛选条件
+        // 加载更多时追加，然后应用当前筛选条件
+        if (loadMore) {
+          educations = [...this.data.educations, ...educations];
+        }
         this.setData({
           educations: educations,
           filteredEducations: this.applyFilter(educations, this.data.currentFilter),
           isLoading: false,
-          canRegister: response.data.canRegister || false
+          canRegister: response.data.canRegister || false,
+          nextCursor: response.nextCursor || null,
+          hasMore: !!response.nextCursor
         });
       } else {
         throw new Error(response.msg || '获取教育活动列表失败');
@@ -71,12 +79,20 @@ Page({
         icon: 'error'
       });
       
-      // 设置空数组避免页面报错
+      // 加载更多失败时保留已加载的数据，否则设置空数组避免页面报错
+      if (loadMore) {
+        this.setData({
+          isLoading: false
+        });
+        return;
+      }
       this.setData({
         educations: [],
         filteredEducations: [],
         isLoading: false,
         canRegister: false,
+        nextCursor: null,
+        hasMore: false
       });
     }
   },
@@ -135,5 +151,14 @@ Page({
     this.loadEducations().then(() => {
       wx.stopPullDownRefresh();
     });
+  },
+
+  /**
+   * 滚动到底部事件 - 加载更多数据
+   */
+  onScrollToLower: function () {
+    if (!this.data.isLoading && this.data.hasMore) {
+      this.loadEducations(true);
+    }
   }
 });
@@ -1,6 +1,6 @@
 // 教育活动详情页面逻辑
 import config from '../../config/index.js';
-import { api } from '../../utils/api.js';
+import { api, createIdempotencyKey } from '../../utils/api.js';
 
 Page({
   /**
@@ -57,10 +57,12 @@ Page({
       success: (res) => {
         if (res.confirm) {
           // console.log('用户确认报名', education.id);
-          // 这里可以调用报名接口
-          api.addActivityReservation(education.id, '')
+          // 同一次报名在收到服务端结果前复用幂等键，网络失败后再次点击不会重复报名
+          this.reserveKey = this.reserveKey || createIdempotencyKey();
+          api.addActivityReservation(education.id, '', this.reserveKey)
           .then(response => {
             // console.log('报名成功', response);
+            this.reserveKey = null;
             if (response.code === 200) {
               wx.showToast({
                 title: '报名成功',
@@ -92,10 +94,11 @@ Page({
       success: (res) => {
         if (res.confirm) {
           // console.log('用户确认取消报名', education.id);
-          // 这里可以调用取消报名接口
-          api.cancelActivityReservation(education.reservationId)
+          this.cancelKey = this.cancelKey || createIdempotencyKey();
+          api.cancelActivityReservation(education.reservationId, this.cancelKey)
           .then(response => {
             // console.log('取消报名成功', response);
+            this.cancelKey = null;
             if (response.code === 200) {
               wx.showToast({
                 title: '取消报名成功',
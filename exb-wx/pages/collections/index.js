@@ -11,8 +11,7 @@ Page({
     filteredCollections: [], // 筛选后的展品数据
     isLoading: false, // 是否正在加载
     hasMore: false, // 是否还有更多数据
-    // page: 1, // 当前页码
-    // pageSize: 20, // 每页数量
+    nextCursor: null, // 下一页游标
     static_url: config.STATIC_URL // 静态资源地址
   },
 
@@ -80,7 +79,7 @@ Page({
   /**
    * 加载展品数据
    */
-  loadCollections: function () {
+  loadCollections: function (loadMore = false) {
     if (this.data.isLoading) {
       return;
     }
@@ -89,24 +88,23 @@ Page({
       isLoading: true
     });
 
-    // 调用API获取展品列表
-    api.getCollections(this.data.museumId)
+    // 调用API获取展品列表，加载更多时带上一页返回的游标
+    const cursor = loadMore ? this.data.nextCursor : null;
+    api.getCollections(this.data.museumId, cursor)
       .then(res => {
         if (res.code === 200) {
           const newCollections = res.data || [];
           
-          // 更新所有展品数据
-          // const updatedCollections = [...newCollections, ...newCollections];
-          const updatedCollections = [...newCollections]
+          // 加载更多时追加，否则替换
+          const updatedCollections = loadMore ? [...this.data.collections, ...newCollections] : [...newCollections];
           
           this.setData({
             collections: updatedCollections,
-            // 初始时显示所有数据
-            filteredCollections: updatedCollections,
             isLoading: false,
-            // hasMore: newCollections.length === this.data.pageSize // 如果返回的数量等于每页数量，说明可能还有更多
-            hasMore: false,
+            nextCursor: res.nextCursor || null,
+            hasMore: !!res.nextCursor,
           });
+          this.applyFilter();
         } else {
           console.error('获取展品列表失败:', res.msg || '未知错误');
           this.setData({
@@ -127,10 +125,7 @@ Page({
    */
   onScrollToLower: function () {
     if (!this.data.isLoading && this.data.hasMore) {
-      this.setData({
-        // page: this.data.page + 1
-      });
-      this.loadCollections();
+      this.loadCollections(true);
     }
   },
 
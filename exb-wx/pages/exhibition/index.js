@@ -12,7 +12,9 @@ Page({
     filteredExhibitions: [],
     currentFilter: '全部',
     static_url: config.STATIC_URL,
-    isLoading: true
+    isLoading: true,
+    hasMore: false, // 是否还有更多数据
+    nextCursor: null // 下一页游标
   },
 
   /**
@@ -31,14 +33,15 @@ Page({
   /**
    * 加载展览列表数据
    */
-  loadExhibitions: async function () {
+  loadExhibitions: async function (loadMore = false) {
     try {
       this.setData({
         isLoading: true
       });
   
-      // 调用API获取展览列表
-      const response = await api.getExhibitions(this.data.museumId);
+      // 调用API获取展览列表，加载更多时带上一页返回的游标
+      const cursor = loadMore ? this.data.nextCursor : null;
+      const response = await api.getExhibitions(this.data.museumId, cursor);
   
       if (response.code === 200) {
         let exhibitions = response.data || [];
@@ -51,11 +54,16 @@ Page({
           return item;
         });
         
-        // 设置展览数据并应用当前筛选条件
+        // 加载更多时追加，然后应用当前筛选条件
+        if (loadMore) {
+          exhibitions = [...this.data.exhibitions, ...exhibitions];
+        }
         this.setData({
           exhibitions: exhibitions,
           filteredExhibitions: this.applyFilter(exhibitions, this.data.currentFilter),
-          isLoading: false
+          isLoading: false,
+          nextCursor: response.nextCursor || null,
+          hasMore: !!response.nextCursor
         });
       } else {
         throw new Error(response.msg || '获取展览列表失败');
@@ -67,11 +75,19 @@ Page({
         icon: 'error'
       });
       
-      // 设置空数组避免页面报错
+      // 加载更多失败时保留已加载的数据，否则设置空数组避免页面报错
+      if (loadMore) {
+        this.setData({
+          isLoading: false
+        });
+        return;
+      }
       this.setData({
         exhibitions: [],
         filteredExhibitions: [],
-        isLoading: false
+        isLoading: false,
+        nextCursor: null,
+        hasMore: false
       });
     }
   },
@@ -131,5 +147,14 @@ Page({
     this.loadExhibitions().then(() => {
       wx.stopPullDownRefresh();
     });
+  },
+
+  /**
+   * 滚动到底部事件 - 加载更多数据
+   */
+  onScrollToLower: function () {
+    if (!this.data.isLoading && this.data.hasMore) {
+      this.loadExhibitions(true);
+    }
   }
 });
\ No newline at end of file
@@ -142,9 +142,11 @@ Page({
    */
   loadExhibitionDetail: async function(exhibitionId) {
     try {
-      const response = await api.getExhibitionDetail(exhibitionId);
+      // 一次请求加载整个展览的导览包，单元详情页直接从导览包中取数据
+      const response = await api.getExhibitionBundle(exhibitionId);
       
       if (response.code === 200) {
+        getApp().globalData.exhibitionBundles[exhibitionId] = response.data;
         const exhibitionData = response.data.exhibition;
         const units = response.data.units || [];
         
@@ -401,7 +403,7 @@ Page({
     if (!unit) return;
 
     wx.navigateTo({
-      url: `/pages/unit_detail/index?id=${unit.id}&name=${encodeURIComponent(unit.name || unit.unit_name || '')}&description=${encodeURIComponent(unit.description || unit.guideText || unit.guide_text || '')}`
+      url: `/pages/unit_detail/index?id=${unit.id}&exhibitionId=${this.data.exhibition.id}&name=${encodeURIComponent(unit.name || unit.unit_name || '')}&description=${encodeURIComponent(unit.description || unit.guideText || unit.guide_text || '')}`
     });
   },
 
@@ -1,6 +1,6 @@
 // 我的活动预约清单页面逻辑
 import config from '../../../config/index.js';
-import { api } from '../../../utils/api.js';
+import { api, createIdempotencyKey } from '../../../utils/api.js';
 
 Page({
   /**
@@ -8,7 +8,10 @@ Page({
    */
   data: {
     reservations: [],
-    static_url: config.STATIC_URL
+    static_url: config.STATIC_URL,
+    isLoading: false, // 是否正在加载
+    hasMore: false, // 是否还有更多数据
+    nextCursor: null // 下一页游标
   },
 
   /**
@@ -28,17 +31,28 @@ Page({
   /**
    * 加载我的活动预约清单
    */
-  loadMyActivityReservations: function () {
+  loadMyActivityReservations: function (loadMore = false) {
+    if (this.data.isLoading) {
+      return;
+    }
+    this.setData({
+      isLoading: true
+    });
     wx.showLoading({
       title: '加载中...'
     });
 
-    api.getMyActivityReservations()
+    // 加载更多时带上一页返回的游标
+    const cursor = loadMore ? this.data.nextCursor : null;
+    api.getMyActivityReservations(cursor)
       .then(response => {
         // console.log('获取我的活动预约成功', response);
         if (response.code === 200) {
+          const reservations = response.data || [];
           this.setData({
-            reservations: response.data || []
+            reservations: loadMore ? [...this.data.reservations, ...reservations] : reservations,
+            nextCursor: response.nextCursor || null,
+            hasMore: !!response.nextCursor
           });
         } else {
           wx.showToast({
@@ -55,10 +69,22 @@ Page({
         });
       })
       .finally(() => {
+        this.setData({
+          isLoading: false
+        });
         wx.hideLoading();
       });
   },
 
+  /**
+   * 滚动到底部事件 - 加载更多数据
+   */
+  onScrollToLower: function () {
+    if (!this.data.isLoading && this.data.hasMore) {
+      this.loadMyActivityReservations(true);
+    }
+  },
+
   /**
    * 取消预约活动
    */
@@ -71,9 +97,13 @@ Page({
       content: `确定要取消预约"${activityTitle}"吗？`,
       success: (res) => {
         if (res.confirm) {
-          api.cancelActivityReservation(reservationId)
+          // 同一条预约的取消在收到服务端结果前复用幂等键，网络失败后再次点击不会重复执行
+          this.cancelKeys = this.cancelKeys || {};
+          this.cancelKeys[reservationId] = this.cancelKeys[reservationId] || createIdempotencyKey();
+          api.cancelActivityReservation(reservationId, this.cancelKeys[reservationId])
             .then(response => {
               // console.log('取消预约成功', response);
+              delete this.cancelKeys[reservationId];
               if (response.code === 200) {
                 wx.showToast({
                   title: '取消预约成功',
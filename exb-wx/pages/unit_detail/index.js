@@ -65,7 +65,7 @@ Page({
     });
 
     // 加载展览单元详情数据
-    this.loadUnitDetail(unitId);
+    this.loadUnitDetail(unitId, options.exhibitionId);
     
     // 初始化音频管理器回调
     this.initAudioCallbacks();
@@ -148,56 +148,56 @@ Page({
   /**
    * 加载展览单元详情数据
    */
-  loadUnitDetail: async function(unitId) {
+  loadUnitDetail: async function(unitId, exhibitionId) {
     try {
-      // 注意：这里需要后端提供获取单个展览单元详情的API
-      // 暂时使用模拟数据，实际开发时需要调用真实的API
-      const response = await api.getUnitDetail(unitId);
-      
-      if (response.code === 200) {
-        const unitData = response.data;
-        
-        // 提取媒体信息
-        const images = [];
-        let audioUrl = '';
-        let hasAudio = false;
-        
-        if (unitData.mediaList && Array.isArray(unitData.mediaList)) {
-          unitData.mediaList.forEach(media => {
-            if (media.type === 1 || media.type === 2) { // 图片和视频类型
-              images.push(media);
-            } else if (media.type === 3) { // 音频类型
-              audioUrl = media.url;
-              hasAudio = true;
-            }
-          });
+      // 优先使用展览详情页已加载的导览包，取不到时再单独请求单元详情
+      let unitData = this.getUnitFromBundle(exhibitionId, unitId);
+      if (!unitData) {
+        const response = await api.getUnitDetail(unitId);
+        if (response.code !== 200) {
+          throw new Error(response.msg || '获取展览单元详情失败');
         }
-        
-        // 更新展览单元基本信息
-        this.setData({
-          unit: {
-            id: unitData.id || unitId,
-            name: unitData.name || unitData.unit_name || this.data.unit.name,
-            description: unitData.description || this.data.unit.description,
-            guideText: unitData.guideText || unitData.guide_text || '',
-            exhibitLabel: unitData.exhibitLabel || unitData.exhibit_label || '',
-            unitType: unitData.type || 0,
-            section: unitData.section || '',
-            images: images,
-            audioUrl: unitData.audioUrl || audioUrl,
-            hasAudio: unitData.hasAudio || hasAudio,
-            videoUrl: unitData.videoUrl || '',
-            hasVideo: unitData.hasVideo || false,
-            collectionsDetail: unitData.collectionsDetail || [] // 添加关联藏品详情
-          },
-          isLoading: false
+        unitData = response.data;
+      }
+      
+      // 提取媒体信息
+      const images = [];
+      let audioUrl = '';
+      let hasAudio = false;
+      
+      if (unitData.mediaList && Array.isArray(unitData.mediaList)) {
+        unitData.mediaList.forEach(media => {
+          if (media.type === 1 || media.type === 2) { // 图片和视频类型
+            images.push(media);
+          } else if (media.type === 3) { // 音频类型
+            audioUrl = media.url;
+            hasAudio = true;
+          }
         });
-        
-        // 更新导览词显示
-        this.updateIntroDisplay(unitData.guideText || unitData.guide_text || '');
-      } else {
-        throw new Error(response.msg || '获取展览单元详情失败');
       }
+      
+      // 更新展览单元基本信息
+      this.setData({
+        unit: {
+          id: unitData.id || unitId,
+          name: unitData.name || unitData.unit_name || this.data.unit.name,
+          description: unitData.description || this.data.unit.description,
+          guideText: unitData.guideText || unitData.guide_text || '',
+          exhibitLabel: unitData.exhibitLabel || unitData.exhibit_label || '',
+          unitType: unitData.type || 0,
+          section: unitData.section || '',
+          images: images,
+          audioUrl: unitData.audioUrl || audioUrl,
+          hasAudio: unitData.hasAudio || hasAudio,
+          videoUrl: unitData.videoUrl || '',
+          hasVideo: unitData.hasVideo || false,
+          collectionsDetail: unitData.collectionsDetail || [] // 添加关联藏品详情
+        },
+        isLoading: false
+      });
+      
+      // 更新导览词显示
+      this.updateIntroDisplay(unitData.guideText || unitData.guide_text || '');
     } catch (error) {
       console.error('加载展览单元详情失败:', error);
       wx.showToast({
@@ -210,6 +210,30 @@ Page({
     }
   },
 
+  /**
+   * 从展览导览包中取出单元详情，格式与单元详情接口一致，导览包不存在时返回null
+   */
+  getUnitFromBundle: function(exhibitionId, unitId) {
+    const bundle = exhibitionId ? getApp().globalData.exhibitionBundles[exhibitionId] : null;
+    if (!bundle) {
+      return null;
+    }
+    const unit = (bundle.units || []).find(item => String(item.id) === String(unitId));
+    if (!unit) {
+      return null;
+    }
+    const collectionMap = {};
+    (bundle.collections || []).forEach(collection => {
+      collectionMap[collection.id] = collection;
+    });
+    return {
+      ...unit,
+      exhibitionId: bundle.exhibition.id,
+      exhibitionName: bundle.exhibition.title,
+      collectionsDetail: (unit.collectionIds || []).map(id => collectionMap[id]).filter(Boolean)
+    };
+  },
+
   /**
    * 图片轮播切换事件
    */
@@ -12,9 +12,12 @@ const appId = accountInfo.miniProgram.appId;
 export const apiUrls = {
   museum: {
     home: `${baseUrl}/wx/museum/home/${appId}`,
+    sync: `${baseUrl}/wx/museum/sync/${appId}`,  // 增量同步接口
     exhibitions: `${baseUrl}/wx/museum/exhibition/`,
     exhibition_detail: `${baseUrl}/wx/museum/exhibition/detail/`,  // 新增展览详情接口
     unit_detail: `${baseUrl}/wx/museum/exhibition/unit/detail/`,  // 新增展览单元详情接口
+    exhibition_bundle: `${baseUrl}/wx/museum/exhibition/bundle/`,  // 展览导览包接口
+    exhibition_package: `${baseUrl}/wx/museum/exhibition/package/`,  // 展览离线导览包下载信息接口
     collections: `${baseUrl}/wx/museum/collection/`,  // 新增藏品列表接口
     collection_detail: `${baseUrl}/wx/museum/collection/detail/`,  // 新增藏品详情接口
     update_user: `${baseUrl}/wx/my/update`,// 更新用户信息接口
@@ -25,12 +28,20 @@ export const apiUrls = {
   },
   auth: {
     login: `${baseUrl}/wx/auth/login`,
-    refresh: `${baseUrl}/wx/auth/refresh`  // 可能需要的刷新接口
+    refresh: `${baseUrl}/wx/auth/refresh`  // 刷新令牌接口
   }
 };
 
+// GET请求的ETag缓存前缀，服务端返回304时直接使用本地缓存的数据
+const ETAG_CACHE_PREFIX = 'etag_cache:';
+
 // 封装wx.request方法
 export const request = (url, method = 'GET', data = {}, header = {}) => {
+  const cacheKey = method.toUpperCase() === 'GET' ? `${ETAG_CACHE_PREFIX}${url}` : '';
+  const cached = cacheKey ? wx.getStorageSync(cacheKey) : '';
+  if (cached && cached.etag) {
+    header = { 'If-None-Match': cached.etag, ...header };
+  }
   return new Promise((resolve, reject) => {
     wx.request({
       url,
@@ -41,7 +52,17 @@ export const request = (url, method = 'GET', data = {}, header = {}) => {
         ...header
       },
       success: (res) => {
-        if (res.statusCode === 200) {
+        if (res.statusCode === 304 && cached) {
+          resolve(cached.data);
+        } else if (res.statusCode === 200) {
+          const etag = res.header && (res.header.ETag || res.header.Etag || res.header.etag);
+          if (cacheKey && etag) {
+            try {
+              wx.setStorageSync(cacheKey, { etag, data: res.data });
+            } catch (e) {
+              // 本地存储已满时忽略缓存
+            }
+          }
           resolve(res.data);
         } else {
           reject(new Error(`请求失败：${res.statusCode}`));
@@ -54,8 +75,60 @@ export const request = (url, method = 'GET', data = {}, header = {}) => {
   });
 };
 
-// 封装带认证的请求方法
-export const authenticatedRequest = (url, method = 'GET', data = {}, customHeader = {}) => {
+// 拼接列表接口的游标分页参数，参数放在URL上以便参与签名和ETag缓存Key
+const withPageQuery = (url, cursor, pageSize) => {
+  const query = [];
+  if (cursor) {
+    query.push(`cursor=${encodeURIComponent(cursor)}`);
+  }
+  if (pageSize) {
+    query.push(`pageSize=${pageSize}`);
+  }
+  return query.length ? `${url}?${query.join('&')}` : url;
+};
+
+// 访问令牌失效时服务端返回的提示
+const TOKEN_EXPIRED_MSG = '无效或过期的令牌';
+
+// 保存登录或刷新接口返回的令牌
+export const saveTokens = (data) => {
+  wx.setStorageSync('access_token', data.access_token);
+  if (data.refresh_token) {
+    wx.setStorageSync('refresh_token', data.refresh_token);
+  }
+};
+
+// 正在进行的令牌刷新，刷新令牌只能使用一次，并发请求共用同一次刷新
+let refreshingPromise = null;
+
+// 用刷新令牌换取新令牌，成功返回true；失败时清除刷新令牌，需重新登录
+export const refreshAccessToken = () => {
+  if (refreshingPromise) {
+    return refreshingPromise;
+  }
+  const refreshToken = wx.getStorageSync('refresh_token');
+  if (!refreshToken) {
+    return Promise.resolve(false);
+  }
+  refreshingPromise = request(apiUrls.auth.refresh, 'POST', { refresh_token: refreshToken })
+    .then(res => {
+      if (res.code === 200) {
+        saveTokens(res.data);
+        return true;
+      }
+      wx.removeStorageSync('refresh_token');
+      return false;
+    })
+    .catch(() => false)
+    .then(result => {
+      refreshingPromise = null;
+      return result;
+    });
+  return refreshingPromise;
+};
+
+// 发送带签名的认证请求
+const sendAuthenticatedRequest = (url, method, data, customHeader) => {
   const token = wx.getStorageSync('access_token');
   const timestamp = Math.floor(Date.now() / 1000)
   const nonce = Math.random().toString(36).slice(2, 12)
@@ -84,6 +157,44 @@ export const authenticatedRequest = (url, method = 'GET', data = {}, customHeade
   return request(url, method, data, header);
 };
 
+// 封装带认证的请求方法，访问令牌过期时自动刷新并重试一次
+export const authenticatedRequest = (url, method = 'GET', data = {}, customHeader = {}) => {
+  return sendAuthenticatedRequest(url, method, data, customHeader).then(res => {
+    if (!res || res.code === 200 || res.msg !== TOKEN_EXPIRED_MSG) {
+      return res;
+    }
+    return refreshAccessToken().then(refreshed => {
+      return refreshed ? sendAuthenticatedRequest(url, method, data, customHeader) : res;
+    });
+  });
+};
+
+// 生成写请求的幂等键，同一次用户操作（含失败后用户再次点击）的重试需复用同一个键
+export const createIdempotencyKey = () => {
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+};
+
+// 写请求自动重试的次数与间隔（毫秒）
+const WRITE_RETRIES = 2;
+const WRITE_RETRY_DELAY = 800;
+
+// 首次请求仍在处理时服务端返回的提示
+const PROCESSING_MSG = '请求正在处理中，请稍后重试';
+
+// 携带幂等键发送写请求，网络失败或首次请求仍在处理时用同一个键重试，服务端只执行一次
+const idempotentRequest = (url, method, data, idempotencyKey, retries = WRITE_RETRIES) => {
+  const retry = () => new Promise(resolve => setTimeout(resolve, WRITE_RETRY_DELAY))
+    .then(() => idempotentRequest(url, method, data, idempotencyKey, retries - 1));
+  return authenticatedRequest(url, method, data, { 'Idempotency-Key': idempotencyKey }).then(res => {
+    return res && res.msg === PROCESSING_MSG && retries > 0 ? retry() : res;
+  }, error => {
+    if (retries <= 0) {
+      throw error;
+    }
+    return retry();
+  });
+};
+
 // 封装具体API请求方法
 export const api = {
   // 获取博物馆首页数据
@@ -91,20 +202,37 @@ export const api = {
     return authenticatedRequest(apiUrls.museum.home);
   },
   // 获取展览列表数据
-  getExhibitions(museumId) {
-    return authenticatedRequest(`${apiUrls.museum.exhibitions}${museumId}`);
+  getExhibitions(museumId, cursor = null, pageSize = null) {
+    return authenticatedRequest(withPageQuery(`${apiUrls.museum.exhibitions}${museumId}`, cursor, pageSize));
   },
   // 获取展览详情数据
   getExhibitionDetail(exhibitionId) {
     return authenticatedRequest(`${apiUrls.museum.exhibition_detail}${exhibitionId}`);
   },
+  // 获取展览导览包数据（展览、全部单元、关联藏品及媒体）
+  getExhibitionBundle(exhibitionId) {
+    return authenticatedRequest(`${apiUrls.museum.exhibition_bundle}${exhibitionId}`);
+  },
+  // 增量同步博物馆数据，since为上次同步返回的版本号，不传时全量同步；
+  // withIds为true时同时返回各类数据当前存在的ID，用于低频清理已物理删除的数据
+  syncMuseumData(since = null, withIds = false) {
+    const params = [];
+    if (since) params.push(`since=${encodeURIComponent(since)}`);
+    if (withIds) params.push('withIds=1');
+    const query = params.length ? `?${params.join('&')}` : '';
+    return authenticatedRequest(`${apiUrls.museum.sync}${query}`);
+  },
+  // 获取展览离线导览包的下载信息（对象路径、sha256、大小）
+  getExhibitionPackage(exhibitionId) {
+    return authenticatedRequest(`${apiUrls.museum.exhibition_package}${exhibitionId}`);
+  },
   // 获取展览单元详情数据
   getUnitDetail(unitId) {
     return authenticatedRequest(`${apiUrls.museum.unit_detail}${unitId}`);
   },
   // 获取藏品列表数据
-  getCollections(museumId) {
-    return authenticatedRequest(`${apiUrls.museum.collections}${museumId}`);
+  getCollections(museumId, cursor = null, pageSize = null) {
+    return authenticatedRequest(withPageQuery(`${apiUrls.museum.collections}${museumId}`, cursor, pageSize));
   },
   // 获取藏品详情数据
   getCollectionDetail(collectionId) {
@@ -117,13 +245,9 @@ export const api = {
       app_id: appId 
     });
   },
-  // 刷新用户信息
+  // 刷新访问令牌，成功返回true
   refreshToken() {
-    const token = wx.getStorageSync('access_token');
-    return request(apiUrls.auth.refresh, 'POST', { 
-      access_token: token,
-      app_id: appId 
-    });
+    return refreshAccessToken();
   },
   // 更新用户信息
   updateUser(nickname, avatarUrl) {
@@ -133,26 +257,27 @@ export const api = {
     });
   },
   // 获取教育活动列表数据
-  getEducations(museumId) {
-    return authenticatedRequest(`${apiUrls.museum.activities}${museumId}`);
+  getEducations(museumId, cursor = null, pageSize = null) {
+    return authenticatedRequest(withPageQuery(`${apiUrls.museum.activities}${museumId}`, cursor, pageSize));
   },
   // 获取教育活动详情数据
   getEducationDetail(activityId) {
     return authenticatedRequest(`${apiUrls.museum.activity_detail}${activityId}`);
   },
-  // 新增预约活动方法
-  addActivityReservation(activityId, phoneNumber) {
-    return authenticatedRequest(`${apiUrls.museum.activity_reservation}${activityId}`, 'POST', {
+  // 新增预约活动方法，idempotencyKey由页面按用户操作生成，重试同一次预约时传入相同的键，服务端直接返回首次结果
+  addActivityReservation(activityId, phoneNumber, idempotencyKey) {
+    return idempotentRequest(`${apiUrls.museum.activity_reservation}${activityId}`, 'POST', {
       phone_number: phoneNumber
-    });
+    }, idempotencyKey);
   },
-  // 取消预约活动方法
-  cancelActivityReservation(reservationId) {
-    return authenticatedRequest(`${apiUrls.museum.activity_reservation}${reservationId}`, 'DELETE');
+  // 取消预约活动方法，idempotencyKey的用法同上
+  cancelActivityReservation(reservationId, idempotencyKey) {
+    return idempotentRequest(`${apiUrls.museum.activity_reservation}${reservationId}`, 'DELETE', {},
+      idempotencyKey);
   },
   // 获取我的活动预约清单方法
-  getMyActivityReservations() {
-    return authenticatedRequest(`${apiUrls.museum.activity_reservation}`);
+  getMyActivityReservations(cursor = null, pageSize = null) {
+    return authenticatedRequest(withPageQuery(`${apiUrls.museum.activity_reservation}`, cursor, pageSize));
   },
   // 可以添加更多API方法
 };
\ No newline at end of file
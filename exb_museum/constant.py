@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: constant.py
+
+# 博物馆模块常量
+
+from enum import Enum
+
+
+class MuseumCacheConstants:
+
+    # 小程序首页快照缓存前缀，完整Key为 wx_museum_home:{app_id}
+    WX_HOME_KEY = "wx_museum_home"
+
+    # 小程序首页快照缓存时间（秒），作为失效遗漏时的兜底，同时让展览/活动的时间状态及时刷新
+    WX_HOME_EXPIRE = 300
+
+    # 小程序接口ETag的时间片（秒），展览/活动状态随时间变化，版本戳至少按该间隔轮换
+    WX_ETAG_TIME_BUCKET = 600
+
+    # 小程序接口版本戳缓存前缀，完整Key为 wx_content_version:{接口资源名}:{路由参数}，与首页快照一同由写操作清除
+    WX_CONTENT_VERSION_KEY = "wx_content_version"
+
+    # 小程序接口版本戳缓存时间（秒），作为失效遗漏时的兜底
+    WX_CONTENT_VERSION_EXPIRE = 300
+
+    # 小程序展览导览包缓存前缀，完整Key为 wx_exhibition_bundle:{版本标识}，数据变更后版本标识随之改变
+    WX_EXHIBITION_BUNDLE_KEY = "wx_exhibition_bundle"
+
+    # 小程序展览导览包缓存时间（秒），版本标识随展览、单元及引用藏品的变更而改变，过期的旧版本由TTL清理
+    WX_EXHIBITION_BUNDLE_EXPIRE = 1200
+
+    # 微信用户认证状态缓存前缀，完整Key为 wx_user_state:{wx_user_id}，值为 [status, del_flag, token_version]
+    WX_USER_STATE_KEY = "wx_user_state"
+
+    # 微信用户认证状态Redis缓存时间（秒），状态变更时主动重写
+    WX_USER_STATE_EXPIRE = 86400
+
+    # 微信用户认证状态进程内缓存的条目上限
+    WX_USER_LOCAL_CACHE_SIZE = 10000
+
+    # 微信用户认证状态进程内缓存时间（秒），即其他进程感知禁用与令牌吊销的最长延迟
+    WX_USER_LOCAL_CACHE_TTL = 30
+
+
+class WxTokenConstants:
+
+    # 小程序访问令牌有效期（秒），过期后用刷新令牌换取新令牌，无需重新调用code2session
+    ACCESS_TOKEN_EXPIRE = 900
+
+    # 刷新令牌族的绝对有效期（秒），自登录起计算，轮换不延长，到期后需重新登录
+    REFRESH_TOKEN_EXPIRE = 30 * 86400
+
+    # 刷新令牌缓存前缀，完整Key为 wx_refresh_token:{令牌sha256}，值为令牌族信息
+    REFRESH_TOKEN_KEY = "wx_refresh_token"
+
+    # 已轮换刷新令牌缓存前缀，完整Key为 wx_refresh_used:{令牌sha256}，值为令牌族ID，用于重放检测
+    REFRESH_USED_KEY = "wx_refresh_used"
+
+    # 令牌族当前刷新令牌缓存前缀，完整Key为 wx_refresh_family:{令牌族ID}，值为当前令牌sha256
+    REFRESH_FAMILY_KEY = "wx_refresh_family"
+
+
+class WxSignConstants:
+
+    # 请求签名时间戳允许的偏差（秒）
+    TIMESTAMP_WINDOW = 300
+
+    # 已使用nonce缓存前缀，完整Key为 wx_nonce:{sha1(令牌:nonce)}，时间戳超出窗口后自动过期
+    NONCE_KEY = "wx_nonce"
+
+    # 是否校验小程序请求签名的配置项
+    CHECK_SIGN_CONFIG = "flask.WX_CHECK_SIGN"
+
+
+class WxPageConstants:
+
+    # 小程序列表接口默认每页条数
+    DEFAULT_PAGE_SIZE = 20
+
+    # 小程序列表接口每页条数上限，客户端传入更大的值时按上限返回
+    MAX_PAGE_SIZE = 50
+
+    # 小程序首页藏品、展览、活动各展示的条数
+    HOME_PAGE_SIZE = 5
+
+
+class GuidePackageConstants:
+
+    # 离线导览包在MinIO中的对象前缀，完整路径为 {前缀}/{展览ID}/{版本}.zip
+    OBJECT_PREFIX = "/museum/guide_package"
+
+    # 指向展览最新导览包的描述文件名，与导览包放在同一目录
+    LATEST_OBJECT_NAME = "latest.json"
+
+    # 导览包格式版本，manifest结构变化时递增，旧导览包随之重建
+    FORMAT_VERSION = 1
+
+    # 本地媒体缓存目录的配置项，未配置时使用系统临时目录，media_url不变的媒体不再从MinIO下载
+    CACHE_DIR_CONFIG = "flask.GUIDE_PACKAGE_CACHE_DIR"
+
+
+class WxSyncConstants:
+
+    # 增量同步版本号的时间格式，版本号即已同步数据的最大 update_time
+    VERSION_FORMAT = "%Y%m%d%H%M%S"
+
+    # 增量同步时向前重叠的秒数，避免同一秒内稍后提交的数据被漏掉，客户端按ID覆盖即可
+    OVERLAP_SECONDS = 5
+
+
+class WxApiConstants:
+
+    # 微信接口基础URL
+    BASE_URL = "https://api.weixin.qq.com"
+
+    # 建立连接超时（秒）
+    CONNECT_TIMEOUT = 2
+
+    # 读取响应超时（秒），微信接口变慢时尽快释放工作线程
+    READ_TIMEOUT = 5
+
+    # 连接失败及502/503/504时的最大重试次数，读超时不重试，避免一次性的登录code被重复消费
+    MAX_RETRIES = 2
+
+    # 重试退避系数（秒），第n次重试前等待 系数 * 2^(n-1) 秒
+    RETRY_BACKOFF = 0.2
+
+    # 连接池大小，与工作线程数相当即可
+    POOL_SIZE = 32
+
+    # 同时进行的微信接口调用上限，超出时短暂等待后快速失败
+    MAX_CONCURRENCY = 20
+
+    # 等待调用名额的最长时间（秒）
+    ACQUIRE_TIMEOUT = 1
+
+    # 熔断器连续失败多少次后打开
+    BREAKER_FAILURE_THRESHOLD = 5
+
+    # 熔断器打开后多少秒放行一次试探调用
+    BREAKER_RECOVERY_SECONDS = 30
+
+    # 慢调用阈值（毫秒），超过时记录警告日志
+    SLOW_CALL_MS = 1000
+
+    # 接口调用凭证access_token缓存前缀，完整Key为 wx_access_token:{app_id}，值为 {access_token, refresh_at}
+    ACCESS_TOKEN_KEY = "wx_access_token"
+
+    # access_token过期前多少秒开始刷新，刷新期间其他进程继续使用旧凭证
+    ACCESS_TOKEN_EXPIRE_MARGIN = 300
+
+
+class ReservationBurstConstants:
+
+    # 抢报模式剩余名额缓存前缀，完整Key为 wx_burst_seats:{活动ID}，-1表示不限名额
+    SEATS_KEY = "wx_burst_seats"
+
+    # 抢报模式已报名用户集合前缀，完整Key为 wx_burst_users:{活动ID}，成员为微信用户ID
+    USERS_KEY = "wx_burst_users"
+
+    # 抢报模式尚未落库的预约流条目数前缀，完整Key为 wx_burst_pending:{活动ID}，写入预约流时增加，确认落库后减少
+    PENDING_KEY = "wx_burst_pending"
+
+    # 抢报模式预约流，报名与取消按发生顺序写入，由定时任务批量落库
+    STREAM_KEY = "wx_burst_reservation_stream"
+
+    # 预约流的消费组
+    CONSUMER_GROUP = "wx_burst_persist"
+
+    # 每批落库的预约流条目数
+    BATCH_SIZE = 500
+
+    # 消费者处理中的条目闲置多久（毫秒）后由其他消费者接管，避免进程退出后条目滞留
+    CLAIM_IDLE_MS = 60000
+
+    # 不限名额时剩余名额的取值
+    UNLIMITED_SEATS = -1
+
+    # 抢报结果：成功
+    CLAIM_OK = 1
+
+    # 抢报结果：已报名
+    CLAIM_DUPLICATE = 0
+
+    # 抢报结果：名额池未加载，退回数据库报名
+    CLAIM_NOT_LOADED = -1
+
+    # 抢报结果：名额已满
+    CLAIM_FULL = -2
+
+
+class WaitlistConstants:
+
+    # 活动候补队列前缀，完整Key为 wx_activity_waitlist:{活动ID}，成员为微信用户ID，分值为排队时间戳
+    WAITLIST_KEY = "wx_activity_waitlist"
+
+    # 候补状态：排队中
+    STATUS_WAITING = 0
+
+    # 候补状态：已转为正式预约
+    STATUS_PROMOTED = 1
+
+    # 候补状态：已退出排队
+    STATUS_CANCELLED = 2
+
+
+class ReservationResult(Enum):
+
+    # 活动预约与候补的处理结果，值为 (是否成功, 提示信息)，小程序按名称判断结果
+
+    RESERVED = (True, '预约成功')
+
+    ACTIVITY_NOT_FOUND = (False, '活动不存在')
+
+    ALREADY_RESERVED = (False, '您已经预约过该活动，无需重复预约')
+
+    FULL = (False, '该活动报名人数已达上限')
+
+    CANCELLED = (True, '取消预约成功')
+
+    RESERVATION_NOT_FOUND = (False, '预约记录不存在')
+
+    FORBIDDEN = (False, '无权限操作他人预约记录')
+
+    CANCEL_FAILED = (False, '取消预约失败,请联系管理员')
+
+    WAITLIST_JOINED = (True, '排队成功')
+
+    WAITLIST_PROMOTED = (True, '已为您转为正式预约')
+
+    WAITLIST_RESERVED = (False, '您已经预约过该活动，无需排队')
+
+    WAITLIST_NOT_FULL = (False, '该活动尚有名额，请直接预约')
+
+    WAITLIST_LEFT = (True, '已退出排队')
+
+    WAITLIST_NOT_FOUND = (False, '您不在该活动的候补队列中')
+
+    @property
+    def success(self) -> bool:
+        return self.value[0]
+
+    @property
+    def message(self) -> str:
+        return self.value[1]
+
+
+class WxIdempotencyConstants:
+
+    # 幂等键请求头，小程序重试写请求时携带与首次相同的值
+    HEADER = "Idempotency-Key"
+
+    # 幂等结果缓存前缀，完整Key为 wx_idempotency:{wx_user_id}:{sha1(方法:路径:幂等键)}
+    KEY = "wx_idempotency"
+
+    # 首次请求处理中的占位值
+    PROCESSING = "processing"
+
+    # 处理中占位的过期时间（秒），请求异常退出时占位自动释放
+    PROCESSING_EXPIRE = 30
+
+    # 请求结果的保留时间（秒），期间的重试直接返回首次结果
+    RESULT_EXPIRE = 86400
+
+
+class ExhibitionUnitConstants:
+
+    # 展览单元排序值的间隔，相邻单元之间留出空位，移动单元时只需改写被移动的一行
+    SORT_GAP = 1024
@@ -1,8 +1,8 @@
-from typing import List
+from typing import List, Optional
 
 from flask import g
 from flask_login import login_required
-from pydantic import BeforeValidator
+from pydantic import BeforeValidator, Field
 from typing_extensions import Annotated
 from werkzeug.datastructures import FileStorage
 
@@ -171,4 +171,19 @@ def move_down_exhibition_unit(unit_id: int):
     result = exhibition_unit_service.move_down_exhibition_unit(unit_id)
     if result:
         return AjaxResponse.from_success(msg='向下移动成功')
-    return AjaxResponse.from_error(code=HttpStatus.ERROR, msg='向下移动失败')
\ No newline at end of file
+    return AjaxResponse.from_error(code=HttpStatus.ERROR, msg='向下移动失败')
+
+
+@reg.api.route('/exb_museum/unit/reorder', methods=['PUT'])
+@BodyValidator()
+@PreAuthorize(HasPerm('exb_museum:unit:edit'))
+@Log(title='展览单元管理', business_type=BusinessType.UPDATE)
+@JsonSerializer()
+def reorder_exhibition_unit(
+    exhibition_id: Annotated[int, Field(gt=0)],
+    unit_ids: Annotated[List[int], Field(min_length=1)],
+    section: Optional[str] = None
+):
+    """按给定顺序重排章节内的展览单元"""
+    result = exhibition_unit_service.set_exhibition_unit_order(exhibition_id, section, unit_ids)
+    return AjaxResponse.from_success(data={'updatedCount': result}, msg='排序更新成功')
@@ -17,6 +17,7 @@ from ruoyi_framework.descriptor.log import Log
 from ruoyi_framework.descriptor.permission import HasPerm, PreAuthorize
 from exb_museum.domain.entity import Museum
 from exb_museum.service.museum_service import MuseumService
+from exb_museum.service.wx_api_client import wx_api_client
 
 from .. import reg
 
@@ -147,4 +148,12 @@ def museum_import_data(
     excel_util = ExcelUtil(Museum)
     museum_list = excel_util.import_file(file, sheetname="博物馆信息表数据")
     msg = museum_service.import_museum(museum_list, update_support)
-    return AjaxResponse.from_success(msg=msg)
\ No newline at end of file
+    return AjaxResponse.from_success(msg=msg)
+
+
+@reg.api.route('/exb_museum/museum/wx_api_metrics', methods=['GET'])
+@PreAuthorize(HasPerm('monitor:server:list'))
+@JsonSerializer()
+def museum_wx_api_metrics():
+    """获取当前进程调用微信接口的耗时指标与熔断器状态"""
+    return AjaxResponse.from_success(data=wx_api_client.get_metrics())
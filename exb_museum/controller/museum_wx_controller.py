@@ -3,7 +3,7 @@
 # @FileName: museum_media_controller.py
 # @Time    : 2024-05-20 14:00:00
 
-from flask import request, g
+from flask import request, g, make_response
 from flask_login import login_required
 from typing import List
 from werkzeug.datastructures import FileStorage
@@ -15,7 +15,7 @@ from exb_museum.service.exhibition_service import ExhibitionService
 from exb_museum.service.exhibition_unit_service import ExhibitionUnitService  # 添加展览单元服务导入
 from ruoyi_common.base.model import AjaxResponse, TableResponse, PageModel, CriterianMeta
 from ruoyi_common.constant import HttpStatus, Constants
-from ruoyi_common.descriptor.serializer import BaseSerializer, JsonSerializer
+from ruoyi_common.descriptor.serializer import BaseSerializer, JsonSerializer, negotiate_encoding
 from ruoyi_common.descriptor.validator import QueryValidator, FileUploadValidator
 from ruoyi_framework.descriptor.permission import HasPerm, PreAuthorize
 
@@ -24,16 +24,28 @@ from exb_museum.service.museum_media_service import MuseumMediaService
 from exb_museum.service.museum_service import MuseumService
 from exb_museum.service.activity_service import ActivityService  # 添加活动服务导入
 from exb_museum.service.activity_reservation_service import ActivityReservationService  # 添加活动预约服务导入
+from exb_museum.service.activity_waitlist_service import ActivityWaitlistService
+from exb_museum.service.reservation_burst_service import ReservationBurstService
 from exb_museum.service.wx_auth_service import WxAuthService
-from functools import wraps
+from exb_museum.service.museum_wx_service import MuseumWxService
+from exb_museum.service.guide_package_service import GuidePackageService
+from exb_museum.constant import WxPageConstants, WxTokenConstants, WxSignConstants, WxIdempotencyConstants, ReservationResult
+from ruoyi_admin.ext import redis_cache
+from ruoyi_common.ruoyi.config import CONFIG_CACHE
+from functools import partial, wraps
+from hashlib import sha1
 
 
 from .. import reg
 
-def require_wx_token(f, check_sign=False):
+def require_wx_token(f=None, check_sign=None):
     """
     微信用户认证装饰器
+    check_sign 为None时按配置项 WX_CHECK_SIGN 决定是否校验请求签名
     """
+    if f is None:
+        return partial(require_wx_token, check_sign=check_sign)
+
     @wraps(f)
     def decorated_function(*args, **kwargs):
         token = None
@@ -54,32 +66,127 @@ def require_wx_token(f, check_sign=False):
         if not payload:
             return JsonSerializer().serialize(f, AjaxResponse.from_error(msg="无效或过期的令牌"))
         
-        # 获取签名的相关参数
-        method = request.method
-        path = request.path
-        body = request.get_data(as_text=True) or ''
-        timestamp = int(request.headers.get('X-Timestamp', 0))
-        nonce = request.headers.get('X-Nonce', '')
-        sign = request.headers.get('X-Sign', '')
-
-        # 验证请求签名
-        if check_sign and not auth_service.verify_request(method, path, body, timestamp, nonce, sign, token):
-            return JsonSerializer().serialize(f, AjaxResponse.from_error(msg="无效的请求签名"))
-
-        # 获取wx_user_id
-        wx_user = auth_service.get_wx_user(payload.get('app_id'), payload.get('open_id'))
-        if not wx_user:
-            return JsonSerializer().serialize(f, AjaxResponse.from_error(msg="用户不存在"))
+        sign_required = check_sign if check_sign is not None \
+            else bool(CONFIG_CACHE.get(WxSignConstants.CHECK_SIGN_CONFIG, False))
+        if sign_required:
+            # 获取签名的相关参数，小程序端签名的路径包含查询串
+            method = request.method
+            path = request.path
+            if request.query_string:
+                path = f"{path}?{request.query_string.decode('utf-8')}"
+            body = request.get_data(as_text=True) or ''
+            timestamp = request.headers.get('X-Timestamp', 0, type=int)
+            nonce = request.headers.get('X-Nonce', '')
+            sign = request.headers.get('X-Sign', '')
+
+            # 验证请求签名与nonce
+            if not auth_service.verify_request(method, path, body, timestamp, nonce, sign, token):
+                return JsonSerializer().serialize(f, AjaxResponse.from_error(msg="无效的请求签名"))
+
+        # 校验用户状态与令牌版本号，只查进程内缓存与Redis，不访问数据库
+        if not auth_service.check_wx_user_state(payload):
+            return JsonSerializer().serialize(f, AjaxResponse.from_error(msg="无效或过期的令牌"))
 
         # 将用户信息存储到全局对象中
         g.wx_user_payload = payload
         g.wx_open_id = payload.get('open_id')
         g.wx_app_id = payload.get('app_id')
-        g.wx_user_id = wx_user.id
+        g.wx_user_id = payload.get('wx_user_id')
         return f(*args, **kwargs)
     return decorated_function
 
 
+def wx_conditional_get(f):
+    """
+    小程序条件请求装饰器
+    根据相关数据的版本戳计算强ETag，If-None-Match命中时直接返回304，不再组装响应数据
+    需放在require_wx_token之后、JsonSerializer之前，资源名取被装饰函数的函数名
+    不同压缩编码的响应体不同，强ETag中同时包含协商出的压缩算法
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        museum_wx_service = MuseumWxService()
+        version, last_modified = museum_wx_service.select_content_version(
+            f.__name__, wx_user_id=g.get('wx_user_id'), **kwargs
+        )
+        etag = sha1(f"{request.full_path}:{version}:{negotiate_encoding()}".encode('utf-8')).hexdigest()
+
+        if request.if_none_match.contains(etag):
+            response = make_response('', HttpStatus.NOT_MODIFIED)
+        else:
+            response = f(*args, **kwargs)
+            if last_modified:
+                response.last_modified = last_modified
+        response.set_etag(etag)
+        # 客户端每次都需携带ETag重新校验
+        response.cache_control.no_cache = True
+        return response
+    return decorated_function
+
+
+def wx_idempotent(f):
+    """
+    小程序写接口幂等装饰器
+    请求携带 Idempotency-Key 时，同一用户对同一接口使用相同的键只执行一次，重试直接返回首次的结果，
+    不访问数据库；首次请求仍在处理时返回错误，客户端稍后用相同的键重试即可。
+    需放在require_wx_token与JsonSerializer之后
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        idempotency_key = request.headers.get(WxIdempotencyConstants.HEADER)
+        if not idempotency_key:
+            return f(*args, **kwargs)
+
+        digest = sha1(f"{request.method}:{request.path}:{idempotency_key}".encode('utf-8')).hexdigest()
+        cache_key = f"{WxIdempotencyConstants.KEY}:{g.wx_user_id}:{digest}"
+        if not redis_cache.set(cache_key, WxIdempotencyConstants.PROCESSING, nx=True,
+                               ex=WxIdempotencyConstants.PROCESSING_EXPIRE):
+            cached = redis_cache.get(cache_key)
+            if cached is None or cached.decode('utf-8') == WxIdempotencyConstants.PROCESSING:
+                return AjaxResponse.from_error(msg="请求正在处理中，请稍后重试")
+            return AjaxResponse.model_validate_json(cached)
+
+        try:
+            res = f(*args, **kwargs)
+        except Exception:
+            redis_cache.delete(cache_key)
+            raise
+        if isinstance(res, AjaxResponse):
+            redis_cache.set(cache_key, res.model_dump_json(), ex=WxIdempotencyConstants.RESULT_EXPIRE)
+        else:
+            redis_cache.delete(cache_key)
+        return res
+    return decorated_function
+
+
+def wx_fields_projection(f):
+    """
+    小程序字段投影装饰器
+    请求携带 fields=a,b,c 时，只返回 data（列表时为每一项）中指定的顶层字段，id 始终保留；
+    不传时返回完整数据。需放在JsonSerializer之后，ETag按完整URL计算，不同投影互不影响
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        res = f(*args, **kwargs)
+        fields = request.args.get('fields', None, type=str)
+        if not fields or not isinstance(res, AjaxResponse) or res.code != HttpStatus.SUCCESS:
+            return res
+        field_set = {field.strip() for field in fields.split(',') if field.strip()}
+        field_set.add('id')
+
+        def project(item):
+            if not isinstance(item, dict):
+                return item
+            return {key: value for key, value in item.items() if key in field_set}
+
+        if isinstance(res.data, list):
+            res.data = [project(item) for item in res.data]
+        else:
+            res.data = project(res.data)
+        return res
+    return decorated_function
+
+
 @reg.api.route('/wx/auth/login', methods=["POST"])
 @JsonSerializer()
 def wx_login():
@@ -99,20 +206,45 @@ def wx_login():
     wx_user = auth_service.get_or_create_wx_user(app_id, code)
     if not wx_user:
         return AjaxResponse.from_error(msg="登录失败，请重试")
-    access_token = auth_service.generate_access_token(wx_user.open_id, app_id)
-    if not access_token:
+    access_token = auth_service.generate_access_token(wx_user)
+    refresh_token = auth_service.generate_refresh_token(wx_user)
+    if not access_token or not refresh_token:
         return AjaxResponse.from_error(msg="登录失败，请重试")
     
     user_info = {
         "nickname": wx_user.nickname,
         "avatarUrl": wx_user.avatar_url
     }
-    return AjaxResponse.from_success(data={"access_token": access_token, "user_info": user_info}, msg="登录成功")
+    return AjaxResponse.from_success(data={
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "expires_in": WxTokenConstants.ACCESS_TOKEN_EXPIRE,
+        "user_info": user_info
+    }, msg="登录成功")
+
+
+@reg.api.route('/wx/auth/refresh', methods=["POST"])
+@JsonSerializer()
+def wx_refresh_token():
+    """
+    刷新令牌接口
+    访问令牌过期后用刷新令牌换取新的访问令牌与刷新令牌，旧刷新令牌随即失效；
+    刷新失败时小程序端需重新调用wx.login()登录
+    """
+    data = request.get_json(silent=True)
+    if not data or not data.get('refresh_token'):
+        return AjaxResponse.from_error(msg="缺少刷新令牌")
+
+    tokens = WxAuthService().refresh_access_token(data['refresh_token'])
+    if not tokens:
+        return AjaxResponse.from_error(msg="刷新令牌无效或已过期")
+    return AjaxResponse.from_success(data=tokens, msg="刷新成功")
 
 
 @reg.api.route('/wx/my/update', methods=["POST"])
 @require_wx_token
 @JsonSerializer()
+@wx_idempotent
 def update_user_info():
     """更新用户信息"""
     data = request.get_json()
@@ -130,158 +262,66 @@ def update_user_info():
 
 @reg.api.route('/wx/museum/home/<string:app_id>', methods=["GET"])
 @require_wx_token
+@wx_conditional_get
 @JsonSerializer()
 def museum_home(app_id: str):
     """获取博物馆首页数据"""
-
-    # 从数据库获取真实数据
-    museum_service = MuseumService()
-    media_service = MuseumMediaService()
-    collection_service = CollectionService()
-    exhibition_service = ExhibitionService()
-
-    g.criterian_meta = CriterianMeta()
-    g.criterian_meta.page = PageModel(pageNum=1, pageSize=5) #大坑啊，这里要用驼峰命名，因为前端都是驼峰的
-    g.criterian_meta.scope = None # 不限制范围，必须加
-
-    # 获取博物馆信息
-    museum = museum_service.select_museum_by_app_id(app_id)
-    if not museum:
+    museum_wx_service = MuseumWxService()
+    home_data = museum_wx_service.select_museum_home(app_id)
+    if not home_data:
         return AjaxResponse.from_error(msg="博物馆不存在")
-    
-    # 获取博物馆的媒体
-    media_list = media_service.select_museum_media_list(object_id=museum.museum_id, object_type='museum', media_type='1')
-
-    # 获取该博物馆下的藏品列表
-    collection = Collection()
-    collection.museum_id = museum.museum_id
-    collection.status = 0  # 只获取正常状态的藏品
-    collections = collection_service.select_collection_list(collection)
-
-    # 获取该博物馆下的展览列表
-    exhibition = Exhibition()
-    exhibition.museum_id = museum.museum_id
-    exhibition.status = 0  # 只获取正常状态的展览
-    exhibitions = exhibition_service.select_exhibition_list(exhibition)
-
-    # 获取该博物馆下的活动列表
-    activity_service = ActivityService()
-    activity = Activity()
-    activity.museum_id = museum.museum_id
-    activity.status = 0  # 只获取正常状态的活动
-    activities = activity_service.select_activity_list(activity)
+    return AjaxResponse.from_success(data=home_data)
 
-    # 构建返回数据
-    # 转换藏品数据格式
-    collectio_media_map = media_service.select_museum_media_list_batch(object_ids=[col.collection_id for col in collections], object_type='collection', media_type='1')
-    collection_list = []
-    for col in collections:
-        collection_item = {
-            "id": col.collection_id,
-            "title": col.collection_name or "",
-            "period": col.age or "",
-            "img": "",  # 后续可以从媒体表获取图片
-            "description": col.description or "",
-            "material": col.material or "",
-            "sizeInfo": col.size_info or "",
-            "author": col.author or "",
-            "type": col.collection_type or ""
-        }
-        # 从媒体表获取藏品图片
-        medias = collectio_media_map.get(col.collection_id, [])
-        media_field = media_service.extend_media_list_fields(medias)
-        collection_item.update(media_field)
 
-        collection_list.append(collection_item)
+@reg.api.route('/wx/museum/sync/<string:app_id>', methods=["GET"])
+@require_wx_token
+@JsonSerializer()
+def museum_sync(app_id: str):
+    """
+    增量同步小程序数据，since 为上次同步返回的版本号，不传时全量同步；
+    客户端按ID覆盖 changed 中的行，删除 delFlag 非0的行；
+    全量同步或 withIds=1 时返回 ids，客户端同时删除不在 ids 中的行
+    """
+    since = request.args.get('since', None, type=str)
+    with_ids = request.args.get('withIds', 0, type=int) == 1
+    try:
+        delta = MuseumWxService().select_sync_delta(app_id, since, with_ids)
+    except ValueError:
+        return AjaxResponse.from_error(msg="无效的同步版本号")
+    return AjaxResponse.from_success(data=delta)
 
-    # 转换展览数据格式
-    exhibition_media_map = media_service.select_museum_media_list_batch(object_ids=[exh.exhibition_id for exh in exhibitions], object_type='exhibition', media_type='1')
-    exhibition_list = []
-    for exh in exhibitions:
-        exhibition_item = {
-            "id": exh.exhibition_id,
-            "title": exh.exhibition_name or "",
-            "description": exh.description or "",
-            "date": exh.get_formated_date(),
-            "place": exh.hall or "",
-            "status": exh.get_status(),
-            "statusText": exh.get_status_text(),
-            "img": "",  # 后续可以从媒体表获取图片
-            "organizer": exh.organizer or "",
-            "startTime": exh.start_time.strftime('%Y-%m-%d') if exh.start_time else "",
-            "endTime": exh.end_time.strftime('%Y-%m-%d') if exh.end_time else ""
-        }
-        # 从媒体表获取展览图片
-        medias = exhibition_media_map.get(exh.exhibition_id, [])
-        media_field = media_service.extend_media_list_fields(medias)
-        exhibition_item.update(media_field)
-        
-        exhibition_list.append(exhibition_item)
 
-    # 转换活动数据格式
-    activity_media_map = media_service.select_museum_media_list_batch(object_ids=[act.activity_id for act in activities], object_type='activity', media_type='1')
-    activity_list = []
-    for act in activities:
-        activity_item = {
-            "id": act.activity_id,
-            "title": act.activity_name or "",
-            "description": act.introduction or "",
-            "type": act.activity_type or "",
-            "location": act.location or "",
-            "maxRegistration": act.max_registration or 0,
-            "registrationCount": act.registration_count or 0,
-            "presenter": act.presenter or "",
-            "targetAudience": act.target_audience or "",
-            "startTime": act.activity_start_time.strftime('%Y-%m-%d') if act.activity_start_time else "",
-            "endTime": act.activity_end_time.strftime('%Y-%m-%d') if act.activity_end_time else "",
-            "time": act.get_formatted_time(),
-        }
-
-        # 从媒体表获取活动图片
-        medias = activity_media_map.get(act.activity_id, [])
-        media_field = media_service.extend_media_list_fields(medias)
-        activity_item.update(media_field)
+def _get_wx_page_args():
+    """
+    读取小程序列表接口的游标分页参数
 
-        activity_list.append(activity_item)
-    
-    # 构建首页数据
-    home_data = {
-        "museum": {
-            "id": museum.museum_id,
-            "name": museum.museum_name,
-            "description": museum.description,
-            "openStatus": "今日开放",
-            "openTime": "10:00 - 18:00",
-            "bgImageList": [media.media_url for media in media_list] if media_list else []
-        },
-        "collections": collection_list,
-        "exhibitions": exhibition_list,
-        "educations": activity_list,
-    }
-    return AjaxResponse.from_success(data=home_data)
+    Returns:
+        tuple: (每页条数, 游标)
+    """
+    page_size = request.args.get('pageSize', WxPageConstants.DEFAULT_PAGE_SIZE, type=int)
+    cursor = request.args.get('cursor', None, type=str)
+    return page_size, cursor
 
 
 @reg.api.route('/wx/museum/exhibition/<int:museum_id>', methods=["GET"])
 @require_wx_token
+@wx_conditional_get
 @JsonSerializer()
+@wx_fields_projection
 def exhibition_list_by_museum(museum_id: int):
-    """根据博物馆ID获取展览列表"""
+    """根据博物馆ID获取展览列表，按开始时间倒序游标分页"""
     # 从数据库获取真实数据
     media_service = MuseumMediaService()
-    exhibition_service = ExhibitionService()
 
-    # 获取该博物馆下的展览列表
-    exhibition = Exhibition()
-    exhibition.museum_id = museum_id
-    exhibition.status = 0  # 只获取正常状态的展览
-    exhibitions = exhibition_service.select_exhibition_list(exhibition)
+    # 获取该博物馆下正常状态的展览列表
+    page_size, cursor = _get_wx_page_args()
+    try:
+        exhibitions, next_cursor = MuseumWxService().select_exhibition_page(museum_id, page_size, cursor)
+    except ValueError:
+        return AjaxResponse.from_error(msg="无效的分页游标")
 
     # 批量获取展览图片
-    exhibition_media_map = media_service.select_museum_media_list_batch(
-        object_ids=[exh.exhibition_id for exh in exhibitions],
-        object_type='exhibition',
-        media_type='1'
-    )
+    exhibition_media_map = media_service.select_wx_media_map([('exhibition', [exh.exhibition_id for exh in exhibitions], '1')])['exhibition']
 
     # 转换展览数据格式
     exhibition_list = []
@@ -307,12 +347,16 @@ def exhibition_list_by_museum(museum_id: int):
 
         exhibition_list.append(exhibition_item)
 
-    return AjaxResponse.from_success(data=exhibition_list)
+    ajax_response = AjaxResponse.from_success(data=exhibition_list)
+    setattr(ajax_response, "nextCursor", next_cursor)
+    return ajax_response
 
 
 @reg.api.route('/wx/museum/exhibition/detail/<int:exhibition_id>', methods=["GET"])
 @require_wx_token
+@wx_conditional_get
 @JsonSerializer()
+@wx_fields_projection
 def exhibition_detail(exhibition_id: int):
     """获取展览详情，包括展览信息和展览单元信息"""
     # 获取服务实例
@@ -326,16 +370,16 @@ def exhibition_detail(exhibition_id: int):
     if not exhibition:
         return AjaxResponse.from_error(msg="展览不存在")
 
-    # 获取展览媒体
-    exhibition_medias = media_service.select_museum_media_list(
-        object_id=exhibition_id, 
-        object_type='exhibition', 
-        media_type='1'
-    )
-
     # 获取该展览的所有展览单元
     exhibition_units = exhibition_unit_service.select_exhibition_units_by_exhibition_id(exhibition_id)
 
+    # 一次查询获取展览及展览单元的媒体
+    media_map = media_service.select_museum_media_map([
+        ('exhibition', [exhibition_id], '1'),
+        ('exhibition_unit', [unit.unit_id for unit in exhibition_units], [1,2,3]),
+    ])
+    exhibition_medias = media_map['exhibition'].get(exhibition_id, [])
+
     # 处理展览信息
     exhibition_data = {
         "id": exhibition.exhibition_id,
@@ -354,21 +398,18 @@ def exhibition_detail(exhibition_id: int):
     exhibition_data.update(media_fields)
 
     # 获取展览单元的媒体
-    unit_medias_map = media_service.select_museum_media_list_batch(
-        object_ids=[unit.unit_id for unit in exhibition_units],
-        object_type='exhibition_unit',
-        media_type=[1,2,3]
-    )
+    unit_medias_map = media_map['exhibition_unit']
 
     # 处理展览单元信息
     units_data = []
+    unit_positions = exhibition_unit_service.build_unit_positions(exhibition_units)
     for unit in exhibition_units:
         unit_data = {
             "id": unit.unit_id,
             "name": unit.unit_name or "",
             "type": unit.unit_type,  # 0展品单元 1文字单元 2多媒体单元
             "section": unit.section or "",
-            "sortOrder": unit.sort_order or 0,
+            "sortOrder": unit_positions[unit.unit_id],  # 章节内序号，不暴露内部排序键
             "exhibitLabel": unit.exhibit_label or "",
             "guideText": unit.guide_text or "",
             "collections": unit.collections or "",  # JSON字符串格式的藏品ID列表
@@ -390,9 +431,34 @@ def exhibition_detail(exhibition_id: int):
     return AjaxResponse.from_success(data=detail_data)
 
 
+@reg.api.route('/wx/museum/exhibition/bundle/<int:exhibition_id>', methods=["GET"])
+@require_wx_token
+@wx_conditional_get
+@JsonSerializer()
+def exhibition_bundle(exhibition_id: int):
+    """获取展览导览包，一次返回展览、全部展览单元、去重后的关联藏品及全部媒体"""
+    bundle = MuseumWxService().select_exhibition_bundle(exhibition_id)
+    if not bundle:
+        return AjaxResponse.from_error(msg="展览不存在")
+    return AjaxResponse.from_success(data=bundle)
+
+
+@reg.api.route('/wx/museum/exhibition/package/<int:exhibition_id>', methods=["GET"])
+@require_wx_token
+@JsonSerializer()
+def exhibition_package(exhibition_id: int):
+    """获取展览离线导览包的下载信息，导览包由定时任务构建"""
+    package = GuidePackageService().select_exhibition_package(exhibition_id)
+    if not package:
+        return AjaxResponse.from_error(msg="离线导览包尚未生成")
+    return AjaxResponse.from_success(data=package)
+
+
 @reg.api.route('/wx/museum/exhibition/unit/detail/<int:unit_id>', methods=["GET"])
 @require_wx_token
+@wx_conditional_get
 @JsonSerializer()
+@wx_fields_projection
 def unit_detail(unit_id: int):
     """获取展览单元详情，包括媒体列表"""
     # 获取服务实例
@@ -409,12 +475,13 @@ def unit_detail(unit_id: int):
     exhibition_service = ExhibitionService()
     exhibition = exhibition_service.select_exhibition_by_id(unit.exhibition_id)
     
-    # 获取展览单元的媒体
-    unit_medias = media_service.select_museum_media_list(
-        object_id=unit_id, 
-        object_type='exhibition_unit', 
-        media_type=[1,2,3]  # 1为图片，2为视频，3为音频
-    )
+    # 一次查询获取展览单元的媒体及其关联藏品的图片
+    collection_ids = unit.get_collection_ids()
+    media_map = media_service.select_museum_media_map([
+        ('exhibition_unit', [unit_id], [1,2,3]),  # 1为图片，2为视频，3为音频
+        ('collection', collection_ids, '1'),
+    ])
+    unit_medias = media_map['exhibition_unit'].get(unit_id, [])
     
     # 构建单元详情数据
     unit_data = {
@@ -422,7 +489,7 @@ def unit_detail(unit_id: int):
         "name": unit.unit_name or "",
         "type": unit.unit_type,  # 0展品单元 1文字单元 2多媒体单元
         "section": unit.section or "",
-        "sortOrder": unit.sort_order or 0,
+        "sortOrder": exhibition_unit_service.select_exhibition_unit_position(unit),  # 章节内序号
         "exhibitLabel": unit.exhibit_label or "",
         "guideText": unit.guide_text or "",
         "collections": unit.collections or "",  # JSON字符串格式的藏品ID列表
@@ -434,33 +501,23 @@ def unit_detail(unit_id: int):
     unit_data.update(unit_medias_field)
 
     # 如果是展品单元，获取关联的藏品信息和媒体
-    collection_list = _get_unit_collections(unit)
+    collection_list = _get_unit_collections(unit, media_map['collection'])
     if collection_list and len(collection_list) > 0:
         unit_data["collectionsDetail"] = collection_list
 
     return AjaxResponse.from_success(data=unit_data)
 
 
-def _get_unit_collections(unit: ExhibitionUnit) -> list:
-    """获取展览单元关联的藏品列表"""
+def _get_unit_collections(unit: ExhibitionUnit, collection_medias_map: dict) -> list:
+    """获取展览单元关联的藏品列表，藏品图片由调用方通过 select_museum_media_map 预先加载"""
 
     # 获取服务实例
     media_service = MuseumMediaService()
     collection_service = CollectionService()
 
     if unit.unit_type == 0 and unit.collections:
-        import json
-        try:
-            collection_ids = json.loads(unit.collections) if unit.collections else []
-        except json.JSONDecodeError:
-            collection_ids = []
-
+        collection_ids = unit.get_collection_ids()
         collections = collection_service.select_collection_by_ids(collection_ids)
-        collection_medias_map = media_service.select_museum_media_list_batch(
-            object_ids=collection_ids,
-            object_type='collection',
-            media_type='1'
-        )
 
         collection_list = []
         for collection in collections:
@@ -487,32 +544,23 @@ def _get_unit_collections(unit: ExhibitionUnit) -> list:
 
 @reg.api.route('/wx/museum/collection/<int:museum_id>', methods=["GET"])
 @require_wx_token
+@wx_conditional_get
 @JsonSerializer()
+@wx_fields_projection
 def collection_list_by_museum(museum_id: int):
-    """获取藏品列表，供小程序端使用"""
+    """获取藏品列表，按藏品ID游标分页，供小程序端使用"""
     # 获取服务实例
-    collection_service = CollectionService()
     media_service = MuseumMediaService()
 
-    # 从查询参数获取过滤条件
-    # page_num = request.args.get('pageNum', 1, type=int)
-    # page_size = request.args.get('pageSize', 10, type=int)
-    
-    # 构建查询条件
-    collection_query = Collection()
-    if museum_id > 0:
-        collection_query.museum_id = museum_id
-    collection_query.status = 0  # 只获取正常状态的藏品
-
-    # 获取藏品列表
-    collections = collection_service.select_collection_list(collection_query)
+    # 获取正常状态的藏品列表，museum_id 小于等于0时不限博物馆
+    page_size, cursor = _get_wx_page_args()
+    try:
+        collections, next_cursor = MuseumWxService().select_collection_page(museum_id, page_size, cursor)
+    except ValueError:
+        return AjaxResponse.from_error(msg="无效的分页游标")
 
     # 从媒体表获取藏品图片
-    collection_medias_map = media_service.select_museum_media_list_batch(
-        object_ids=[col.collection_id for col in collections],
-        object_type='collection',
-        media_type='1'
-    )
+    collection_medias_map = media_service.select_wx_media_map([('collection', [col.collection_id for col in collections], '1')])['collection']
     
     # 转换藏品数据格式，适配小程序前端需求
     collection_list = []
@@ -536,12 +584,16 @@ def collection_list_by_museum(museum_id: int):
 
         collection_list.append(collection_item)
 
-    return AjaxResponse.from_success(data=collection_list)
+    ajax_response = AjaxResponse.from_success(data=collection_list)
+    setattr(ajax_response, "nextCursor", next_cursor)
+    return ajax_response
 
 
 @reg.api.route('/wx/museum/collection/detail/<int:collection_id>', methods=["GET"])
 @require_wx_token
+@wx_conditional_get
 @JsonSerializer()
+@wx_fields_projection
 def collection_detail(collection_id: int):
     """获取藏品详情，供小程序端使用"""
     # 获取服务实例
@@ -588,25 +640,23 @@ def collection_detail(collection_id: int):
 
 @reg.api.route('/wx/museum/activity/<int:museum_id>', methods=["GET"])
 @require_wx_token
+@wx_conditional_get
 @JsonSerializer()
+@wx_fields_projection
 def activity_list_by_museum(museum_id: int):
-    """根据博物馆ID获取教育活动列表"""
+    """根据博物馆ID获取教育活动列表，按活动开始时间倒序游标分页"""
     # 从数据库获取真实数据
     media_service = MuseumMediaService()
-    activity_service = ActivityService()
 
-    # 获取该博物馆下的活动列表
-    activity = Activity()
-    activity.museum_id = museum_id
-    activity.status = 0  # 只获取正常状态的活动
-    activities = activity_service.select_activity_list(activity)
+    # 获取该博物馆下正常状态的活动列表
+    page_size, cursor = _get_wx_page_args()
+    try:
+        activities, next_cursor = MuseumWxService().select_activity_page(museum_id, page_size, cursor)
+    except ValueError:
+        return AjaxResponse.from_error(msg="无效的分页游标")
 
     # 从媒体表获取活动图片
-    activity_medias_map = media_service.select_museum_media_list_batch(
-        object_ids=[act.activity_id for act in activities],
-        object_type='activity',
-        media_type='1'
-    )
+    activity_medias_map = media_service.select_wx_media_map([('activity', [act.activity_id for act in activities], '1')])['activity']
 
     # 转换活动数据格式
     activity_list = []
@@ -636,12 +686,16 @@ def activity_list_by_museum(museum_id: int):
 
         activity_list.append(activity_item)
 
-    return AjaxResponse.from_success(data=activity_list)
+    ajax_response = AjaxResponse.from_success(data=activity_list)
+    setattr(ajax_response, "nextCursor", next_cursor)
+    return ajax_response
 
 
 @reg.api.route('/wx/museum/activity/detail/<int:activity_id>', methods=["GET"])
 @require_wx_token
+@wx_conditional_get
 @JsonSerializer()
+@wx_fields_projection
 def activity_detail(activity_id: int):
     """获取教育活动详情"""
     # 获取服务实例
@@ -686,7 +740,11 @@ def activity_detail(activity_id: int):
         activity_id, g.wx_user_id
     )
 
-    activity_detail["isReserved"] = bool(existing_reservation)
+    # 抢报模式下报名可能尚未落库，以名额池为准
+    is_reserved = ReservationBurstService().is_reserved(activity_id, g.wx_user_id) \
+        if activity.burst_mode == 1 else None
+
+    activity_detail["isReserved"] = bool(existing_reservation) if is_reserved is None else is_reserved
     activity_detail["reservationId"] = existing_reservation.reservation_id if existing_reservation else None
 
     return AjaxResponse.from_success(data=activity_detail)
@@ -694,85 +752,128 @@ def activity_detail(activity_id: int):
 
 @reg.api.route('/wx/my/activity_reservation/', methods=["GET"])
 @require_wx_token
+@wx_conditional_get
 @JsonSerializer()
+@wx_fields_projection
 def wx_my_activity_reservation_list():
     """
-    获取当前微信用户的活动预约清单
+    获取当前微信用户的活动预约清单，按预约时间倒序游标分页
     """    
-    activity_reservation_entity = ActivityReservation()
-    activity_reservation_entity.wx_user_id = g.wx_user_id
-    
-    activity_reservation_service = ActivityReservationService()
     media_service = MuseumMediaService()
-    activity_service = ActivityService()
     
-    reservations = activity_reservation_service.select_activity_reservation_list(activity_reservation_entity)
-    activity_medias_map = media_service.select_museum_media_list_batch(
-        object_ids=[reservation.activity_id for reservation in reservations],
-        object_type='activity',
-        media_type='1'
-    )
+    page_size, cursor = _get_wx_page_args()
+    try:
+        reservations, next_cursor = MuseumWxService().select_my_reservation_page(g.wx_user_id, page_size, cursor)
+    except ValueError:
+        return AjaxResponse.from_error(msg="无效的分页游标")
+    activity_medias_map = media_service.select_wx_media_map(
+        [('activity', list({reservation.activity_id for reservation in reservations}), '1')]
+    )['activity']
     
     # 构造包含活动详细信息的预约清单
     reservation_list = []
     for reservation in reservations:
-        activity = activity_service.select_activity_by_id(reservation.activity_id)
-        if activity:
-            reservation_info = {
-                "reservationId": reservation.reservation_id,
-                "activityId": reservation.activity_id,
-                "title": activity.activity_name or "",
-                "description": activity.introduction or "",
-                "location": activity.location or "",
-                "startTime": activity.activity_start_time.strftime('%Y-%m-%d %H:%M') if activity.activity_start_time else "",
-                "endTime": activity.activity_end_time.strftime('%Y-%m-%d %H:%M') if activity.activity_end_time else "",
-                "registrationTime": reservation.registration_time.strftime('%Y-%m-%d %H:%M') if reservation.registration_time else "",
-                "phoneNumber": reservation.phone_number or "",
-                "status": activity.get_status_display(),
-                "time": activity.get_formatted_time(),
-            }
+        reservation_info = {
+            "reservationId": reservation.reservation_id,
+            "activityId": reservation.activity_id,
+            "title": reservation.activity_name or "",
+            "description": reservation.introduction or "",
+            "location": reservation.location or "",
+            "startTime": reservation.activity_start_time.strftime('%Y-%m-%d %H:%M') if reservation.activity_start_time else "",
+            "endTime": reservation.activity_end_time.strftime('%Y-%m-%d %H:%M') if reservation.activity_end_time else "",
+            "registrationTime": reservation.registration_time.strftime('%Y-%m-%d %H:%M') if reservation.registration_time else "",
+            "phoneNumber": reservation.phone_number or "",
+            "status": reservation.get_status_display(),
+            "time": reservation.get_formatted_time(),
+        }
 
-            # 从媒体表获取活动图片
-            activity_medias = activity_medias_map.get(reservation.activity_id, [])
-            medias_field = media_service.extend_media_list_fields(activity_medias)
-            reservation_info.update(medias_field)
+        # 从媒体表获取活动图片
+        activity_medias = activity_medias_map.get(reservation.activity_id, [])
+        medias_field = media_service.extend_media_list_fields(activity_medias)
+        reservation_info.update(medias_field)
 
-            reservation_list.append(reservation_info)
+        reservation_list.append(reservation_info)
     
-    return AjaxResponse.from_success(data=reservation_list)
+    ajax_response = AjaxResponse.from_success(data=reservation_list)
+    setattr(ajax_response, "nextCursor", next_cursor)
+    return ajax_response
 
 
 @reg.api.route('/wx/my/activity_reservation/<int:activity_id>', methods=['POST'])
 @require_wx_token
 @JsonSerializer()
+@wx_idempotent
 def wx_add_activity_reservation(activity_id: int):
     """
     微信用户新增活动预约
     """
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     phone_number = data.get('phone_number')
     
     if not activity_id:
-        return AjaxResponse.from_error(code=HttpStatus.ERROR, msg='活动ID不能为空')
+        return AjaxResponse.from_error(msg='活动ID不能为空')
     
     activity_reservation_service = ActivityReservationService()
     result = activity_reservation_service.add_activity_reservation(activity_id, g.wx_user_id, phone_number)
-    if result == '预约成功':
-        return AjaxResponse.from_success(msg=result)
-    else:
-        return AjaxResponse.from_error(code=HttpStatus.ERROR, msg=result)
+    return _reservation_response(result)
 
 
 @reg.api.route('/wx/my/activity_reservation/<int:reservation_id>', methods=['DELETE'])
 @require_wx_token
 @JsonSerializer()
+@wx_idempotent
 def wx_cancel_activity_reservation(reservation_id: int):
     """
     微信用户取消活动预约
     """
     activity_reservation_service = ActivityReservationService()
     result = activity_reservation_service.cancel_activity_reservation(reservation_id, g.wx_user_id)
-    if result == '取消预约成功':
-        return AjaxResponse.from_success(msg=result)
-    else:
-        return AjaxResponse.from_error(code=HttpStatus.ERROR, msg=result)
\ No newline at end of file
+    return _reservation_response(result)
+
+
+@reg.api.route('/wx/my/activity_waitlist/<int:activity_id>', methods=['POST'])
+@require_wx_token
+@JsonSerializer()
+@wx_idempotent
+def wx_join_activity_waitlist(activity_id: int):
+    """
+    微信用户加入已满活动的候补队列，返回排位
+    """
+    data = request.get_json(silent=True) or {}
+    phone_number = data.get('phone_number')
+
+    result, position = ActivityWaitlistService().join_waitlist(activity_id, g.wx_user_id, phone_number)
+    return _reservation_response(result, position=position)
+
+
+@reg.api.route('/wx/my/activity_waitlist/<int:activity_id>', methods=['GET'])
+@require_wx_token
+@JsonSerializer()
+def wx_activity_waitlist_position(activity_id: int):
+    """
+    查询微信用户在活动候补队列中的状态与排位，代替反复刷新活动详情
+    """
+    status, position = ActivityWaitlistService().get_waitlist_state(activity_id, g.wx_user_id)
+    return AjaxResponse.from_success(data={"status": status, "position": position})
+
+
+@reg.api.route('/wx/my/activity_waitlist/<int:activity_id>', methods=['DELETE'])
+@require_wx_token
+@JsonSerializer()
+@wx_idempotent
+def wx_leave_activity_waitlist(activity_id: int):
+    """
+    微信用户退出活动候补队列
+    """
+    result = ActivityWaitlistService().leave_waitlist(activity_id, g.wx_user_id)
+    return _reservation_response(result)
+
+
+def _reservation_response(result: ReservationResult, **data) -> AjaxResponse:
+    """
+    将预约与候补的处理结果转换为响应，data.result 为结果名称，供小程序判断
+    """
+    data = {"result": result.name, **data}
+    if result.success:
+        return AjaxResponse.from_success(msg=result.message, data=data)
+    return AjaxResponse.from_error(msg=result.message, data=data)
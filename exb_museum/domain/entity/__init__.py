@@ -9,4 +9,5 @@ from .exhibition_unit import ExhibitionUnit
 from .collection import Collection
 from .activity import Activity
 from .activity_reservation import ActivityReservation
+from .activity_waitlist import ActivityWaitlist
 from .wx_user import WxUser
\ No newline at end of file
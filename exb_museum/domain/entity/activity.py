@@ -84,6 +84,13 @@ class Activity(BaseEntity):
         Field(default=0, description="最大报名人数"),
         ExcelField(name="最大报名人数")
     ]
+    # 抢报模式（0关闭 1开启）
+    burst_mode: Annotated[
+        Optional[int],
+        BeforeValidator(str_to_int),
+        Field(default=0, description="抢报模式（0关闭 1开启）"),
+        ExcelField(name="抢报模式（0关闭 1开启）")
+    ]
     # 主讲人或表演团
     presenter: Annotated[
         Optional[str],
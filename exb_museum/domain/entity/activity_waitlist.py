@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: activity_waitlist.py
+
+from typing import Optional, Annotated
+from datetime import datetime
+from pydantic import Field, BeforeValidator
+from ruoyi_common.base.model import BaseEntity
+from ruoyi_common.base.transformer import to_datetime, str_to_int
+from ruoyi_common.base.schema_excel import ExcelField
+from ruoyi_common.base.schema_vo import VoField
+
+
+class ActivityWaitlist(BaseEntity):
+    """
+    活动候补对象
+    """
+
+    # 候补ID
+    waitlist_id: Annotated[
+        Optional[int],
+        BeforeValidator(str_to_int),
+        Field(default=None, description="候补ID"),
+        ExcelField(name="候补ID")
+    ]
+    # 活动ID
+    activity_id: Annotated[
+        Optional[int],
+        BeforeValidator(str_to_int),
+        Field(default=None, description="活动ID"),
+        VoField(query=True),
+        ExcelField(name="活动ID")
+    ]
+    # 微信用户ID
+    wx_user_id: Annotated[
+        Optional[int],
+        BeforeValidator(str_to_int),
+        Field(default=None, description="微信用户ID"),
+        VoField(query=True),
+        ExcelField(name="微信用户ID")
+    ]
+    # 手机号码
+    phone_number: Annotated[
+        Optional[str],
+        Field(default=None, description="手机号码"),
+        ExcelField(name="手机号码")
+    ]
+    # 状态（0排队中 1已转正 2已退出）
+    status: Annotated[
+        Optional[int],
+        BeforeValidator(str_to_int),
+        Field(default=None, description="状态（0排队中 1已转正 2已退出）"),
+        VoField(query=True),
+        ExcelField(name="状态（0排队中 1已转正 2已退出）")
+    ]
+    # 排队时间
+    join_time: Annotated[
+        Optional[datetime],
+        BeforeValidator(to_datetime()),
+        Field(default=None, description="排队时间"),
+        ExcelField(name="排队时间")
+    ]
+    # 转正时间
+    promote_time: Annotated[
+        Optional[datetime],
+        BeforeValidator(to_datetime()),
+        Field(default=None, description="转正时间"),
+        ExcelField(name="转正时间")
+    ]
+    # 创建时间
+    create_time: Annotated[
+        Optional[datetime],
+        BeforeValidator(to_datetime()),
+        Field(default=None, description="创建时间"),
+        ExcelField(name="创建时间")
+    ]
+    # 更新时间
+    update_time: Annotated[
+        Optional[datetime],
+        BeforeValidator(to_datetime()),
+        Field(default=None, description="更新时间"),
+        ExcelField(name="更新时间")
+    ]
@@ -143,4 +143,14 @@ class ExhibitionUnit(BaseEntity):
     # 页码
     page_num: Optional[int] = Field(default=1, description="页码")
     # 每页数量
-    page_size: Optional[int] = Field(default=10, description="每页数量")
\ No newline at end of file
+    page_size: Optional[int] = Field(default=10, description="每页数量")
+
+    def get_collection_ids(self) -> list:
+        """解析展品单元关联的藏品ID列表，非展品单元返回空列表"""
+        if self.unit_type == 0 and self.collections:
+            import json
+            try:
+                return json.loads(self.collections)
+            except json.JSONDecodeError:
+                return []
+        return []
\ No newline at end of file
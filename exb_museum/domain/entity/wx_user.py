@@ -78,6 +78,12 @@ class WxUser(BaseEntity):
         Field(default=None, description="删除标志（0存在 1删除）"),
         ExcelField(name="删除标志（0存在 1删除）")
     ]
+    # 令牌版本号
+    token_version: Annotated[
+        Optional[int],
+        BeforeValidator(str_to_int),
+        Field(default=None, description="令牌版本号")
+    ]
     # 创建时间
     create_time: Annotated[
         Optional[datetime],
@@ -9,4 +9,5 @@ from .exhibition_unit_po import ExhibitionUnitPo
 from .collection_po import CollectionPo
 from .activity_po import ActivityPo
 from .activity_reservation_po import ActivityReservationPo
+from .activity_waitlist_po import ActivityWaitlistPo
 from .wx_user_po import WxUserPo
\ No newline at end of file
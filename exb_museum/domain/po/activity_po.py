@@ -6,7 +6,7 @@
 from typing import Optional
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time, Index
 from sqlalchemy.orm import Mapped, mapped_column
 import sqlalchemy as sa
 from sqlalchemy.dialects import mysql
@@ -19,7 +19,10 @@ class ActivityPo(db.Model):
     活动信息表PO对象
     """
     __tablename__ = 'exb_activity'
-    __table_args__ = {'comment': '活动信息表'}
+    __table_args__ = (
+        Index('idx_museum_status_start_time', 'museum_id', 'status', 'activity_start_time', 'activity_id', unique=False),
+        Index('idx_museum_update_time', 'museum_id', 'update_time', unique=False),
+        {'comment': '活动信息表'})
     
     # 活动ID
     activity_id: Mapped[int] = mapped_column(
@@ -96,6 +99,14 @@ class ActivityPo(db.Model):
         server_default=sa.text("'0'"),
         comment='最大报名人数'
     )
+    # 抢报模式（0关闭 1开启）
+    burst_mode: Mapped[Optional[int]] = mapped_column(
+        'burst_mode',
+        mysql.TINYINT,
+        nullable=False,
+        server_default=sa.text("'0'"),
+        comment='抢报模式（0关闭 1开启）'
+    )
     # 主讲人或表演团
     presenter: Mapped[Optional[str]] = mapped_column(
         'presenter',
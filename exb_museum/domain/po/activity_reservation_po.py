@@ -5,7 +5,7 @@
 
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import BigInteger, String, DateTime, Text, text, UniqueConstraint
+from sqlalchemy import BigInteger, String, DateTime, Text, text, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from ruoyi_admin.ext import db
 import sqlalchemy as sa
@@ -19,6 +19,7 @@ class ActivityReservationPo(db.Model):
     __tablename__ = 'exb_activity_reservation'
     __table_args__ = (
         UniqueConstraint('activity_id', 'wx_user_id', name='uk_activityid_wxuserid'),
+        Index('idx_wxuserid_registration_time', 'wx_user_id', 'registration_time', 'reservation_id', unique=False),
         {'comment': '活动预约表'},
     )
     
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: activity_waitlist_po.py
+
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import BigInteger, String, DateTime, text, UniqueConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from ruoyi_admin.ext import db
+import sqlalchemy.dialects.mysql as mysql
+
+
+class ActivityWaitlistPo(db.Model):
+    """
+    活动候补表PO对象
+    """
+    __tablename__ = 'exb_activity_waitlist'
+    __table_args__ = (
+        UniqueConstraint('activity_id', 'wx_user_id', name='uk_waitlist_activityid_wxuserid'),
+        Index('idx_waitlist_activityid_status_jointime', 'activity_id', 'status', 'join_time', unique=False),
+        {'comment': '活动候补表'},
+    )
+
+    # 候补ID
+    waitlist_id: Mapped[int] = mapped_column(
+        'waitlist_id',
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        nullable=False,
+        comment='候补ID'
+    )
+    # 活动ID
+    activity_id: Mapped[int] = mapped_column(
+        'activity_id',
+        BigInteger,
+        nullable=False,
+        comment='活动ID'
+    )
+    # 微信用户ID
+    wx_user_id: Mapped[int] = mapped_column(
+        'wx_user_id',
+        BigInteger,
+        nullable=False,
+        comment='微信用户ID'
+    )
+    # 手机号码
+    phone_number: Mapped[Optional[str]] = mapped_column(
+        'phone_number',
+        String(20),
+        nullable=True,
+        comment='手机号码'
+    )
+    # 状态（0排队中 1已转正 2已退出）
+    status: Mapped[Optional[int]] = mapped_column(
+        'status',
+        mysql.TINYINT,
+        nullable=False,
+        server_default=text("'0'"),
+        comment='状态（0排队中 1已转正 2已退出）'
+    )
+    # 排队时间
+    join_time: Mapped[Optional[datetime]] = mapped_column(
+        'join_time',
+        mysql.DATETIME(fsp=6),
+        nullable=False,
+        comment='排队时间'
+    )
+    # 转正时间
+    promote_time: Mapped[Optional[datetime]] = mapped_column(
+        'promote_time',
+        DateTime,
+        nullable=True,
+        comment='转正时间'
+    )
+    # 创建时间
+    create_time: Mapped[Optional[datetime]] = mapped_column(
+        'create_time',
+        DateTime,
+        nullable=False,
+        server_default=text('CURRENT_TIMESTAMP'),
+        comment='创建时间'
+    )
+    # 更新时间
+    update_time: Mapped[Optional[datetime]] = mapped_column(
+        'update_time',
+        DateTime,
+        nullable=False,
+        server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'),
+        comment='更新时间'
+    )
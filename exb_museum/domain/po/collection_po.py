@@ -6,7 +6,7 @@
 from typing import Optional
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time, Index
 from sqlalchemy.orm import Mapped, mapped_column
 import sqlalchemy as sa
 from sqlalchemy.dialects import mysql
@@ -18,7 +18,10 @@ class CollectionPo(db.Model):
     藏品信息表PO对象
     """
     __tablename__ = 'exb_collection'
-    __table_args__ = {'comment': '藏品信息表'}
+    __table_args__ = (
+        Index('idx_museum_status_collection', 'museum_id', 'status', 'collection_id', unique=False),
+        Index('idx_museum_update_time', 'museum_id', 'update_time', unique=False),
+        {'comment': '藏品信息表'})
     
     collection_id: Mapped[int] = mapped_column(
         'collection_id',
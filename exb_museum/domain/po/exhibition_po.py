@@ -6,7 +6,7 @@
 from typing import Optional
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time, Index
 from sqlalchemy.orm import Mapped, mapped_column
 import sqlalchemy as sa
 from sqlalchemy.dialects import mysql
@@ -18,7 +18,10 @@ class ExhibitionPo(db.Model):
     展览信息表PO对象
     """
     __tablename__ = 'exb_exhibition'
-    __table_args__ = {'comment': '展览信息表'}
+    __table_args__ = (
+        Index('idx_museum_status_start_time', 'museum_id', 'status', 'start_time', 'exhibition_id', unique=False),
+        Index('idx_museum_update_time', 'museum_id', 'update_time', unique=False),
+        {'comment': '展览信息表'})
     
     exhibition_id: Mapped[int] = mapped_column(
         'exhibition_id',
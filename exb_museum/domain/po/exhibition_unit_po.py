@@ -6,7 +6,7 @@
 from typing import Optional
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time, Index
 from sqlalchemy.orm import Mapped, mapped_column
 import sqlalchemy as sa
 from sqlalchemy.dialects import mysql
@@ -18,7 +18,9 @@ class ExhibitionUnitPo(db.Model):
     展览单元信息表PO对象
     """
     __tablename__ = 'exb_exhibition_unit'
-    __table_args__ = {'comment': '展览单元信息表'}
+    __table_args__ = (
+        Index('idx_exhibition_update_time', 'exhibition_id', 'update_time', unique=False),
+        {'comment': '展览单元信息表'})
     
     unit_id: Mapped[int] = mapped_column(
         'unit_id',
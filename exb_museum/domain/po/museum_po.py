@@ -6,7 +6,7 @@
 from typing import Optional
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Float, Integer, JSON, LargeBinary, Numeric, String, Text, Time, Index
 from sqlalchemy.orm import Mapped, mapped_column
 import sqlalchemy as sa
 from sqlalchemy.dialects import mysql
@@ -18,7 +18,9 @@ class MuseumPo(db.Model):
     博物馆信息表PO对象
     """
     __tablename__ = 'exb_museum'
-    __table_args__ = {'comment': '博物馆信息表'}
+    __table_args__ = (
+        Index('idx_update_time', 'update_time', unique=False),
+        {'comment': '博物馆信息表'})
     museum_id: Mapped[int] = mapped_column(
         'museum_id',
         BigInteger,
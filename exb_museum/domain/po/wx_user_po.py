@@ -91,6 +91,14 @@ class WxUserPo(db.Model):
         comment='删除标志（0存在 1删除）'
     )
 
+    token_version: Mapped[int] = mapped_column(
+        'token_version',
+        Integer,
+        nullable=False,
+        server_default=sa.text("'0'"),
+        comment='令牌版本号，递增后已签发的令牌全部失效'
+    )
+
     create_time: Mapped[Optional[datetime]] = mapped_column(
         'create_time',
         DateTime,
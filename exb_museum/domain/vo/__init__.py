@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+# @Module: exb_museum/domain/vo
+
+from .wx_read_model import WxReadModel, WxCollectionItem, WxExhibitionItem, WxActivityItem, WxReservationItem, WxMediaItem
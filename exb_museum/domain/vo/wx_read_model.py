@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: wx_read_model.py
+
+from datetime import datetime
+from typing import Any, Sequence, Tuple
+
+from exb_museum.domain.po import CollectionPo, ExhibitionPo, ActivityPo, ActivityReservationPo, MuseumMediaPo
+
+
+class WxReadModel:
+    """
+    小程序端只读模型基类，由列投影查询的结果行直接构造，
+    不经过ORM实体加载和pydantic校验，字段与 __slots__ 一一对应，顺序即查询列顺序
+    """
+
+    __slots__ = ()
+
+    # 字段所在的PO类
+    po_class = None
+
+    @classmethod
+    def columns(cls) -> Tuple[Any, ...]:
+        """
+        获取投影查询的列
+
+        Returns:
+            Tuple[Any, ...]: 与 __slots__ 顺序一致的PO列
+        """
+        return tuple(getattr(cls.po_class, name) for name in cls.__slots__)
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "WxReadModel":
+        """
+        由查询结果行构造只读模型
+
+        Args:
+            row (Sequence[Any]): 按 columns() 顺序查询出的行
+
+        Returns:
+            WxReadModel: 只读模型
+        """
+        obj = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, row):
+            setattr(obj, name, value)
+        return obj
+
+
+class WxCollectionItem(WxReadModel):
+    """小程序端藏品列表项"""
+
+    __slots__ = (
+        'collection_id', 'collection_name', 'collection_type', 'age', 'material',
+        'size_info', 'author', 'description', 'museum_id',
+    )
+
+    po_class = CollectionPo
+
+
+class WxExhibitionItem(WxReadModel):
+    """小程序端展览列表项"""
+
+    __slots__ = (
+        'exhibition_id', 'exhibition_name', 'description', 'hall', 'organizer',
+        'start_time', 'end_time', 'exhibition_type', 'content_tags',
+    )
+
+    po_class = ExhibitionPo
+
+    def get_exhibtion_type_desc(self) -> str:
+        return "长期" if self.exhibition_type == 0 else "临时" if self.exhibition_type == 1 else ""
+
+    def get_formated_date(self) -> str:
+        return f"{self.start_time.strftime('%y年%m月%d日') if self.start_time else ''} 至 {self.end_time.strftime('%y年%m月%d日') if self.end_time else ''}"
+
+    def get_status(self) -> str:
+        now = datetime.now()
+        if now < self.start_time:
+            return "upcoming"
+        elif now > self.end_time:
+            return "ended"
+        else:
+            return "ongoing"
+
+    def get_status_text(self) -> str:
+        now = datetime.now()
+        if now < self.start_time:
+            return "即将开始"
+        elif now > self.end_time:
+            return "已结束"
+        else:
+            return "正在热展"
+
+
+class _WxActivityDisplayMixin:
+    """活动时间、状态的显示文本，与 Activity 实体保持一致"""
+
+    __slots__ = ()
+
+    def get_status_display(self) -> str:
+        """获取状态显示文本"""
+        return "即将开始" if self.activity_start_time > datetime.now() else "已经结束" if self.status == 0 else "已经取消"
+
+    def get_formatted_time(self) -> str:
+        """获取格式化的时间显示"""
+        return f"{self.activity_start_time.strftime('%y年%m月%d日 %H:%M') if self.activity_start_time else ''}{self.activity_end_time.strftime(' 至 %H:%M') if self.activity_end_time else ''}"
+
+
+class WxActivityItem(_WxActivityDisplayMixin, WxReadModel):
+    """小程序端活动列表项"""
+
+    __slots__ = (
+        'activity_id', 'activity_name', 'introduction', 'activity_type', 'location',
+        'max_registration', 'registration_count', 'presenter', 'target_audience',
+        'activity_start_time', 'activity_end_time', 'status',
+    )
+
+    po_class = ActivityPo
+
+    def can_register(self) -> bool:
+        """判断是否可以注册"""
+        return (
+            self.status == 0
+            and self.activity_start_time
+            and self.activity_start_time > datetime.now()
+            and self.registration_count < self.max_registration
+        )
+
+
+class WxReservationItem(_WxActivityDisplayMixin, WxReadModel):
+    """小程序端“我的预约”列表项，预约与所属活动的字段合并在一行"""
+
+    __slots__ = (
+        'reservation_id', 'activity_id', 'registration_time', 'phone_number',
+        'activity_name', 'introduction', 'location', 'activity_start_time', 'activity_end_time', 'status',
+    )
+
+    @classmethod
+    def columns(cls) -> Tuple[Any, ...]:
+        return (
+            ActivityReservationPo.reservation_id,
+            ActivityReservationPo.activity_id,
+            ActivityReservationPo.registration_time,
+            ActivityReservationPo.phone_number,
+            ActivityPo.activity_name,
+            ActivityPo.introduction,
+            ActivityPo.location,
+            ActivityPo.activity_start_time,
+            ActivityPo.activity_end_time,
+            ActivityPo.status,
+        )
+
+
+class WxMediaItem(WxReadModel):
+    """小程序端媒体项，字段满足 MuseumMediaService.extend_media_list_fields 的需要"""
+
+    __slots__ = ('object_type', 'object_id', 'media_type', 'media_url', 'cover_url')
+
+    po_class = MuseumMediaPo
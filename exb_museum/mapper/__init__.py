@@ -9,4 +9,5 @@ from .exhibition_unit_mapper import ExhibitionUnitMapper
 from .collection_mapper import CollectionMapper
 from .activity_mapper import ActivityMapper
 from .activity_reservation_mapper import ActivityReservationMapper
+from .activity_waitlist_mapper import ActivityWaitlistMapper
 from .wx_user_mapper import WxUserMapper
\ No newline at end of file
@@ -3,16 +3,18 @@
 # @FileName: activity_mapper.py
 # @Time    : 2024-12-19 10:30:00
 
-from typing import List
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from flask import g
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, or_, case
 
 from ruoyi_admin.ext import db
 from exb_museum.domain.entity import Activity
+from exb_museum.domain.vo import WxActivityItem
 from exb_museum.domain.po import ActivityPo, MuseumPo
 from ruoyi_system.domain.po import SysDeptPo
+from ruoyi_common.sqlalchemy.query import KeysetPagination, paginate
 
 
 class ActivityMapper:
@@ -63,16 +65,38 @@ class ActivityMapper:
         if "criterian_meta" in g and g.criterian_meta.scope is not None:
             stmt = stmt.where(g.criterian_meta.scope)
 
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
-
         ##按活动开始时间倒序
         stmt = stmt.order_by(ActivityPo.activity_start_time.desc()
                              )
-        result = db.session.execute(stmt).scalars().all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        result = paginate(stmt, page).scalars().all()
         return [Activity.model_validate(item) for item in result] if result else []
 
     
+    @staticmethod
+    def select_wx_activity_page(museum_id: int, pagination: KeysetPagination) -> Tuple[List[WxActivityItem], Optional[str]]:
+        """
+        小程序端游标分页查询正常状态的活动，按活动开始时间倒序，不关联部门表，
+        只投影列表需要的列
+
+        Args:
+            museum_id (int): 博物馆ID
+            pagination (KeysetPagination): 游标分页参数
+
+        Returns:
+            Tuple[List[WxActivityItem], Optional[str]]: (活动列表项, 下一页游标)
+        """
+        stmt = select(*WxActivityItem.columns()) \
+            .where(ActivityPo.museum_id == museum_id) \
+            .where(ActivityPo.status == 0) \
+            .where(ActivityPo.del_flag != 1)
+        stmt = pagination.rebuild(stmt, ActivityPo.activity_id, ActivityPo.activity_start_time, descending=True)
+
+        result = db.session.execute(stmt).all()
+        rows, next_cursor = pagination.split(result, lambda row: row.activity_id, lambda row: row.activity_start_time)
+        return [WxActivityItem.from_row(row) for row in rows], next_cursor
+
+    
     @staticmethod
     def select_activity_by_id(activity_id: int) -> Activity:
         """
@@ -111,6 +135,7 @@ class ActivityMapper:
         new_po.activity_end_time = activity.activity_end_time
         new_po.registration_count = activity.registration_count or 0
         new_po.max_registration = activity.max_registration or 0
+        new_po.burst_mode = activity.burst_mode or 0
         new_po.presenter = activity.presenter
         new_po.museum_id = activity.museum_id
         new_po.status = activity.status
@@ -151,8 +176,8 @@ class ActivityMapper:
         existing.location = activity.location
         existing.activity_start_time = activity.activity_start_time
         existing.activity_end_time = activity.activity_end_time
-        existing.registration_count = activity.registration_count
         existing.max_registration = activity.max_registration
+        existing.burst_mode = activity.burst_mode or 0
         existing.presenter = activity.presenter
         existing.museum_id = activity.museum_id
         existing.status = activity.status
@@ -164,6 +189,68 @@ class ActivityMapper:
         existing.remark = activity.remark
         return 1
 
+    @staticmethod
+    def increase_registration_count(activity_id: int) -> int:
+        """
+        报名人数加1，仅在未设置上限或未达上限时生效，判断与更新在同一条语句中完成，
+        同时刷新更新时间，使小程序的版本戳与增量同步感知到人数变化
+
+        Args:
+            activity_id (int): 活动ID
+
+        Returns:
+            int: 更新的记录数，为0表示活动不存在或报名人数已达上限
+        """
+        stmt = update(ActivityPo) \
+            .where(
+                ActivityPo.activity_id == activity_id,
+                or_(
+                    ActivityPo.max_registration <= 0,
+                    ActivityPo.registration_count < ActivityPo.max_registration
+                )
+            ) \
+            .values(registration_count=ActivityPo.registration_count + 1, update_time=datetime.now()) \
+            .execution_options(synchronize_session=False)
+        return db.session.execute(stmt).rowcount
+
+    @staticmethod
+    def adjust_registration_count(activity_id: int, delta: int) -> int:
+        """
+        报名人数增减指定数量，不校验上限，结果最小为0，同时刷新更新时间
+
+        Args:
+            activity_id (int): 活动ID
+            delta (int): 增减的人数，负数表示减少
+
+        Returns:
+            int: 更新的记录数
+        """
+        stmt = update(ActivityPo) \
+            .where(ActivityPo.activity_id == activity_id) \
+            .values(registration_count=case(
+                (ActivityPo.registration_count + delta > 0, ActivityPo.registration_count + delta),
+                else_=0
+            ), update_time=datetime.now()) \
+            .execution_options(synchronize_session=False)
+        return db.session.execute(stmt).rowcount
+
+    @staticmethod
+    def select_activity_museum(activity_id: int) -> Optional[Tuple[int, Optional[str]]]:
+        """
+        查询活动所属博物馆ID及小程序AppID
+
+        Args:
+            activity_id (int): 活动ID
+
+        Returns:
+            Optional[Tuple[int, Optional[str]]]: (博物馆ID, 小程序AppID)，活动不存在时返回None
+        """
+        stmt = select(ActivityPo.museum_id, MuseumPo.app_id) \
+            .outerjoin(MuseumPo, MuseumPo.museum_id == ActivityPo.museum_id) \
+            .where(ActivityPo.activity_id == activity_id)
+        row = db.session.execute(stmt).first()
+        return tuple(row) if row else None
+
     @staticmethod
     def delete_activity_by_ids(ids: List[int]) -> int:
         """
@@ -3,12 +3,16 @@
 # @FileName: activity_reservation_mapper.py
 # @Time    : 2026-01-29
 
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy import select, delete
+from sqlalchemy.dialects.mysql import insert
 from ruoyi_admin.ext import db
 from exb_museum.domain.po.activity_reservation_po import ActivityReservationPo
 from exb_museum.domain.po.wx_user_po import WxUserPo
+from exb_museum.domain.po.activity_po import ActivityPo
 from exb_museum.domain.entity.activity_reservation import ActivityReservation
+from exb_museum.domain.vo import WxReservationItem
+from ruoyi_common.sqlalchemy.query import CountMode, KeysetPagination, paginate
 from datetime import datetime
 from flask import g
 
@@ -45,11 +49,9 @@ class ActivityReservationMapper:
         if activity_reservation.update_time:
             stmt = stmt.where(ActivityReservationPo.update_time >= activity_reservation.update_time)
 
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
-
         stmt = stmt.order_by(ActivityReservationPo.registration_time.desc())
-        result = db.session.execute(stmt).all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        result = paginate(stmt, page, CountMode.CACHED).all()
         
         # 将查询结果转换为ActivityReservation对象
         reservation_list = []
@@ -61,6 +63,29 @@ class ActivityReservationMapper:
         return reservation_list
 
     
+    @staticmethod
+    def select_wx_reservation_page(wx_user_id: int, pagination: KeysetPagination) -> Tuple[List[WxReservationItem], Optional[str]]:
+        """
+        小程序端游标分页查询微信用户的预约及所属活动，一次关联查询，按预约时间倒序，
+        不关联wx_user表
+
+        Args:
+            wx_user_id (int): 微信用户ID
+            pagination (KeysetPagination): 游标分页参数
+
+        Returns:
+            Tuple[List[WxReservationItem], Optional[str]]: (预约列表项, 下一页游标)
+        """
+        stmt = select(*WxReservationItem.columns()) \
+            .join(ActivityPo, ActivityReservationPo.activity_id == ActivityPo.activity_id) \
+            .where(ActivityReservationPo.wx_user_id == wx_user_id)
+        stmt = pagination.rebuild(stmt, ActivityReservationPo.reservation_id, ActivityReservationPo.registration_time, descending=True)
+
+        result = db.session.execute(stmt).all()
+        rows, next_cursor = pagination.split(result, lambda row: row.reservation_id, lambda row: row.registration_time)
+        return [WxReservationItem.from_row(row) for row in rows], next_cursor
+
+    
     @staticmethod
     def select_activity_reservation_by_id(reservation_id: int) -> ActivityReservation:
         """
@@ -98,6 +123,48 @@ class ActivityReservationMapper:
         return ActivityReservation.model_validate(result) if result else None
 
 
+    @staticmethod
+    def select_wx_user_ids_by_activity(activity_id: int) -> List[int]:
+        """
+        查询活动已报名的微信用户ID
+
+        Args:
+            activity_id (int): 活动ID
+
+        Returns:
+            List[int]: 微信用户ID列表
+        """
+        stmt = select(ActivityReservationPo.wx_user_id) \
+            .where(ActivityReservationPo.activity_id == activity_id)
+        return list(db.session.execute(stmt).scalars().all())
+
+
+    @staticmethod
+    def insert_ignore_activity_reservations(rows: List[dict]) -> int:
+        """
+        批量新增活动预约表，(activity_id, wx_user_id) 已存在的记录跳过
+
+        Args:
+            rows (List[dict]): 预约记录，包含 activity_id、wx_user_id、phone_number、registration_time
+
+        Returns:
+            int: 实际插入的记录数
+        """
+        if not rows:
+            return 0
+        now = datetime.now()
+        values = [
+            {
+                "create_time": now,
+                "update_time": now,
+                **row,
+            }
+            for row in rows
+        ]
+        stmt = insert(ActivityReservationPo).prefix_with("IGNORE").values(values)
+        return db.session.execute(stmt).rowcount
+
+
     @staticmethod
     def insert_activity_reservation(activity_reservation: ActivityReservation) -> int:
         """
@@ -156,6 +223,24 @@ class ActivityReservationMapper:
         existing.remark = activity_reservation.remark
         return 1
 
+    @staticmethod
+    def select_activity_user_ids_by_ids(ids: List[int]) -> Dict[int, List[int]]:
+        """
+        按活动分组查询指定预约记录的微信用户ID
+
+        Args:
+            ids (List[int]): 预约ID列表
+
+        Returns:
+            Dict[int, List[int]]: 活动ID -> 微信用户ID列表
+        """
+        stmt = select(ActivityReservationPo.activity_id, ActivityReservationPo.wx_user_id) \
+            .where(ActivityReservationPo.reservation_id.in_(ids))
+        activity_users = {}
+        for activity_id, wx_user_id in db.session.execute(stmt).all():
+            activity_users.setdefault(activity_id, []).append(wx_user_id)
+        return activity_users
+
     @staticmethod
     def delete_activity_reservation_by_ids(ids: List[int]) -> int:
         """
@@ -171,6 +256,26 @@ class ActivityReservationMapper:
         result = db.session.execute(stmt)
         return result.rowcount
 
+    @staticmethod
+    def delete_activity_reservation_by_users(activity_id: int, wx_user_ids: List[int]) -> int:
+        """
+        删除指定微信用户在活动下的预约
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_ids (List[int]): 微信用户ID列表
+
+        Returns:
+            int: 删除的记录数
+        """
+        if not wx_user_ids:
+            return 0
+        stmt = delete(ActivityReservationPo).where(
+            ActivityReservationPo.activity_id == activity_id,
+            ActivityReservationPo.wx_user_id.in_(wx_user_ids)
+        )
+        return db.session.execute(stmt).rowcount
+
     @staticmethod
     def delete_activity_reservation_by_id(reservation_id: int) -> int:
         """
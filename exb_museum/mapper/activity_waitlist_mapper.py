@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: activity_waitlist_mapper.py
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, update, case
+from sqlalchemy.dialects.mysql import insert
+
+from ruoyi_admin.ext import db
+from exb_museum.constant import WaitlistConstants
+from exb_museum.domain.entity import ActivityWaitlist
+from exb_museum.domain.po import ActivityWaitlistPo
+
+
+class ActivityWaitlistMapper:
+    """活动候补表Mapper"""
+
+    @staticmethod
+    def select_waitlist_by_activity_and_user(activity_id: int, wx_user_id: int) -> Optional[ActivityWaitlist]:
+        """
+        根据活动ID和微信用户ID查询候补记录
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_id (int): 微信用户ID
+
+        Returns:
+            Optional[ActivityWaitlist]: 活动候补对象
+        """
+        result = db.session.execute(
+            select(ActivityWaitlistPo).where(
+                ActivityWaitlistPo.activity_id == activity_id,
+                ActivityWaitlistPo.wx_user_id == wx_user_id
+            )
+        ).scalar_one_or_none()
+        return ActivityWaitlist.model_validate(result) if result else None
+
+    @staticmethod
+    def select_waiting_list(activity_id: int) -> List[ActivityWaitlist]:
+        """
+        按排队顺序查询活动中排队的候补记录
+
+        Args:
+            activity_id (int): 活动ID
+
+        Returns:
+            List[ActivityWaitlist]: 活动候补列表
+        """
+        stmt = select(ActivityWaitlistPo) \
+            .where(
+                ActivityWaitlistPo.activity_id == activity_id,
+                ActivityWaitlistPo.status == WaitlistConstants.STATUS_WAITING
+            ) \
+            .order_by(ActivityWaitlistPo.join_time, ActivityWaitlistPo.waitlist_id)
+        return [ActivityWaitlist.model_validate(row) for row in db.session.execute(stmt).scalars().all()]
+
+    @staticmethod
+    def select_first_waiting_for_update(activity_id: int) -> Optional[ActivityWaitlist]:
+        """
+        锁定并返回排在最前的候补记录
+
+        Args:
+            activity_id (int): 活动ID
+
+        Returns:
+            Optional[ActivityWaitlist]: 活动候补对象
+        """
+        stmt = select(ActivityWaitlistPo) \
+            .where(
+                ActivityWaitlistPo.activity_id == activity_id,
+                ActivityWaitlistPo.status == WaitlistConstants.STATUS_WAITING
+            ) \
+            .order_by(ActivityWaitlistPo.join_time, ActivityWaitlistPo.waitlist_id) \
+            .limit(1) \
+            .with_for_update()
+        result = db.session.execute(stmt).scalar_one_or_none()
+        return ActivityWaitlist.model_validate(result) if result else None
+
+    @staticmethod
+    def select_waiting_phone_numbers(activity_id: int, wx_user_ids: List[int]) -> Dict[int, Optional[str]]:
+        """
+        查询候补记录中登记的手机号码
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_ids (List[int]): 微信用户ID列表
+
+        Returns:
+            Dict[int, Optional[str]]: 微信用户ID -> 手机号码
+        """
+        if not wx_user_ids:
+            return {}
+        stmt = select(ActivityWaitlistPo.wx_user_id, ActivityWaitlistPo.phone_number) \
+            .where(
+                ActivityWaitlistPo.activity_id == activity_id,
+                ActivityWaitlistPo.wx_user_id.in_(wx_user_ids)
+            )
+        return {wx_user_id: phone_number for wx_user_id, phone_number in db.session.execute(stmt).all()}
+
+    @staticmethod
+    def upsert_waitlist(activity_id: int, wx_user_id: int, phone_number: Optional[str], join_time: datetime) -> int:
+        """
+        加入候补队列，已转正或已退出的记录重新排队，排队中的记录保留原排队时间
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_id (int): 微信用户ID
+            phone_number (Optional[str]): 手机号码
+            join_time (datetime): 排队时间
+
+        Returns:
+            int: 影响的记录数
+        """
+        stmt = insert(ActivityWaitlistPo).values(
+            activity_id=activity_id,
+            wx_user_id=wx_user_id,
+            phone_number=phone_number,
+            status=WaitlistConstants.STATUS_WAITING,
+            join_time=join_time,
+            promote_time=None,
+        )
+        waiting = ActivityWaitlistPo.status == WaitlistConstants.STATUS_WAITING
+        # MySQL按顺序赋值，status需放在最后，前面的判断才能取到原状态
+        stmt = stmt.on_duplicate_key_update([
+            ('phone_number', stmt.inserted.phone_number),
+            ('join_time', case((waiting, ActivityWaitlistPo.join_time), else_=stmt.inserted.join_time)),
+            ('promote_time', case((waiting, ActivityWaitlistPo.promote_time), else_=stmt.inserted.promote_time)),
+            ('status', stmt.inserted.status),
+        ])
+        return db.session.execute(stmt).rowcount
+
+    @staticmethod
+    def update_waitlist_status(activity_id: int, wx_user_ids: List[int], status: int) -> int:
+        """
+        将排队中的候补记录更新为已转正或已退出，转正时记录转正时间
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_ids (List[int]): 微信用户ID列表
+            status (int): 新状态
+
+        Returns:
+            int: 更新的记录数
+        """
+        if not wx_user_ids:
+            return 0
+        values = {"status": status}
+        if status == WaitlistConstants.STATUS_PROMOTED:
+            values["promote_time"] = datetime.now()
+        stmt = update(ActivityWaitlistPo) \
+            .where(
+                ActivityWaitlistPo.activity_id == activity_id,
+                ActivityWaitlistPo.wx_user_id.in_(wx_user_ids),
+                ActivityWaitlistPo.status == WaitlistConstants.STATUS_WAITING
+            ) \
+            .values(**values) \
+            .execution_options(synchronize_session=False)
+        return db.session.execute(stmt).rowcount
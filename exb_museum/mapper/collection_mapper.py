@@ -3,7 +3,7 @@
 # @FileName: collection_mapper.py
 # @Time    : 2026-01-08 11:23:01
 
-from typing import List
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from flask import g
@@ -11,8 +11,10 @@ from sqlalchemy import select, update, delete
 
 from ruoyi_admin.ext import db
 from exb_museum.domain.entity import Collection
+from exb_museum.domain.vo import WxCollectionItem
 from exb_museum.domain.po import CollectionPo, MuseumPo
 from ruoyi_system.domain.po import SysDeptPo
+from ruoyi_common.sqlalchemy.query import KeysetPagination, paginate
 
 class CollectionMapper:
     """藏品信息表Mapper"""
@@ -51,13 +53,34 @@ class CollectionMapper:
         if "criterian_meta" in g and g.criterian_meta.scope is not None:
             stmt = stmt.where(g.criterian_meta.scope)
 
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
-
-        result = db.session.execute(stmt).scalars().all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        result = paginate(stmt, page).scalars().all()
         return [Collection.model_validate(item) for item in result] if result else []
 
     
+    @staticmethod
+    def select_wx_collection_page(museum_id: int, pagination: KeysetPagination) -> Tuple[List[WxCollectionItem], Optional[str]]:
+        """
+        小程序端游标分页查询正常状态的藏品，按藏品ID升序，不关联部门表，
+        只投影列表需要的列
+
+        Args:
+            museum_id (int): 博物馆ID，小于等于0时不限博物馆
+            pagination (KeysetPagination): 游标分页参数
+
+        Returns:
+            Tuple[List[WxCollectionItem], Optional[str]]: (藏品列表项, 下一页游标)
+        """
+        stmt = select(*WxCollectionItem.columns()).where(CollectionPo.status == 0)
+        if museum_id > 0:
+            stmt = stmt.where(CollectionPo.museum_id == museum_id)
+        stmt = pagination.rebuild(stmt, CollectionPo.collection_id)
+
+        result = db.session.execute(stmt).all()
+        rows, next_cursor = pagination.split(result, lambda row: row.collection_id)
+        return [WxCollectionItem.from_row(row) for row in rows], next_cursor
+
+    
     @staticmethod
     def select_collection_by_id(collection_id: int) -> Collection:
         """
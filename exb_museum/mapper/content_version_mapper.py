@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: content_version_mapper.py
+
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import select, func, and_
+
+from ruoyi_admin.ext import db
+from exb_museum.domain.po import MuseumMediaPo
+
+
+class ContentVersionMapper:
+    """内容版本戳Mapper，用于小程序端条件请求（ETag）"""
+
+    @staticmethod
+    def select_content_version(sources: List[Tuple[Any, Any, Any, Optional[str]]]) -> Tuple:
+        """
+        一次查询计算多组数据的版本戳：每组数据取 max(update_time) 与 count(*)，
+        若指定了对象类型，同时统计其关联媒体的 max(update_time) 与 count(*)，
+        count 用于感知物理删除
+
+        Args:
+            sources (List[Tuple[Any, Any, Any, Optional[str]]]): (PO类, 主键列, 过滤条件, 媒体对象类型) 列表
+
+        Returns:
+            Tuple: 按 sources 顺序排列的版本戳字段
+        """
+        columns = []
+        for po, id_column, criterion, object_type in sources:
+            columns.append(select(func.max(po.update_time)).where(criterion).scalar_subquery())
+            columns.append(select(func.count()).select_from(po).where(criterion).scalar_subquery())
+            if object_type:
+                media_criterion = and_(
+                    MuseumMediaPo.object_type == object_type,
+                    MuseumMediaPo.object_id.in_(select(id_column).where(criterion))
+                )
+                columns.append(select(func.max(MuseumMediaPo.update_time)).where(media_criterion).scalar_subquery())
+                columns.append(select(func.count()).select_from(MuseumMediaPo).where(media_criterion).scalar_subquery())
+
+        if not columns:
+            return ()
+        return tuple(db.session.execute(select(*columns)).one())
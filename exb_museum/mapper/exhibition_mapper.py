@@ -3,7 +3,7 @@
 # @FileName: exhibition_mapper.py
 # @Time    : 2026-01-08 08:54:20
 
-from typing import List
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from flask import g
@@ -11,8 +11,10 @@ from sqlalchemy import select, update, delete
 
 from ruoyi_admin.ext import db
 from exb_museum.domain.entity import Exhibition
+from exb_museum.domain.vo import WxExhibitionItem
 from exb_museum.domain.po import ExhibitionPo, MuseumPo
 from ruoyi_system.domain.po import SysDeptPo
+from ruoyi_common.sqlalchemy.query import KeysetPagination, paginate
 
 class ExhibitionMapper:
     """展览信息表Mapper"""
@@ -60,13 +62,49 @@ class ExhibitionMapper:
         if "criterian_meta" in g and g.criterian_meta.scope is not None:
             stmt = stmt.where(g.criterian_meta.scope)
 
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
-
-        result = db.session.execute(stmt).scalars().all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        result = paginate(stmt, page).scalars().all()
         return [Exhibition.model_validate(item) for item in result] if result else []
 
     
+    @staticmethod
+    def select_wx_exhibition_page(museum_id: int, pagination: KeysetPagination) -> Tuple[List[WxExhibitionItem], Optional[str]]:
+        """
+        小程序端游标分页查询正常状态的展览，按开始时间倒序，不关联部门表，
+        只投影列表需要的列
+
+        Args:
+            museum_id (int): 博物馆ID
+            pagination (KeysetPagination): 游标分页参数
+
+        Returns:
+            Tuple[List[WxExhibitionItem], Optional[str]]: (展览列表项, 下一页游标)
+        """
+        stmt = select(*WxExhibitionItem.columns()) \
+            .where(ExhibitionPo.museum_id == museum_id) \
+            .where(ExhibitionPo.status == 0)
+        stmt = pagination.rebuild(stmt, ExhibitionPo.exhibition_id, ExhibitionPo.start_time, descending=True)
+
+        result = db.session.execute(stmt).all()
+        rows, next_cursor = pagination.split(result, lambda row: row.exhibition_id, lambda row: row.start_time)
+        return [WxExhibitionItem.from_row(row) for row in rows], next_cursor
+
+    
+    @staticmethod
+    def select_exhibition_ids_by_status(status: int) -> List[int]:
+        """
+        查询指定状态的展览ID列表
+
+        Args:
+            status (int): 展览状态
+
+        Returns:
+            List[int]: 展览ID列表
+        """
+        stmt = select(ExhibitionPo.exhibition_id).where(ExhibitionPo.status == status)
+        return list(db.session.execute(stmt).scalars().all())
+
+    
     @staticmethod
     def select_exhibition_by_id(exhibition_id: int) -> Exhibition:
         """
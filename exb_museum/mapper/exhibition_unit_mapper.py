@@ -7,9 +7,11 @@ from typing import List
 from datetime import datetime
 
 from flask import g
-from sqlalchemy import select, update, delete
+from sqlalchemy import case, select, update, delete
 
 from ruoyi_admin.ext import db
+from ruoyi_common.sqlalchemy.query import paginate
+from exb_museum.constant import ExhibitionUnitConstants
 from exb_museum.domain.entity import ExhibitionUnit
 from exb_museum.domain.po.exhibition_unit_po import ExhibitionUnitPo
 
@@ -48,12 +50,10 @@ class ExhibitionUnitMapper:
         if exhibition_unit.status is not None:
             stmt = stmt.where(ExhibitionUnitPo.status == exhibition_unit.status)
 
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
-        
         stmt = stmt.order_by(ExhibitionUnitPo.exhibition_id, ExhibitionUnitPo.section, ExhibitionUnitPo.sort_order)
 
-        result = db.session.execute(stmt).scalars().all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        result = paginate(stmt, page).scalars().all()
         return [ExhibitionUnit.model_validate(item) for item in result] if result else []
 
     
@@ -128,7 +128,7 @@ class ExhibitionUnitMapper:
             max_sort_order = ExhibitionUnitMapper.get_max_sort_order_by_exhibition_and_section(
                 exhibition_unit.exhibition_id, exhibition_unit.section
             )
-            exhibition_unit.sort_order = max_sort_order + 1 if max_sort_order is not None else 1
+            exhibition_unit.sort_order = (max_sort_order or 0) + ExhibitionUnitConstants.SORT_GAP
             # units = ExhibitionUnitMapper.select_exhibition_units_by_exhibition_and_section(
             #     existing.exhibition_id, exhibition_unit.section
             # )
@@ -214,6 +214,38 @@ class ExhibitionUnitMapper:
         result = db.session.execute(stmt)
         return result.rowcount
 
+    @staticmethod
+    def reorder_exhibition_units(exhibition_id: int, section: str, unit_ids: List[int]) -> int:
+        """
+        按给定顺序重排同一展览、同一章节下的展览单元，排序值按间隔重新铺开
+
+        Args:
+            exhibition_id (int): 展览ID
+            section (str): 章节
+            unit_ids (List[int]): 按新顺序排列的展览单元ID列表
+
+        Returns:
+            int: 更新的记录数
+        """
+        if not unit_ids:
+            return 0
+        sort_case = case(
+            {unit_id: (idx + 1) * ExhibitionUnitConstants.SORT_GAP for idx, unit_id in enumerate(unit_ids)},
+            value=ExhibitionUnitPo.unit_id
+        )
+        stmt = (
+            update(ExhibitionUnitPo)
+            .where(
+                ExhibitionUnitPo.unit_id.in_(unit_ids),
+                ExhibitionUnitPo.exhibition_id == exhibition_id,
+                ExhibitionUnitPo.section == section
+            )
+            .values(sort_order=sort_case, update_time=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        result = db.session.execute(stmt)
+        return result.rowcount
+
     @staticmethod
     def select_exhibition_units_by_exhibition_and_section(exhibition_id: int, section: str) -> List[ExhibitionUnit]:
         """
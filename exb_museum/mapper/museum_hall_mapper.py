@@ -10,6 +10,7 @@ from flask import g
 from sqlalchemy import select, update, delete
 
 from ruoyi_admin.ext import db
+from ruoyi_common.sqlalchemy.query import paginate
 from exb_museum.domain.entity import MuseumHall
 from exb_museum.domain.po.museum_hall_po import MuseumHallPo
 
@@ -42,10 +43,8 @@ class MuseumHallMapper:
         if museum_hall.status is not None:
             stmt = stmt.where(MuseumHallPo.status == museum_hall.status)
 
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
-
-        result = db.session.execute(stmt).scalars().all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        result = paginate(stmt, page).scalars().all()
         return [MuseumHall.model_validate(item) for item in result] if result else []
     
     @staticmethod
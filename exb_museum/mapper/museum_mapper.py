@@ -10,6 +10,7 @@ from flask import g
 from sqlalchemy import select, update, delete
 
 from ruoyi_admin.ext import db
+from ruoyi_common.sqlalchemy.query import paginate
 from ruoyi_system.domain.po import SysDeptPo
 from exb_museum.domain.entity import Museum
 from exb_museum.domain.po import MuseumPo
@@ -41,12 +42,10 @@ class MuseumMapper:
 
         if "criterian_meta" in g and g.criterian_meta.scope is not None:
             stmt = stmt.where(g.criterian_meta.scope)
-        
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
 
         print(stmt.compile(compile_kwargs={"literal_binds": True}))
-        result = db.session.execute(stmt).scalars().all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        result = paginate(stmt, page).scalars().all()
         return [Museum.model_validate(item) for item in result] if result else []
 
     
@@ -3,11 +3,12 @@
 # @FileName: museum_media_mapper.py
 # @Time    : 2024-05-20 14:00:00
 
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 from datetime import datetime
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, case, func, select, update
 from exb_museum.domain.po import MuseumMediaPo
 from exb_museum.domain.entity import MuseumMedia
+from exb_museum.domain.vo import WxMediaItem
 from ruoyi_admin.ext import db
 
 
@@ -72,6 +73,64 @@ class MuseumMediaMapper:
         result = query.order_by(MuseumMediaPo.sort.asc(), MuseumMediaPo.create_time.desc()).all()
         return [MuseumMedia.model_validate(item) for item in result] if result else []
 
+    @staticmethod
+    def select_museum_media_list_multi(media_requests: List[Tuple[str, List[int], Union[str, List[str], None]]]) -> List[MuseumMedia]:
+        """
+        按多个对象类型一次性查询博物馆媒体列表，每个请求对应一组 object_type + object_id 条件，走 idx_object_type_id 索引
+        
+        Args:
+            media_requests (List[Tuple[str, List[int], Union[str, List[str], None]]]): (对象类型, 对象ID列表, 媒体类型) 列表
+            
+        Returns:
+            List[MuseumMedia]: 博物馆媒体列表
+        """
+        criterion = MuseumMediaMapper._media_requests_criterion(media_requests)
+        if criterion is None:
+            return []
+        
+        query = db.session.query(MuseumMediaPo).filter(MuseumMediaPo.del_flag == 0, criterion)
+        result = query.order_by(MuseumMediaPo.sort.asc(), MuseumMediaPo.create_time.desc()).all()
+        return [MuseumMedia.model_validate(item) for item in result] if result else []
+
+    @staticmethod
+    def select_wx_media_list_multi(media_requests: List[Tuple[str, List[int], Union[str, List[str], None]]]) -> List[WxMediaItem]:
+        """
+        同 select_museum_media_list_multi，只投影小程序列表需要的列，返回轻量只读模型
+        
+        Args:
+            media_requests (List[Tuple[str, List[int], Union[str, List[str], None]]]): (对象类型, 对象ID列表, 媒体类型) 列表
+            
+        Returns:
+            List[WxMediaItem]: 媒体列表项
+        """
+        criterion = MuseumMediaMapper._media_requests_criterion(media_requests)
+        if criterion is None:
+            return []
+        
+        stmt = select(*WxMediaItem.columns()) \
+            .where(MuseumMediaPo.del_flag == 0, criterion) \
+            .order_by(MuseumMediaPo.sort.asc(), MuseumMediaPo.create_time.desc())
+        return [WxMediaItem.from_row(row) for row in db.session.execute(stmt).all()]
+
+    @staticmethod
+    def _media_requests_criterion(media_requests: List[Tuple[str, List[int], Union[str, List[str], None]]]):
+        """
+        将多组 object_type + object_id 请求合并为一个 OR 条件，没有有效请求时返回None
+        """
+        criterions = []
+        for object_type, object_ids, media_type in media_requests:
+            if not object_type or not object_ids:
+                continue
+            criterion = and_(MuseumMediaPo.object_type == object_type, MuseumMediaPo.object_id.in_(object_ids))
+            if media_type:
+                # 支持单个类型(str)或多个类型(List[str])
+                if isinstance(media_type, list):
+                    criterion = and_(criterion, MuseumMediaPo.media_type.in_(media_type))
+                else:
+                    criterion = and_(criterion, MuseumMediaPo.media_type == media_type)
+            criterions.append(criterion)
+        return or_(*criterions) if criterions else None
+
     @staticmethod
     def select_museum_media_by_id(media_id: int) -> MuseumMedia:
         """
@@ -169,22 +228,24 @@ class MuseumMediaMapper:
         Returns:
             int: 更新的记录数量
         """
-        updated_count = 0
-        
-        # 批量更新排序
-        for idx, media_id in enumerate(sorted_media_ids):
-            # 更新每个媒体的排序值
-            result = db.session.query(MuseumMediaPo).filter(
-                and_(
-                    MuseumMediaPo.media_id == media_id,
-                    MuseumMediaPo.object_id == object_id,
-                    MuseumMediaPo.object_type == object_type,
-                    MuseumMediaPo.media_type == media_type
-                )
-            ).update({'sort': idx + 1})
-            updated_count += result
-        
-        return updated_count
+        if not sorted_media_ids:
+            return 0
+
+        # 按列表位置一次性改写所有排序值，单条UPDATE完成整组重排
+        sort_case = case(
+            {media_id: idx + 1 for idx, media_id in enumerate(sorted_media_ids)},
+            value=MuseumMediaPo.media_id
+        )
+        stmt = update(MuseumMediaPo) \
+            .where(
+                MuseumMediaPo.media_id.in_(sorted_media_ids),
+                MuseumMediaPo.object_id == object_id,
+                MuseumMediaPo.object_type == object_type,
+                MuseumMediaPo.media_type == media_type
+            ) \
+            .values(sort=sort_case) \
+            .execution_options(synchronize_session=False)
+        return db.session.execute(stmt).rowcount
     
     @staticmethod
     def delete_museum_media_by_id(media_id: int) -> int:
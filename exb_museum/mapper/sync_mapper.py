@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: sync_mapper.py
+
+from datetime import datetime
+from typing import Any, List, Optional
+
+from pydantic.alias_generators import to_camel
+from sqlalchemy import select, inspect
+
+from ruoyi_admin.ext import db
+
+
+class SyncMapper:
+    """小程序增量同步Mapper"""
+
+    # 不下发给小程序的字段：审计字段、小程序密钥及后台数据权限字段
+    EXCLUDED_COLUMNS = frozenset({'create_by', 'update_by', 'remark', 'app_secret', 'dept_id'})
+
+    @staticmethod
+    def select_changed_rows(po: Any, criterion: Any, since: Optional[datetime] = None) -> List[dict]:
+        """
+        查询指定时间之后新增、修改或逻辑删除的数据行，按 update_time 升序，
+        包含 del_flag 非0的行，由客户端据此删除本地数据
+
+        Args:
+            po (Any): PO类
+            criterion (Any): 数据范围条件
+            since (Optional[datetime]): 起始时间（含），为空时返回全部数据
+
+        Returns:
+            List[dict]: 驼峰命名的行数据
+        """
+        attrs = [attr.key for attr in inspect(po).column_attrs if attr.key not in SyncMapper.EXCLUDED_COLUMNS]
+        stmt = select(*[getattr(po, key) for key in attrs]).where(criterion)
+        if since is not None:
+            stmt = stmt.where(po.update_time >= since)
+        stmt = stmt.order_by(po.update_time.asc())
+
+        result = db.session.execute(stmt).all()
+        return [{to_camel(key): value for key, value in zip(attrs, row)} for row in result]
+
+    @staticmethod
+    def select_ids(id_column: Any, criterion: Any) -> List[int]:
+        """
+        查询数据范围内当前存在的全部ID，客户端据此清理已被物理删除的数据
+
+        Args:
+            id_column (Any): 主键列
+            criterion (Any): 数据范围条件
+
+        Returns:
+            List[int]: ID列表
+        """
+        stmt = select(id_column).where(criterion).order_by(id_column.asc())
+        return list(db.session.execute(stmt).scalars().all())
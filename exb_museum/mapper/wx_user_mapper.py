@@ -10,6 +10,7 @@ from flask import g
 from sqlalchemy import select, update, delete
 
 from ruoyi_admin.ext import db
+from ruoyi_common.sqlalchemy.query import CountMode, paginate
 from exb_museum.domain.entity import WxUser
 from exb_museum.domain.po import WxUserPo
 
@@ -40,10 +41,8 @@ class WxUserMapper:
         if wx_user.status is not None:
             stmt = stmt.where(WxUserPo.status == wx_user.status)
 
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
-
-        result = db.session.execute(stmt).scalars().all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        result = paginate(stmt, page, CountMode.CACHED).scalars().all()
         return [WxUser.model_validate(item) for item in result] if result else []
 
     
@@ -83,6 +82,40 @@ class WxUserMapper:
         return WxUser.model_validate(result) if result else None
 
 
+    @staticmethod
+    def select_wx_user_state(id: int):
+        """
+        查询微信用户的认证状态，只取状态、删除标志与令牌版本号
+
+        Args:
+            id (int): 主键ID
+
+        Returns:
+            Row: (status, del_flag, token_version)，用户不存在时为None
+        """
+        return db.session.execute(
+            select(WxUserPo.status, WxUserPo.del_flag, WxUserPo.token_version)
+            .where(WxUserPo.id == id)
+        ).one_or_none()
+
+
+    @staticmethod
+    def increase_token_version(id: int) -> int:
+        """
+        递增微信用户的令牌版本号
+
+        Args:
+            id (int): 主键ID
+
+        Returns:
+            int: 更新的记录数
+        """
+        stmt = update(WxUserPo).where(WxUserPo.id == id) \
+            .values(token_version=WxUserPo.token_version + 1)
+        result = db.session.execute(stmt)
+        return result.rowcount
+
+
     @staticmethod
     def select_wx_user_by_open_id(open_id: str) -> WxUser:
         """
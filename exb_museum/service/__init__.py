@@ -8,4 +8,7 @@ from .exhibition_service import ExhibitionService
 from .exhibition_unit_service import ExhibitionUnitService
 from .collection_service import CollectionService
 from .activity_service import ActivityService
-from .activity_reservation_service import ActivityReservationService
\ No newline at end of file
+from .activity_reservation_service import ActivityReservationService
+from .activity_waitlist_service import ActivityWaitlistService
+from .museum_wx_service import MuseumWxService
+from .guide_package_service import GuidePackageService
\ No newline at end of file
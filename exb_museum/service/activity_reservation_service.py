@@ -3,14 +3,16 @@
 # @FileName: activity_reservation_service.py
 # @Time    : 2026-01-29
 
-from typing import List
+from typing import Dict, List
+from sqlalchemy.exc import IntegrityError
 from ruoyi_common.utils import security_util
-from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_common.sqlalchemy.transaction import Transactional, after_commit
 from ruoyi_admin.ext import db
 from exb_museum.domain.entity.activity_reservation import ActivityReservation
-from exb_museum.domain.entity.activity import Activity
-from exb_museum.domain.entity.wx_user import WxUser
+from exb_museum.constant import ReservationBurstConstants, ReservationResult
 from exb_museum.service.activity_service import ActivityService
+from exb_museum.service.activity_waitlist_service import ActivityWaitlistService
+from exb_museum.service.reservation_burst_service import ReservationBurstService
 from exb_museum.mapper.activity_reservation_mapper import ActivityReservationMapper
 
 
@@ -99,7 +101,17 @@ class ActivityReservationService:
         Returns:
             int: 删除的记录数
         """
-        return ActivityReservationMapper.delete_activity_reservation_by_ids(ids)
+        activity_users = ActivityReservationMapper.select_activity_user_ids_by_ids(ids)
+        result = ActivityReservationMapper.delete_activity_reservation_by_ids(ids)
+        if result > 0:
+            # 按活动释放名额
+            activity_service = ActivityService()
+            waitlist_service = ActivityWaitlistService()
+            for activity_id, wx_user_ids in activity_users.items():
+                activity_service.adjust_registration_count(activity_id, -len(wx_user_ids))
+                waitlist_service.promote_waitlist(activity_id, len(wx_user_ids))
+            after_commit(db.session, lambda: self._release_burst_seats(activity_users))
+        return result
 
     @Transactional(db.session)
     def delete_activity_reservation_by_id(self, reservation_id: int) -> int:
@@ -112,53 +124,62 @@ class ActivityReservationService:
         Returns:
             int: 删除的记录数
         """
-        ## 更新活动报名人数
-
-        # 先查询预约记录
         activity_reservation = self.select_activity_reservation_by_id(reservation_id)
         if not activity_reservation:
             return 0
-        
-        # 获取活动对象
-        activity_service = ActivityService()
-        activity = activity_service.select_activity_by_id(activity_reservation.activity_id)
-        if not activity:
-            return 0
 
         result = ActivityReservationMapper.delete_activity_reservation_by_id(reservation_id)
         if result > 0:
-            # 更新活动报名人数
-            activity_service.update_activity_register_count(activity)
+            # 释放名额，候补队列有人时转给排在最前的用户
+            ActivityService().adjust_registration_count(activity_reservation.activity_id, -1)
+            ActivityWaitlistService().promote_waitlist(activity_reservation.activity_id)
+            after_commit(db.session, lambda: self._release_burst_seats(
+                {activity_reservation.activity_id: [activity_reservation.wx_user_id]}
+            ))
         return result
 
     @Transactional(db.session)
-    def add_activity_reservation(self, activity_id: int, wx_user_id: int, phone_number: str) -> str:
+    def add_activity_reservation(self, activity_id: int, wx_user_id: int, phone_number: str) -> ReservationResult:
         """
         微信端新增活动预约表
 
+        开启抢报模式的活动由Redis名额池处理；其余活动先以条件更新占用名额，
+        占用成功的请求持有活动行锁直到事务结束，再写入预约记录，
+        重复预约由 (activity_id, wx_user_id) 唯一约束兜底
+
         Args:
-            activity_reservation (ActivityReservation): 活动预约表对象
+            activity_id (int): 活动ID
+            wx_user_id (int): 微信用户ID
+            phone_number (str): 手机号码
 
         Returns:
-            str: 预约结果
+            ReservationResult: 预约结果
         """
+        # 抢报模式的活动只访问一次Redis，预约记录由定时任务批量落库
+        claim = ReservationBurstService().claim(activity_id, wx_user_id, phone_number)
+        if claim == ReservationBurstConstants.CLAIM_OK:
+            return ReservationResult.RESERVED
+        if claim == ReservationBurstConstants.CLAIM_DUPLICATE:
+            return ReservationResult.ALREADY_RESERVED
+        if claim == ReservationBurstConstants.CLAIM_FULL:
+            return ReservationResult.FULL
 
         # 检查活动是否存在
         activity_service = ActivityService()
         activity = activity_service.select_activity_by_id(activity_id)
         if not activity:
-            return '活动不存在'
+            return ReservationResult.ACTIVITY_NOT_FOUND
         
         # 检查是否已预约过该活动
         existing_reservation = self.select_activity_reservation_by_activity_and_user(
             activity_id, wx_user_id
         )
         if existing_reservation:
-            return '您已经预约过该活动，无需重复预约'
+            return ReservationResult.ALREADY_RESERVED
         
-        # 检查活动是否已达到最大报名人数
-        if activity.max_registration and activity.registration_count >= activity.max_registration:
-            return '该活动报名人数已达上限'
+        # 占用名额，报名人数已达上限时更新不到记录
+        if not activity_service.increase_registration_count(activity_id):
+            return ReservationResult.FULL
         
         # 创建预约记录
         activity_reservation = ActivityReservation()
@@ -166,16 +187,17 @@ class ActivityReservationService:
         activity_reservation.wx_user_id = wx_user_id
         activity_reservation.phone_number = phone_number
         
-        result = self.insert_activity_reservation(activity_reservation)
-        if result > 0:
-            # 更新活动报名人数
-            activity_service.update_activity_register_count(activity)
-            return '预约成功'
-        
-        return '预约失败,请联系管理员'
+        try:
+            with db.session.begin_nested():
+                ActivityReservationMapper.insert_activity_reservation(activity_reservation)
+        except IntegrityError:
+            # 并发的重复预约，归还名额
+            activity_service.adjust_registration_count(activity_id, -1)
+            return ReservationResult.ALREADY_RESERVED
+        return ReservationResult.RESERVED
  
     @Transactional(db.session)
-    def cancel_activity_reservation(self, reservation_id: int, wx_user_id: int) -> str:
+    def cancel_activity_reservation(self, reservation_id: int, wx_user_id: int) -> ReservationResult:
         """
         微信端取消活动预约表
 
@@ -184,23 +206,35 @@ class ActivityReservationService:
             wx_user_id (int): 微信用户ID
 
         Returns:
-            str: 取消结果
+            ReservationResult: 取消结果
         """
         reservation = self.select_activity_reservation_by_id(reservation_id)
         if not reservation:
-            return '预约记录不存在'
+            return ReservationResult.RESERVATION_NOT_FOUND
         
         # 检查预约记录是否属于当前用户
         if reservation.wx_user_id != wx_user_id:
-            return '无权限操作他人预约记录'
-        
-        # 先获取活动信息用于更新报名人数
-        activity_service = ActivityService()
-        activity = activity_service.select_activity_by_id(reservation.activity_id)
+            return ReservationResult.FORBIDDEN
         
+        # 抢报模式的活动归还名额后由定时任务删除预约记录
+        if ReservationBurstService().release(reservation.activity_id, wx_user_id) > 0:
+            return ReservationResult.CANCELLED
+
+        # 删除预约记录的同时释放名额
         result = self.delete_activity_reservation_by_id(reservation_id)
         if result > 0:
-            # 更新活动报名人数
-            activity_service.update_activity_register_count(activity)
-            return '取消预约成功'
-        return '取消预约失败,请联系管理员'
+            return ReservationResult.CANCELLED
+        return ReservationResult.CANCEL_FAILED
+
+    @staticmethod
+    def _release_burst_seats(activity_users: Dict[int, List[int]]):
+        """
+        预约记录已直接删除时，归还抢报模式名额池中的名额，未开启抢报模式的活动不受影响
+
+        Args:
+            activity_users (Dict[int, List[int]]): 活动ID -> 微信用户ID列表
+        """
+        burst_service = ReservationBurstService()
+        for activity_id, wx_user_ids in activity_users.items():
+            for wx_user_id in wx_user_ids:
+                burst_service.release(activity_id, wx_user_id, enqueue=False)
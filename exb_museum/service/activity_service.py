@@ -8,11 +8,14 @@ from typing import List
 from ruoyi_common.exception import ServiceException
 from ruoyi_common.utils.base import LogUtil
 from ruoyi_common.utils import security_util
-from ruoyi_admin.ext import db
-from ruoyi_common.sqlalchemy.transaction import Transactional
-from exb_museum.domain.entity import Activity, ActivityReservation
+from ruoyi_admin.ext import db, redis_cache
+from ruoyi_common.sqlalchemy.transaction import Transactional, after_commit
+from ruoyi_framework.descriptor import custom_cache_evict
+from exb_museum.constant import MuseumCacheConstants
+from exb_museum.domain.entity import Activity
 from exb_museum.mapper.activity_mapper import ActivityMapper
-from exb_museum.mapper.activity_reservation_mapper import ActivityReservationMapper
+from exb_museum.service.museum_wx_service import MuseumWxService
+from exb_museum.service.reservation_burst_service import ReservationBurstService
 from ruoyi_framework.descriptor.datascope import DataScope
 
 
@@ -45,6 +48,7 @@ class ActivityService:
         """
         return ActivityMapper.select_activity_by_id(activity_id)
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def insert_activity(self, activity: Activity) -> int:
         """
@@ -59,8 +63,12 @@ class ActivityService:
         # 设置创建人
         activity.create_by_user(security_util.get_username())
         activity.update_by_user(security_util.get_username()) 
-        return ActivityMapper.insert_activity(activity)
+        result = ActivityMapper.insert_activity(activity)
+        if result > 0 and activity.burst_mode == 1:
+            ReservationBurstService().sync_pool(activity)
+        return result
 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)    
     def update_activity(self, activity: Activity) -> int:
         """
@@ -74,27 +82,69 @@ class ActivityService:
         """
         # 设置更新人
         activity.update_by_user(security_util.get_username()) 
-        return ActivityMapper.update_activity(activity)
+        result = ActivityMapper.update_activity(activity)
+        if result > 0:
+            # 开启抢报模式时加载名额池，关闭时清除
+            ReservationBurstService().sync_pool(activity)
+        return result
     
     @Transactional(db.session)
-    def update_activity_register_count(self, activity: Activity) -> int:
+    def increase_registration_count(self, activity_id: int) -> bool:
         """
-        更新活动注册人数
+        活动报名人数加1，报名人数已达上限时不更新
 
         Args:
-            activity (Activity): 活动信息表对象
+            activity_id (int): 活动ID
+
+        Returns:
+            bool: 是否占用名额成功
+        """
+        if ActivityMapper.increase_registration_count(activity_id) == 0:
+            return False
+        self._evict_registration_caches(activity_id)
+        return True
+
+    @Transactional(db.session)
+    def adjust_registration_count(self, activity_id: int, delta: int) -> int:
+        """
+        活动报名人数增减指定数量，用于取消预约释放名额及抢报预约批量落库
+
+        Args:
+            activity_id (int): 活动ID
+            delta (int): 增减的人数，负数表示减少
 
         Returns:
             int: 更新的记录数
-        """        
-        # 通过activity_reservation统计注册人数
-        reservation_list = ActivityReservationMapper.select_activity_reservation_list(ActivityReservation(activity_id=activity.activity_id))
-        register_count = len(reservation_list)
-
-        # 更新活动注册人数
-        activity.registration_count = register_count
-        return ActivityMapper.update_activity(activity)
-    
+        """
+        result = ActivityMapper.adjust_registration_count(activity_id, delta)
+        if result > 0 and delta:
+            self._evict_registration_caches(activity_id)
+        return result
+
+    def _evict_registration_caches(self, activity_id: int):
+        """
+        报名人数变化后，提交时按Key删除展示该活动报名人数的首页快照及版本戳，不做全库扫描。
+        活动的更新时间已在更新报名人数的同一条语句中刷新
+
+        Args:
+            activity_id (int): 活动ID
+        """
+        owner = ActivityMapper.select_activity_museum(activity_id)
+        if not owner:
+            return
+        museum_id, app_id = owner
+        keys = [
+            MuseumWxService._content_version_key('activity_detail', activity_id=activity_id),
+            MuseumWxService._content_version_key('activity_list_by_museum', museum_id=museum_id),
+        ]
+        if app_id:
+            keys.extend([
+                f"{MuseumCacheConstants.WX_HOME_KEY}:{app_id}",
+                MuseumWxService._content_version_key('museum_home', app_id=app_id),
+            ])
+        after_commit(db.session, lambda: redis_cache.delete(*keys))
+
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def delete_activity_by_ids(self, ids: List[int]) -> int:
         """
@@ -106,8 +156,12 @@ class ActivityService:
         Returns:
             int: 删除的记录数
         """
-        return ActivityMapper.delete_activity_by_ids(ids)
+        result = ActivityMapper.delete_activity_by_ids(ids)
+        burst_service = ReservationBurstService()
+        after_commit(db.session, lambda: burst_service.unload_pool(*ids))
+        return result
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def import_activity(self, activity_list: List[Activity], is_update: bool = False) -> str:
         """
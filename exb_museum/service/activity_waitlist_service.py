@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: activity_waitlist_service.py
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from ruoyi_admin.ext import db, redis_cache
+from ruoyi_common.sqlalchemy.transaction import Transactional, after_commit
+from exb_museum.constant import ReservationResult, WaitlistConstants
+from exb_museum.domain.entity import ActivityReservation
+from exb_museum.mapper.activity_reservation_mapper import ActivityReservationMapper
+from exb_museum.mapper.activity_waitlist_mapper import ActivityWaitlistMapper
+from exb_museum.service.activity_service import ActivityService
+from exb_museum.service.reservation_burst_service import ReservationBurstService
+
+
+class ActivityWaitlistService:
+    """
+    活动候补服务类
+
+    候补队列以数据库记录为准，Redis有序集合按排队时间镜像排队中的用户，供小程序查询排位；
+    名额释放时按排队顺序转为正式预约，抢报模式的活动由名额池的归还脚本完成转正
+    """
+
+    @Transactional(db.session)
+    def join_waitlist(self, activity_id: int, wx_user_id: int, phone_number: Optional[str]) -> Tuple[ReservationResult, Optional[int]]:
+        """
+        加入活动候补队列，仅在活动报名人数已满时可排队
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_id (int): 微信用户ID
+            phone_number (Optional[str]): 手机号码
+
+        Returns:
+            Tuple[ReservationResult, Optional[int]]: (结果, 排位)，未排队时排位为None
+        """
+        activity_service = ActivityService()
+        activity = activity_service.select_activity_by_id(activity_id)
+        if not activity:
+            return ReservationResult.ACTIVITY_NOT_FOUND, None
+
+        burst_service = ReservationBurstService()
+        reserved = burst_service.is_reserved(activity_id, wx_user_id)
+        if reserved is None:
+            reserved = bool(ActivityReservationMapper.select_activity_reservation_by_activity_and_user(activity_id, wx_user_id))
+        if reserved:
+            return ReservationResult.WAITLIST_RESERVED, None
+
+        seats = burst_service.get_seats(activity_id)
+        if seats is None:
+            full = 0 < (activity.max_registration or 0) <= (activity.registration_count or 0)
+        else:
+            full = seats == 0
+        if not full:
+            return ReservationResult.WAITLIST_NOT_FULL, None
+
+        # 已在排队中时直接返回当前排位，重复点击或超时重试不会把用户排到队尾
+        waitlist = ActivityWaitlistMapper.select_waitlist_by_activity_and_user(activity_id, wx_user_id)
+        if waitlist and waitlist.status == WaitlistConstants.STATUS_WAITING:
+            _, position = self.get_waitlist_state(activity_id, wx_user_id)
+            return ReservationResult.WAITLIST_JOINED, position
+
+        join_time = datetime.now()
+        ActivityWaitlistMapper.upsert_waitlist(activity_id, wx_user_id, phone_number, join_time)
+        # 排位为排在前面的人数加1；有序集合在提交后写入，事务回滚时不会留下没有排队记录的成员
+        ahead = redis_cache.zcount(self._waitlist_key(activity_id), '-inf', f'({join_time.timestamp()}')
+        after_commit(db.session, lambda: redis_cache.zadd(
+            self._waitlist_key(activity_id), {wx_user_id: join_time.timestamp()}, nx=True
+        ))
+
+        # 排队期间恰好有名额释放时，立即按排队顺序转正
+        if seats is None and wx_user_id in self.promote_waitlist(activity_id):
+            return ReservationResult.WAITLIST_PROMOTED, None
+        return ReservationResult.WAITLIST_JOINED, ahead + 1
+
+    @Transactional(db.session)
+    def leave_waitlist(self, activity_id: int, wx_user_id: int) -> ReservationResult:
+        """
+        退出活动候补队列
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_id (int): 微信用户ID
+
+        Returns:
+            ReservationResult: 结果
+        """
+        result = ActivityWaitlistMapper.update_waitlist_status(
+            activity_id, [wx_user_id], WaitlistConstants.STATUS_CANCELLED
+        )
+        after_commit(db.session, lambda: redis_cache.zrem(self._waitlist_key(activity_id), wx_user_id))
+        return ReservationResult.WAITLIST_LEFT if result > 0 else ReservationResult.WAITLIST_NOT_FOUND
+
+    def get_waitlist_state(self, activity_id: int, wx_user_id: int) -> Tuple[Optional[int], Optional[int]]:
+        """
+        查询用户在活动候补队列中的状态与排位，排队中的用户只需一次Redis查询
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_id (int): 微信用户ID
+
+        Returns:
+            Tuple[Optional[int], Optional[int]]: (候补状态, 排位)，未排过队时均为None
+        """
+        rank = redis_cache.zrank(self._waitlist_key(activity_id), wx_user_id)
+        if rank is not None:
+            return WaitlistConstants.STATUS_WAITING, rank + 1
+
+        waitlist = ActivityWaitlistMapper.select_waitlist_by_activity_and_user(activity_id, wx_user_id)
+        if not waitlist:
+            return None, None
+        if waitlist.status != WaitlistConstants.STATUS_WAITING:
+            return waitlist.status, None
+
+        # Redis中的队列丢失，按数据库记录重建
+        self._rebuild_waitlist(activity_id)
+        rank = redis_cache.zrank(self._waitlist_key(activity_id), wx_user_id)
+        return WaitlistConstants.STATUS_WAITING, (rank + 1 if rank is not None else None)
+
+    @Transactional(db.session)
+    def promote_waitlist(self, activity_id: int, seats: int = 1) -> List[int]:
+        """
+        按排队顺序将候补用户转为正式预约，名额占用与预约写入在同一事务中完成；
+        抢报模式的活动由名额池的归还脚本转正，这里直接跳过
+
+        Args:
+            activity_id (int): 活动ID
+            seats (int): 最多转正的人数
+
+        Returns:
+            List[int]: 转正的微信用户ID
+        """
+        if ReservationBurstService().get_seats(activity_id) is not None:
+            return []
+
+        activity_service = ActivityService()
+        promoted, dequeued = [], []
+        while len(promoted) < seats:
+            waitlist = ActivityWaitlistMapper.select_first_waiting_for_update(activity_id)
+            if not waitlist:
+                break
+            if not activity_service.increase_registration_count(activity_id):
+                break
+
+            reservation = ActivityReservation()
+            reservation.activity_id = activity_id
+            reservation.wx_user_id = waitlist.wx_user_id
+            reservation.phone_number = waitlist.phone_number
+            try:
+                with db.session.begin_nested():
+                    ActivityReservationMapper.insert_activity_reservation(reservation)
+                promoted.append(waitlist.wx_user_id)
+            except IntegrityError:
+                # 用户排队期间已直接预约，归还名额后继续处理下一位
+                activity_service.adjust_registration_count(activity_id, -1)
+            ActivityWaitlistMapper.update_waitlist_status(
+                activity_id, [waitlist.wx_user_id], WaitlistConstants.STATUS_PROMOTED
+            )
+            dequeued.append(waitlist.wx_user_id)
+
+        if dequeued:
+            after_commit(db.session, lambda: redis_cache.zrem(self._waitlist_key(activity_id), *dequeued))
+        return promoted
+
+    def _rebuild_waitlist(self, activity_id: int):
+        """
+        按数据库中排队中的候补记录重建Redis有序集合
+        """
+        waiting = ActivityWaitlistMapper.select_waiting_list(activity_id)
+        pipe = redis_cache.pipeline()
+        pipe.delete(self._waitlist_key(activity_id))
+        if waiting:
+            pipe.zadd(
+                self._waitlist_key(activity_id),
+                {waitlist.wx_user_id: waitlist.join_time.timestamp() for waitlist in waiting}
+            )
+        pipe.execute()
+
+    @staticmethod
+    def _waitlist_key(activity_id: int) -> str:
+        return f"{WaitlistConstants.WAITLIST_KEY}:{activity_id}"
@@ -10,6 +10,8 @@ from ruoyi_admin.ext import db
 from ruoyi_common.utils.base import LogUtil
 from ruoyi_common.utils import security_util
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_framework.descriptor import custom_cache_evict
+from exb_museum.constant import MuseumCacheConstants
 from exb_museum.domain.entity import Collection
 from exb_museum.mapper.collection_mapper import CollectionMapper
 from ruoyi_framework.descriptor.datascope import DataScope
@@ -56,6 +58,7 @@ class CollectionService:
         return CollectionMapper.select_collection_by_ids(collection_ids)
     
 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def insert_collection(self, collection: Collection) -> int:
         """
@@ -73,6 +76,7 @@ class CollectionService:
         return CollectionMapper.insert_collection(collection)
 
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def update_collection(self, collection: Collection) -> int:
         """
@@ -90,6 +94,7 @@ class CollectionService:
     
 
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def delete_collection_by_ids(self, ids: List[int]) -> int:
         """
@@ -104,6 +109,7 @@ class CollectionService:
         return CollectionMapper.delete_collection_by_ids(ids)
     
 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def import_collection(self, collection_list: List[Collection], is_update: bool = False) -> str:
         """
@@ -10,6 +10,8 @@ from ruoyi_common.utils.base import LogUtil
 from ruoyi_common.utils import security_util
 from ruoyi_admin.ext import db
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_framework.descriptor import custom_cache_evict
+from exb_museum.constant import MuseumCacheConstants
 from exb_museum.domain.entity import Exhibition
 from exb_museum.mapper.exhibition_mapper import ExhibitionMapper
 from ruoyi_framework.descriptor.datascope import DataScope
@@ -43,6 +45,7 @@ class ExhibitionService:
         """
         return ExhibitionMapper.select_exhibition_by_id(exhibition_id)
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def insert_exhibition(self, exhibition: Exhibition) -> int:
         """
@@ -59,6 +62,7 @@ class ExhibitionService:
         exhibition.update_by_user(security_util.get_username()) 
         return ExhibitionMapper.insert_exhibition(exhibition)
 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)    
     def update_exhibition(self, exhibition: Exhibition) -> int:
         """
@@ -74,6 +78,7 @@ class ExhibitionService:
         exhibition.update_by_user(security_util.get_username()) 
         return ExhibitionMapper.update_exhibition(exhibition)
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def delete_exhibition_by_ids(self, ids: List[int]) -> int:
         """
@@ -87,6 +92,7 @@ class ExhibitionService:
         """
         return ExhibitionMapper.delete_exhibition_by_ids(ids)
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def import_exhibition(self, exhibition_list: List[Exhibition], is_update: bool = False) -> str:
         """
@@ -3,13 +3,15 @@
 # @FileName: exhibition_unit_service.py
 # @Time    : 
 
-from typing import List
+from typing import Dict, List
 
 from ruoyi_common.exception import ServiceException
 from ruoyi_common.utils.base import LogUtil
 from ruoyi_common.utils import security_util
 from ruoyi_admin.ext import db
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_framework.descriptor import custom_cache_evict
+from exb_museum.constant import ExhibitionUnitConstants, MuseumCacheConstants
 from exb_museum.domain.entity import ExhibitionUnit
 from exb_museum.mapper.exhibition_unit_mapper import ExhibitionUnitMapper
 from exb_museum.mapper.museum_media_mapper import MuseumMediaMapper
@@ -53,7 +55,40 @@ class ExhibitionUnitService:
             List[ExhibitionUnit]: 展览单元列表
         """
         return ExhibitionUnitMapper.select_exhibition_units_by_exhibition_id(exhibition_id)
+
+    def build_unit_positions(self, units: List[ExhibitionUnit]) -> Dict[int, int]:
+        """
+        计算展览单元在所属章节内的序号，对外展示序号而不是内部的稀疏排序键
+
+        Args:
+            units (List[ExhibitionUnit]): 按章节和排序值升序排列的展览单元列表
+
+        Returns:
+            Dict[int, int]: 展览单元ID到章节内序号（从1开始）的映射
+        """
+        section_counts = {}
+        positions = {}
+        for unit in units:
+            section_counts[unit.section] = section_counts.get(unit.section, 0) + 1
+            positions[unit.unit_id] = section_counts[unit.section]
+        return positions
+
+    def select_exhibition_unit_position(self, unit: ExhibitionUnit) -> int:
+        """
+        查询展览单元在所属章节内的序号
+
+        Args:
+            unit (ExhibitionUnit): 展览单元对象
+
+        Returns:
+            int: 章节内序号（从1开始）
+        """
+        units = ExhibitionUnitMapper.select_exhibition_units_by_exhibition_and_section(
+            unit.exhibition_id, unit.section
+        )
+        return self.build_unit_positions(units).get(unit.unit_id, 0)
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def insert_exhibition_unit(self, exhibition_unit: ExhibitionUnit) -> int:
         """
@@ -72,8 +107,8 @@ class ExhibitionUnitService:
                 exhibition_unit.exhibition_id, 
                 exhibition_unit.section
             )
-            # 设置排序值为最大值+1，如果不存在则设为1
-            exhibition_unit.sort_order = (max_sort_order or 0) + 1
+            # 排在最后，与前一个单元之间留出排序间隔
+            exhibition_unit.sort_order = (max_sort_order or 0) + ExhibitionUnitConstants.SORT_GAP
         
         # 设置创建人
         exhibition_unit.create_by_user(security_util.get_username())
@@ -89,6 +124,7 @@ class ExhibitionUnitService:
         
         return result        
 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def update_exhibition_unit(self, exhibition_unit: ExhibitionUnit) -> int:
         """
@@ -141,6 +177,7 @@ class ExhibitionUnitService:
             )
 
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def delete_exhibition_unit_by_ids(self, ids: List[int]) -> int:
         """
@@ -155,6 +192,7 @@ class ExhibitionUnitService:
         return ExhibitionUnitMapper.delete_exhibition_unit_by_ids(ids)
     
 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def import_exhibition_unit(self, exhibition_unit_list: List[ExhibitionUnit], is_update: bool = False) -> str:
         """
@@ -213,6 +251,7 @@ class ExhibitionUnitService:
         success_msg = f"恭喜您，数据已全部导入成功！共 {success_count} 条，数据如下：" + success_msg
         return success_msg
 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def move_up_exhibition_unit(self, unit_id: int) -> bool:
         """
@@ -224,35 +263,9 @@ class ExhibitionUnitService:
         Returns:
             bool: 是否移动成功
         """
-        # 获取当前展览单元信息
-        current_unit = ExhibitionUnitMapper.select_exhibition_unit_by_id(unit_id)
-        if not current_unit:
-            return False
-            
-        # 获取同展览和同章节的所有展览单元，按排序值升序排列
-        units = ExhibitionUnitMapper.select_exhibition_units_by_exhibition_and_section(
-            current_unit.exhibition_id, current_unit.section
-        )
-        
-        # 找到当前单元在列表中的位置
-        current_index = -1
-        for i, unit in enumerate(units):
-            if unit.unit_id == unit_id:
-                current_index = i
-                break
-                
-        if current_index <= 0:  # 已经是第一个，无法再向上移动
-            return False
-            
-        # 获取前一个单元
-        prev_unit = units[current_index - 1]
-        
-        # 交换两个单元的排序值
-        result1 = ExhibitionUnitMapper.update_sort_order(prev_unit.unit_id, current_unit.sort_order)
-        result2 = ExhibitionUnitMapper.update_sort_order(current_unit.unit_id, prev_unit.sort_order)
-        
-        return result1 > 0 and result2 > 0
+        return self._move_exhibition_unit(unit_id, -1)
 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def move_down_exhibition_unit(self, unit_id: int) -> bool:
         """
@@ -261,6 +274,39 @@ class ExhibitionUnitService:
         Args:
             unit_id (int): 展览单元ID
             
+        Returns:
+            bool: 是否移动成功
+        """
+        return self._move_exhibition_unit(unit_id, 1)
+
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
+    @Transactional(db.session)
+    def set_exhibition_unit_order(self, exhibition_id: int, section: str, unit_ids: List[int]) -> int:
+        """
+        按给定顺序重排同一展览、同一章节下的全部展览单元
+        
+        Args:
+            exhibition_id (int): 展览ID
+            section (str): 章节
+            unit_ids (List[int]): 按新顺序排列的展览单元ID列表，需包含该章节下的全部单元
+            
+        Returns:
+            int: 更新的记录数
+        """
+        units = ExhibitionUnitMapper.select_exhibition_units_by_exhibition_and_section(exhibition_id, section)
+        if len(unit_ids) != len(set(unit_ids)) or set(unit_ids) != {unit.unit_id for unit in units}:
+            raise ServiceException("排序列表与该章节下的展览单元不一致，请刷新后重试")
+        return ExhibitionUnitMapper.reorder_exhibition_units(exhibition_id, section, unit_ids)
+
+    def _move_exhibition_unit(self, unit_id: int, offset: int) -> bool:
+        """
+        将展览单元在所在章节内前后移动，新排序值取新位置前后两个单元的中间值，只改写被移动的一行；
+        相邻排序值之间已无空位时，按移动后的顺序将整个章节重新铺开
+        
+        Args:
+            unit_id (int): 展览单元ID
+            offset (int): 移动的位数，负数向上，正数向下
+            
         Returns:
             bool: 是否移动成功
         """
@@ -273,22 +319,23 @@ class ExhibitionUnitService:
         units = ExhibitionUnitMapper.select_exhibition_units_by_exhibition_and_section(
             current_unit.exhibition_id, current_unit.section
         )
-        
-        # 找到当前单元在列表中的位置
-        current_index = -1
-        for i, unit in enumerate(units):
-            if unit.unit_id == unit_id:
-                current_index = i
-                break
-                
-        if current_index == -1 or current_index >= len(units) - 1:  # 已经是最后一个，无法再向下移动
+        current_index = next((i for i, unit in enumerate(units) if unit.unit_id == unit_id), -1)
+        target_index = current_index + offset
+        if current_index == -1 or target_index < 0 or target_index >= len(units):
             return False
-            
-        # 获取后一个单元
-        next_unit = units[current_index + 1]
-        
-        # 交换两个单元的排序值
-        result1 = ExhibitionUnitMapper.update_sort_order(next_unit.unit_id, current_unit.sort_order)
-        result2 = ExhibitionUnitMapper.update_sort_order(current_unit.unit_id, next_unit.sort_order)
-        
-        return result1 > 0 and result2 > 0
\ No newline at end of file
+
+        # 去掉当前单元后，新位置落在 others[target_index - 1] 与 others[target_index] 之间
+        others = [unit for unit in units if unit.unit_id != unit_id]
+        lower = (others[target_index - 1].sort_order or 0) if target_index > 0 else 0
+        if target_index < len(others):
+            upper = others[target_index].sort_order or 0
+        else:
+            upper = lower + 2 * ExhibitionUnitConstants.SORT_GAP
+        if upper - lower >= 2:
+            return ExhibitionUnitMapper.update_sort_order(unit_id, (lower + upper) // 2) > 0
+
+        others.insert(target_index, current_unit)
+        result = ExhibitionUnitMapper.reorder_exhibition_units(
+            current_unit.exhibition_id, current_unit.section, [unit.unit_id for unit in others]
+        )
+        return result > 0
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: guide_package_service.py
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import List, Optional
+
+from ruoyi_common.ruoyi.config import CONFIG_CACHE
+from ruoyi_common.utils.base import LogUtil
+from ruoyi_common.utils.minio_util import MinioUtil
+from exb_museum.constant import GuidePackageConstants
+from exb_museum.mapper.exhibition_mapper import ExhibitionMapper
+from exb_museum.service.museum_wx_service import MuseumWxService
+
+
+# zip内文件的固定时间戳，保证相同内容生成的导览包字节一致
+ZIP_ENTRY_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class GuidePackageService:
+    """展览离线导览包服务类"""
+
+    def build_all_exhibition_packages(self) -> List[dict]:
+        """
+        为所有正常状态的展览构建离线导览包，单个展览失败不影响其他展览
+
+        Returns:
+            List[dict]: 构建成功的导览包描述列表
+        """
+        packages = []
+        for exhibition_id in ExhibitionMapper.select_exhibition_ids_by_status(0):
+            try:
+                package = self.build_exhibition_package(exhibition_id)
+                if package:
+                    packages.append(package)
+            except Exception as e:
+                LogUtil.logger.error(f"构建展览{exhibition_id}的离线导览包失败: {e}")
+        return packages
+
+    def build_exhibition_package(self, exhibition_id: int) -> Optional[dict]:
+        """
+        构建展览离线导览包：zip内包含 manifest.json 和全部图片、音频、视频封面，上传到MinIO。
+        导览包按内容寻址，版本为manifest内容的sha256，内容未变时直接返回已有导览包；
+        重建时media_url未变的媒体从本地缓存读取，不再从MinIO下载
+
+        Args:
+            exhibition_id (int): 展览ID
+
+        Returns:
+            Optional[dict]: 导览包描述（版本、对象路径、sha256、大小），展览不存在时返回None
+        """
+        bundle = MuseumWxService().select_exhibition_bundle(exhibition_id)
+        if not bundle:
+            return None
+
+        # 导览包的版本标识是数据版本戳，不参与内容寻址
+        content = {key: value for key, value in bundle.items() if key != "version"}
+        media_urls = self._collect_media_urls(content)
+        manifest = {
+            "formatVersion": GuidePackageConstants.FORMAT_VERSION,
+            "exhibitionId": exhibition_id,
+            "content": content,
+            # 媒体在zip中的路径，客户端按media_url替换为本地文件，不在其中的视频原始文件在线播放
+            "files": {url: self._entry_name(url) for url in media_urls},
+        }
+        version = hashlib.sha256(
+            json.dumps(manifest, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        latest = self.select_exhibition_package(exhibition_id)
+        if latest and latest.get("version") == version:
+            return latest
+        manifest["version"] = version
+
+        with tempfile.TemporaryFile() as package_file:
+            with zipfile.ZipFile(package_file, "w", compression=zipfile.ZIP_DEFLATED) as package_zip:
+                manifest_info = zipfile.ZipInfo("manifest.json", ZIP_ENTRY_DATE_TIME)
+                manifest_info.compress_type = zipfile.ZIP_DEFLATED
+                package_zip.writestr(manifest_info, json.dumps(manifest, ensure_ascii=False, sort_keys=True))
+                for url in media_urls:
+                    # 媒体文件本身已压缩，直接存储
+                    media_info = zipfile.ZipInfo(self._entry_name(url), ZIP_ENTRY_DATE_TIME)
+                    with open(self._fetch_media(url), "rb") as media_file, package_zip.open(media_info, "w") as entry:
+                        for chunk in iter(lambda: media_file.read(1024 * 1024), b""):
+                            entry.write(chunk)
+
+            size = package_file.tell()
+            package_file.seek(0)
+            checksum = self._sha256_of(package_file)
+            package_file.seek(0)
+
+            object_name = f"{self._package_dir(exhibition_id)}/{version}.zip"
+            MinioUtil.upload_file(
+                object_name=object_name,
+                file_stream=package_file,
+                content_type="application/zip",
+                metadata={"sha256": checksum},
+            )
+
+        package = {
+            "exhibitionId": exhibition_id,
+            "version": version,
+            "objectName": object_name,
+            "sha256": checksum,
+            "size": size,
+            "buildTime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        MinioUtil.upload_file(
+            object_name=f"{self._package_dir(exhibition_id)}/{GuidePackageConstants.LATEST_OBJECT_NAME}",
+            file_stream=io.BytesIO(json.dumps(package, ensure_ascii=False).encode("utf-8")),
+            content_type="application/json",
+        )
+        return package
+
+    def select_exhibition_package(self, exhibition_id: int) -> Optional[dict]:
+        """
+        查询展览最新的离线导览包描述
+
+        Args:
+            exhibition_id (int): 展览ID
+
+        Returns:
+            Optional[dict]: 导览包描述，尚未构建时返回None
+        """
+        latest_name = f"{self._package_dir(exhibition_id)}/{GuidePackageConstants.LATEST_OBJECT_NAME}"
+        if MinioUtil.stat_object_or_none(latest_name) is None:
+            return None
+        return json.loads(MinioUtil.get_object_bytes(latest_name))
+
+    @staticmethod
+    def _collect_media_urls(content: dict) -> List[str]:
+        """
+        收集导览包引用的媒体对象：图片与音频的原始文件、视频的封面，去重并保持顺序。
+        视频原始文件体积过大，不打入导览包，客户端在线播放
+        """
+        items = [content["exhibition"], *content["units"], *content["collections"]]
+        urls = []
+        for item in items:
+            for media in item.get("mediaList", []):
+                urls.append(media.get("url"))
+                if media.get("type") != 2:
+                    urls.append(media.get("mediaUrl"))
+        return list(dict.fromkeys(url for url in urls if url))
+
+    @staticmethod
+    def _entry_name(media_url: str) -> str:
+        return "media/" + media_url.lstrip("/")
+
+    @staticmethod
+    def _package_dir(exhibition_id: int) -> str:
+        return f"{GuidePackageConstants.OBJECT_PREFIX}/{exhibition_id}"
+
+    @staticmethod
+    def _fetch_media(media_url: str) -> str:
+        """
+        获取媒体的本地缓存文件，media_url由上传时的uuid生成，内容不会变化，
+        缓存命中时不再从MinIO下载
+
+        Returns:
+            str: 本地文件路径
+        """
+        cache_dir = CONFIG_CACHE.get(GuidePackageConstants.CACHE_DIR_CONFIG) \
+            or os.path.join(tempfile.gettempdir(), "exb_guide_package")
+        os.makedirs(cache_dir, exist_ok=True)
+
+        suffix = os.path.splitext(media_url)[1]
+        file_path = os.path.join(cache_dir, hashlib.sha1(media_url.encode("utf-8")).hexdigest() + suffix)
+        if not os.path.exists(file_path):
+            # fget_object 先写临时文件再重命名，中途失败不会留下不完整的缓存
+            MinioUtil.download_file(media_url, file_path)
+        return file_path
+
+    @staticmethod
+    def _sha256_of(file_obj) -> str:
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: file_obj.read(1024 * 1024), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
@@ -3,13 +3,16 @@
 # @FileName: museum_media_service.py
 # @Time    : 2024-05-20 14:00:00
 
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 from werkzeug.datastructures import FileStorage
 from datetime import datetime
 from exb_museum.domain.entity import MuseumMedia
+from exb_museum.domain.vo import WxMediaItem
 from exb_museum.domain.po import MuseumMediaPo
 from exb_museum.mapper.museum_media_mapper import MuseumMediaMapper
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_framework.descriptor import custom_cache_evict
+from exb_museum.constant import MuseumCacheConstants
 from ruoyi_common.utils import FileUploadUtil
 from ruoyi_admin.ext import db
 
@@ -54,6 +57,39 @@ class MuseumMediaService:
             collection_medias_map[media.object_id].append(media)
         return collection_medias_map
     
+    def select_museum_media_map(self, media_requests: List[Tuple[str, List[int], Union[str, List[str], None]]]) -> dict[str, dict[int, List[MuseumMedia]]]:
+        """
+        一次查询加载多种对象的博物馆媒体，替代按对象类型多次调用 select_museum_media_list_batch
+        
+        Args:
+            media_requests (List[Tuple[str, List[int], Union[str, List[str], None]]]): (对象类型, 对象ID列表, 媒体类型) 列表，
+                同一对象类型只应出现一次
+            
+        Returns:
+            dict[str, dict[int, List[MuseumMedia]]]: 媒体映射，第一层键为对象类型，第二层键为对象ID
+        """
+        return self._group_media_map(media_requests, MuseumMediaMapper.select_museum_media_list_multi(media_requests))
+    
+    def select_wx_media_map(self, media_requests: List[Tuple[str, List[int], Union[str, List[str], None]]]) -> dict[str, dict[int, List[WxMediaItem]]]:
+        """
+        同 select_museum_media_map，只投影小程序列表需要的列，供小程序列表接口使用
+        
+        Args:
+            media_requests (List[Tuple[str, List[int], Union[str, List[str], None]]]): (对象类型, 对象ID列表, 媒体类型) 列表，
+                同一对象类型只应出现一次
+            
+        Returns:
+            dict[str, dict[int, List[WxMediaItem]]]: 媒体映射，第一层键为对象类型，第二层键为对象ID
+        """
+        return self._group_media_map(media_requests, MuseumMediaMapper.select_wx_media_list_multi(media_requests))
+    
+    @staticmethod
+    def _group_media_map(media_requests: list, medias: list) -> dict:
+        media_map = {object_type: {} for object_type, _, _ in media_requests}
+        for media in medias:
+            media_map.setdefault(media.object_type, {}).setdefault(media.object_id, []).append(media)
+        return media_map
+    
     def extend_media_list_fields(self, media_list: List[MuseumMedia]) -> dict[str, any]:
         """
         将博物馆媒体列表上的一些字段经过处理后，安装到对应的对象上
@@ -97,6 +133,7 @@ class MuseumMediaService:
         """
         return MuseumMediaMapper.select_museum_media_by_id(media_id)
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def upload_museum_media(self, object_id: int, object_type: str, file: FileStorage, media_type: str) -> MuseumMedia:
         """
@@ -152,6 +189,7 @@ class MuseumMediaService:
         # 返回实体对象
         return self.select_museum_media_by_id(media_id)
 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def update_media_sort_order(self, object_id: int, object_type: str, media_type: str, sorted_media_ids: List[int]) -> int:
         """
@@ -168,6 +206,7 @@ class MuseumMediaService:
         """
         return MuseumMediaMapper.update_media_sort_order(object_id, object_type, media_type, sorted_media_ids)
                 
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def update_museum_media(self, museum_media: MuseumMedia) -> int:
         """
@@ -190,6 +229,7 @@ class MuseumMediaService:
         # 更新数据库
         # return self.museum_media_mapper.update_museum_media(media_po)
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def delete_museum_media_by_id(self, media_id: int) -> int:
         """
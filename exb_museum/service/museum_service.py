@@ -9,6 +9,8 @@ from ruoyi_common.exception import ServiceException
 from ruoyi_common.utils.base import LogUtil
 from ruoyi_common.utils import security_util
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_framework.descriptor import custom_cache_evict
+from exb_museum.constant import MuseumCacheConstants
 from exb_museum.domain.entity import Museum
 from exb_museum.mapper.museum_mapper import MuseumMapper
 from ruoyi_framework.descriptor.datascope import DataScope
@@ -57,6 +59,7 @@ class MuseumService:
         return MuseumMapper.select_museum_by_id(museum_id)
 
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def insert_museum(self, museum: Museum) -> int:
         """
@@ -74,6 +77,7 @@ class MuseumService:
         return MuseumMapper.insert_museum(museum)
 
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def update_museum(self, museum: Museum) -> int:
         """
@@ -91,6 +95,7 @@ class MuseumService:
 
     
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def delete_museum_by_ids(self, ids: List[int]) -> int:
         """
@@ -105,6 +110,7 @@ class MuseumService:
         return MuseumMapper.delete_museum_by_ids(ids)
 
     
+    @custom_cache_evict(key_prefixes=[MuseumCacheConstants.WX_HOME_KEY, MuseumCacheConstants.WX_CONTENT_VERSION_KEY])
     @Transactional(db.session)
     def import_museum(self, museum_list: List[Museum], is_update: bool = False) -> str:
         """
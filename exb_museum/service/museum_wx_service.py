@@ -0,0 +1,587 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: museum_wx_service.py
+
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+from flask import g
+from sqlalchemy import select, and_, or_
+
+from ruoyi_admin.ext import redis_cache
+from ruoyi_common.sqlalchemy.query import KeysetPagination
+from ruoyi_framework.descriptor import custom_cacheable
+from exb_museum.constant import MuseumCacheConstants, WxPageConstants, WxSyncConstants
+from exb_museum.domain.vo import WxCollectionItem, WxExhibitionItem, WxActivityItem, WxReservationItem
+from exb_museum.domain.po import MuseumPo, CollectionPo, ExhibitionPo, ExhibitionUnitPo, ActivityPo, ActivityReservationPo, MuseumMediaPo
+from exb_museum.mapper.content_version_mapper import ContentVersionMapper
+from exb_museum.mapper.collection_mapper import CollectionMapper
+from exb_museum.mapper.exhibition_mapper import ExhibitionMapper
+from exb_museum.mapper.activity_mapper import ActivityMapper
+from exb_museum.mapper.activity_reservation_mapper import ActivityReservationMapper
+from exb_museum.mapper.exhibition_unit_mapper import ExhibitionUnitMapper
+from exb_museum.mapper.sync_mapper import SyncMapper
+from exb_museum.service.museum_service import MuseumService
+from exb_museum.service.museum_media_service import MuseumMediaService
+from exb_museum.service.exhibition_unit_service import ExhibitionUnitService
+from exb_museum.service.reservation_burst_service import ReservationBurstService
+
+
+class MuseumWxService:
+    """小程序端数据组装服务类"""
+
+    # 版本戳包含当前用户数据的接口，不缓存版本戳
+    _USER_VERSION_RESOURCES = frozenset(["activity_detail", "wx_my_activity_reservation_list"])
+
+    @custom_cacheable(
+        key_prefix=MuseumCacheConstants.WX_HOME_KEY,
+        key_field="app_id",
+        expire_time=MuseumCacheConstants.WX_HOME_EXPIRE,
+    )
+    def select_museum_home(self, app_id: str) -> Optional[dict]:
+        """
+        构建小程序首页数据快照，按app_id缓存在Redis中，
+        博物馆、藏品、展览、活动及媒体数据变更时由对应服务清除
+
+        Args:
+            app_id (str): 小程序AppID
+
+        Returns:
+            Optional[dict]: 首页数据，博物馆不存在时返回None
+        """
+        museum_service = MuseumService()
+        media_service = MuseumMediaService()
+
+        # 获取博物馆信息
+        museum = museum_service.select_museum_by_app_id(app_id)
+        if not museum:
+            return None
+
+        # 获取该博物馆下正常状态的藏品、展览、活动，各取首页展示的前几条
+        page_size = WxPageConstants.HOME_PAGE_SIZE
+        collections, _ = self.select_collection_page(museum.museum_id, page_size)
+        exhibitions, _ = self.select_exhibition_page(museum.museum_id, page_size)
+        activities, _ = self.select_activity_page(museum.museum_id, page_size)
+
+        # 一次查询获取博物馆、藏品、展览、活动的图片
+        media_map = media_service.select_wx_media_map([
+            ('museum', [museum.museum_id], '1'),
+            ('collection', [col.collection_id for col in collections], '1'),
+            ('exhibition', [exh.exhibition_id for exh in exhibitions], '1'),
+            ('activity', [act.activity_id for act in activities], '1'),
+        ])
+        media_list = media_map['museum'].get(museum.museum_id, [])
+
+        # 转换藏品数据格式
+        collectio_media_map = media_map['collection']
+        collection_list = []
+        for col in collections:
+            collection_item = {
+                "id": col.collection_id,
+                "title": col.collection_name or "",
+                "period": col.age or "",
+                "img": "",  # 后续可以从媒体表获取图片
+                "description": col.description or "",
+                "material": col.material or "",
+                "sizeInfo": col.size_info or "",
+                "author": col.author or "",
+                "type": col.collection_type or ""
+            }
+            # 从媒体表获取藏品图片
+            medias = collectio_media_map.get(col.collection_id, [])
+            media_field = media_service.extend_media_list_fields(medias)
+            collection_item.update(media_field)
+
+            collection_list.append(collection_item)
+
+        # 转换展览数据格式
+        exhibition_media_map = media_map['exhibition']
+        exhibition_list = []
+        for exh in exhibitions:
+            exhibition_item = {
+                "id": exh.exhibition_id,
+                "title": exh.exhibition_name or "",
+                "description": exh.description or "",
+                "date": exh.get_formated_date(),
+                "place": exh.hall or "",
+                "status": exh.get_status(),
+                "statusText": exh.get_status_text(),
+                "img": "",  # 后续可以从媒体表获取图片
+                "organizer": exh.organizer or "",
+                "startTime": exh.start_time.strftime('%Y-%m-%d') if exh.start_time else "",
+                "endTime": exh.end_time.strftime('%Y-%m-%d') if exh.end_time else ""
+            }
+            # 从媒体表获取展览图片
+            medias = exhibition_media_map.get(exh.exhibition_id, [])
+            media_field = media_service.extend_media_list_fields(medias)
+            exhibition_item.update(media_field)
+
+            exhibition_list.append(exhibition_item)
+
+        # 转换活动数据格式
+        activity_media_map = media_map['activity']
+        activity_list = []
+        for act in activities:
+            activity_item = {
+                "id": act.activity_id,
+                "title": act.activity_name or "",
+                "description": act.introduction or "",
+                "type": act.activity_type or "",
+                "location": act.location or "",
+                "maxRegistration": act.max_registration or 0,
+                "registrationCount": act.registration_count or 0,
+                "presenter": act.presenter or "",
+                "targetAudience": act.target_audience or "",
+                "startTime": act.activity_start_time.strftime('%Y-%m-%d') if act.activity_start_time else "",
+                "endTime": act.activity_end_time.strftime('%Y-%m-%d') if act.activity_end_time else "",
+                "time": act.get_formatted_time(),
+            }
+
+            # 从媒体表获取活动图片
+            medias = activity_media_map.get(act.activity_id, [])
+            media_field = media_service.extend_media_list_fields(medias)
+            activity_item.update(media_field)
+
+            activity_list.append(activity_item)
+
+        # 构建首页数据
+        home_data = {
+            "museum": {
+                "id": museum.museum_id,
+                "name": museum.museum_name,
+                "description": museum.description,
+                "openStatus": "今日开放",
+                "openTime": "10:00 - 18:00",
+                "bgImageList": [media.media_url for media in media_list] if media_list else []
+            },
+            "collections": collection_list,
+            "exhibitions": exhibition_list,
+            "educations": activity_list,
+        }
+        return home_data
+
+
+    def select_exhibition_bundle(self, exhibition_id: int) -> Optional[dict]:
+        """
+        查询展览导览包：展览信息、按章节和排序排列的全部展览单元、去重后的关联藏品及其全部媒体，
+        供小程序一次请求完成整个展览的导览，替代逐个单元请求详情。
+        导览包与用户无关，按不含用户的版本标识缓存，所有用户共用
+
+        Args:
+            exhibition_id (int): 展览ID
+
+        Returns:
+            Optional[dict]: 导览包数据，展览不存在时返回None
+        """
+        # 导览包内容不含随时间变化的状态，缓存Key只用数据版本戳，不随ETag时间片轮换
+        version, _ = self._select_content_stamp("exhibition_bundle", exhibition_id=exhibition_id)
+        return self._build_exhibition_bundle(exhibition_id, version)
+
+    @custom_cacheable(
+        key_prefix=MuseumCacheConstants.WX_EXHIBITION_BUNDLE_KEY,
+        key_field="version",
+        expire_time=MuseumCacheConstants.WX_EXHIBITION_BUNDLE_EXPIRE,
+    )
+    def _build_exhibition_bundle(self, exhibition_id: int, version: str) -> Optional[dict]:
+        """
+        组装展览导览包，固定4次查询：展览、展览单元、关联藏品、全部媒体，按版本标识缓存在Redis中
+
+        Args:
+            exhibition_id (int): 展览ID
+            version (str): 导览包的版本标识，作为缓存Key
+
+        Returns:
+            Optional[dict]: 导览包数据，展览不存在时返回None
+        """
+        media_service = MuseumMediaService()
+
+        exhibition = ExhibitionMapper.select_exhibition_by_id(exhibition_id)
+        if not exhibition:
+            return None
+        units = ExhibitionUnitMapper.select_exhibition_units_by_exhibition_id(exhibition_id)
+
+        # 多个展品单元可能引用同一件藏品，按首次出现的顺序去重
+        unit_collection_ids = {unit.unit_id: unit.get_collection_ids() for unit in units}
+        collection_ids = list(dict.fromkeys(
+            collection_id for ids in unit_collection_ids.values() for collection_id in ids
+        ))
+        collections = CollectionMapper.select_collection_by_ids(collection_ids)
+
+        # 一次查询获取展览、展览单元、藏品的全部媒体（1为图片，2为视频，3为音频）
+        media_map = media_service.select_museum_media_map([
+            ('exhibition', [exhibition_id], [1, 2, 3]),
+            ('exhibition_unit', [unit.unit_id for unit in units], [1, 2, 3]),
+            ('collection', collection_ids, [1, 2, 3]),
+        ])
+
+        exhibition_data = {
+            "id": exhibition.exhibition_id,
+            "title": exhibition.exhibition_name or "",
+            "description": exhibition.description or "",
+            "date": exhibition.get_formated_date(),
+            "startDate": exhibition.start_time.strftime('%Y-%m-%d') if exhibition.start_time else "",
+            "endDate": exhibition.end_time.strftime('%Y-%m-%d') if exhibition.end_time else "",
+            "organizer": exhibition.organizer or "",
+            "hall": exhibition.hall or "",
+            "exhibitionType": exhibition.get_exhibtion_type_desc(),
+            "contentTags": exhibition.content_tags or "",
+            "sections": exhibition.sections or "",
+        }
+        exhibition_data.update(media_service.extend_media_list_fields(
+            media_map['exhibition'].get(exhibition_id, [])
+        ))
+
+        # 已删除或不存在的藏品不出现在 collectionIds 中
+        existing_collection_ids = {collection.collection_id for collection in collections}
+        units_data = []
+        unit_positions = ExhibitionUnitService().build_unit_positions(units)
+        for unit in units:
+            unit_data = {
+                "id": unit.unit_id,
+                "name": unit.unit_name or "",
+                "type": unit.unit_type,  # 0展品单元 1文字单元 2多媒体单元
+                "section": unit.section or "",
+                "sortOrder": unit_positions[unit.unit_id],  # 章节内序号，不暴露内部排序键
+                "exhibitLabel": unit.exhibit_label or "",
+                "guideText": unit.guide_text or "",
+                "collectionIds": [
+                    collection_id for collection_id in unit_collection_ids[unit.unit_id]
+                    if collection_id in existing_collection_ids
+                ],
+            }
+            unit_data.update(media_service.extend_media_list_fields(
+                media_map['exhibition_unit'].get(unit.unit_id, [])
+            ))
+            units_data.append(unit_data)
+
+        collection_order = {collection_id: index for index, collection_id in enumerate(collection_ids)}
+        collections_data = []
+        for collection in sorted(collections, key=lambda col: collection_order[col.collection_id]):
+            collection_data = {
+                "id": collection.collection_id,
+                "name": collection.collection_name or "",
+                "age": collection.age or "",
+                "description": collection.description or "",
+                "material": collection.material or "",
+                "sizeInfo": collection.size_info or "",
+                "author": collection.author or "",
+                "type": collection.collection_type or "",
+            }
+            collection_data.update(media_service.extend_media_list_fields(
+                media_map['collection'].get(collection.collection_id, [])
+            ))
+            collections_data.append(collection_data)
+
+        return {
+            "version": version,
+            "exhibition": exhibition_data,
+            "units": units_data,
+            "collections": collections_data,
+        }
+
+    def select_exhibition_page(self, museum_id: int, page_size: int, cursor: str = None) -> Tuple[List[WxExhibitionItem], Optional[str]]:
+        """
+        游标分页查询博物馆的展览列表
+
+        Args:
+            museum_id (int): 博物馆ID
+            page_size (int): 每页条数，超过上限时按上限返回
+            cursor (str, optional): 上一页返回的游标
+
+        Raises:
+            ValueError: 游标格式错误
+
+        Returns:
+            Tuple[List[WxExhibitionItem], Optional[str]]: (展览列表项, 下一页游标)
+        """
+        return ExhibitionMapper.select_wx_exhibition_page(museum_id, self._keyset_pagination(page_size, cursor))
+
+    def select_collection_page(self, museum_id: int, page_size: int, cursor: str = None) -> Tuple[List[WxCollectionItem], Optional[str]]:
+        """
+        游标分页查询博物馆的藏品列表
+
+        Args:
+            museum_id (int): 博物馆ID，小于等于0时不限博物馆
+            page_size (int): 每页条数，超过上限时按上限返回
+            cursor (str, optional): 上一页返回的游标
+
+        Raises:
+            ValueError: 游标格式错误
+
+        Returns:
+            Tuple[List[WxCollectionItem], Optional[str]]: (藏品列表项, 下一页游标)
+        """
+        return CollectionMapper.select_wx_collection_page(museum_id, self._keyset_pagination(page_size, cursor))
+
+    def select_activity_page(self, museum_id: int, page_size: int, cursor: str = None) -> Tuple[List[WxActivityItem], Optional[str]]:
+        """
+        游标分页查询博物馆的活动列表
+
+        Args:
+            museum_id (int): 博物馆ID
+            page_size (int): 每页条数，超过上限时按上限返回
+            cursor (str, optional): 上一页返回的游标
+
+        Raises:
+            ValueError: 游标格式错误
+
+        Returns:
+            Tuple[List[WxActivityItem], Optional[str]]: (活动列表项, 下一页游标)
+        """
+        return ActivityMapper.select_wx_activity_page(museum_id, self._keyset_pagination(page_size, cursor))
+
+    def select_my_reservation_page(self, wx_user_id: int, page_size: int, cursor: str = None) -> Tuple[List[WxReservationItem], Optional[str]]:
+        """
+        游标分页查询微信用户的活动预约清单，预约与活动一次关联查询
+
+        Args:
+            wx_user_id (int): 微信用户ID
+            page_size (int): 每页条数，超过上限时按上限返回
+            cursor (str, optional): 上一页返回的游标
+
+        Raises:
+            ValueError: 游标格式错误
+
+        Returns:
+            Tuple[List[WxReservationItem], Optional[str]]: (预约列表项, 下一页游标)
+        """
+        return ActivityReservationMapper.select_wx_reservation_page(wx_user_id, self._keyset_pagination(page_size, cursor))
+
+    @staticmethod
+    def _keyset_pagination(page_size: int, cursor: Optional[str]) -> KeysetPagination:
+        return KeysetPagination(
+            page_size=page_size or WxPageConstants.DEFAULT_PAGE_SIZE,
+            cursor=cursor or None,
+            max_page_size=WxPageConstants.MAX_PAGE_SIZE,
+        )
+
+    def select_sync_delta(self, app_id: str, since: str = None, with_ids: bool = False) -> dict:
+        """
+        查询小程序增量同步数据：博物馆、展览、展览单元、藏品、活动、媒体中
+        自 since 版本之后新增、修改或逻辑删除的行。
+        各类数据当前存在的ID（用于清理物理删除的数据）随数据总量增长，只在全量同步或显式要求时返回
+
+        Args:
+            app_id (str): 小程序AppID
+            since (str, optional): 上次同步返回的版本号，为空时全量同步
+            with_ids (bool): 增量同步时是否同时返回各类数据当前存在的ID
+
+        Raises:
+            ValueError: 版本号格式错误
+
+        Returns:
+            dict: 各类数据的变更行（及ID列表），以及新的版本号
+        """
+        since_time = None
+        if since:
+            since_time = datetime.strptime(since, WxSyncConstants.VERSION_FORMAT) \
+                - timedelta(seconds=WxSyncConstants.OVERLAP_SECONDS)
+
+        museum_ids = select(MuseumPo.museum_id).where(MuseumPo.app_id == app_id)
+        exhibition_ids = select(ExhibitionPo.exhibition_id).where(ExhibitionPo.museum_id.in_(museum_ids))
+        unit_ids = select(ExhibitionUnitPo.unit_id).where(ExhibitionUnitPo.exhibition_id.in_(exhibition_ids))
+        collection_ids = select(CollectionPo.collection_id).where(CollectionPo.museum_id.in_(museum_ids))
+        activity_ids = select(ActivityPo.activity_id).where(ActivityPo.museum_id.in_(museum_ids))
+        sources = {
+            "museums": (MuseumPo, MuseumPo.museum_id, MuseumPo.app_id == app_id),
+            "exhibitions": (ExhibitionPo, ExhibitionPo.exhibition_id, ExhibitionPo.museum_id.in_(museum_ids)),
+            "units": (ExhibitionUnitPo, ExhibitionUnitPo.unit_id, ExhibitionUnitPo.exhibition_id.in_(exhibition_ids)),
+            "collections": (CollectionPo, CollectionPo.collection_id, CollectionPo.museum_id.in_(museum_ids)),
+            "activities": (ActivityPo, ActivityPo.activity_id, ActivityPo.museum_id.in_(museum_ids)),
+            "medias": (MuseumMediaPo, MuseumMediaPo.media_id, or_(
+                and_(MuseumMediaPo.object_type == 'museum', MuseumMediaPo.object_id.in_(museum_ids)),
+                and_(MuseumMediaPo.object_type == 'exhibition', MuseumMediaPo.object_id.in_(exhibition_ids)),
+                and_(MuseumMediaPo.object_type == 'exhibition_unit', MuseumMediaPo.object_id.in_(unit_ids)),
+                and_(MuseumMediaPo.object_type == 'collection', MuseumMediaPo.object_id.in_(collection_ids)),
+                and_(MuseumMediaPo.object_type == 'activity', MuseumMediaPo.object_id.in_(activity_ids)),
+            )),
+        }
+
+        with_ids = with_ids or since_time is None
+        delta = {}
+        latest = None
+        for name, (po, id_column, criterion) in sources.items():
+            rows = SyncMapper.select_changed_rows(po, criterion, since_time)
+            # 历史数据的 update_time 可能为空，不参与版本号计算
+            row_latest = rows[-1]["updateTime"] if rows else None
+            if row_latest is not None and (latest is None or row_latest > latest):
+                latest = row_latest
+            delta[name] = {"changed": rows}
+            if with_ids:
+                delta[name]["ids"] = SyncMapper.select_ids(id_column, criterion)
+
+        # 没有变更时版本号保持不变
+        delta["version"] = latest.strftime(WxSyncConstants.VERSION_FORMAT) if latest else since
+        return delta
+
+    def select_content_version(self, resource: str, wx_user_id: int = None, **kwargs) -> Tuple[str, Optional[datetime]]:
+        """
+        查询小程序接口数据的版本戳，供条件请求（ETag / 304）使用，不组装响应数据。
+        与用户无关的接口优先读取Redis中缓存的版本戳，命中时只需一次Redis读取
+
+        Args:
+            resource (str): 接口资源名，与小程序端接口函数名一致
+            wx_user_id (int, optional): 当前微信用户ID，用于用户相关的接口
+            **kwargs: 接口路由参数
+
+        Returns:
+            Tuple[str, Optional[datetime]]: (版本标识, 最后修改时间)
+        """
+        digest, last_modified = self._select_content_stamp(resource, wx_user_id, **kwargs)
+
+        # 响应中不落库的实时状态（如抢报名额池）每次读取，不参与版本戳缓存
+        state_builder = getattr(self, f"_{resource}_version_state", None)
+        state = state_builder(wx_user_id=wx_user_id, **kwargs) if state_builder else None
+
+        # 展览、活动的状态文本依赖当前时间，按时间片轮换版本，避免客户端长期持有过期状态
+        time_bucket = int(time.time()) // MuseumCacheConstants.WX_ETAG_TIME_BUCKET
+        raw = json.dumps([resource, wx_user_id, kwargs, digest, state, time_bucket], default=str, sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest(), last_modified
+
+    def _select_content_stamp(self, resource: str, wx_user_id: int = None, **kwargs) -> Tuple[str, Optional[datetime]]:
+        """
+        查询接口相关数据及其媒体的 max(update_time) 和行数，摘要为版本戳。
+        与用户无关的接口按资源和路由参数缓存在Redis中，内容写操作清除缓存；
+        与用户相关的接口每次查询数据库
+
+        Args:
+            resource (str): 接口资源名
+            wx_user_id (int, optional): 当前微信用户ID
+            **kwargs: 接口路由参数
+
+        Returns:
+            Tuple[str, Optional[datetime]]: (版本戳摘要, 最后修改时间)
+        """
+        builder = getattr(self, f"_{resource}_version_sources", None)
+        if builder is None:
+            raise ValueError(f"不支持的版本戳资源: {resource}")
+
+        # 同一请求内条件请求装饰器与服务可能先后查询同一版本戳，只查询一次
+        user_related = resource in self._USER_VERSION_RESOURCES
+        cache_key = self._content_version_key(resource, **kwargs)
+        memo_key = f"{cache_key}:{wx_user_id}" if user_related else cache_key
+        stamps = g.setdefault("wx_content_stamps", {})
+        if memo_key not in stamps:
+            stamps[memo_key] = self._load_content_stamp(
+                builder, resource, None if user_related else cache_key, wx_user_id, **kwargs
+            )
+        return stamps[memo_key]
+
+    @staticmethod
+    def _load_content_stamp(builder, resource: str, cache_key: Optional[str], wx_user_id: int = None, **kwargs) -> Tuple[str, Optional[datetime]]:
+        """
+        读取版本戳，指定缓存Key时先读Redis，未命中再查询数据库并写回
+        """
+        if cache_key:
+            cached = redis_cache.get(cache_key)
+            if cached:
+                digest, last_modified = json.loads(cached)
+                return digest, datetime.fromisoformat(last_modified) if last_modified else None
+
+        stamp = ContentVersionMapper.select_content_version(builder(wx_user_id=wx_user_id, **kwargs))
+        raw = json.dumps([resource, kwargs, stamp], default=str, sort_keys=True)
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        last_modified = max((value for value in stamp if isinstance(value, datetime)), default=None)
+        if last_modified is not None:
+            last_modified = last_modified.astimezone(timezone.utc)
+
+        if cache_key:
+            redis_cache.set(
+                cache_key,
+                json.dumps([digest, last_modified.isoformat() if last_modified else None]),
+                ex=MuseumCacheConstants.WX_CONTENT_VERSION_EXPIRE,
+            )
+        return digest, last_modified
+
+    @staticmethod
+    def _content_version_key(resource: str, **kwargs) -> str:
+        params = ":".join(str(kwargs[name]) for name in sorted(kwargs))
+        return f"{MuseumCacheConstants.WX_CONTENT_VERSION_KEY}:{resource}:{params}"
+
+    def _museum_home_version_sources(self, app_id: str, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        museum_ids = select(MuseumPo.museum_id).where(MuseumPo.app_id == app_id)
+        return [
+            (MuseumPo, MuseumPo.museum_id, MuseumPo.app_id == app_id, 'museum'),
+            (CollectionPo, CollectionPo.collection_id, CollectionPo.museum_id.in_(museum_ids), 'collection'),
+            (ExhibitionPo, ExhibitionPo.exhibition_id, ExhibitionPo.museum_id.in_(museum_ids), 'exhibition'),
+            (ActivityPo, ActivityPo.activity_id, ActivityPo.museum_id.in_(museum_ids), 'activity'),
+        ]
+
+    def _exhibition_list_by_museum_version_sources(self, museum_id: int, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        return [
+            (ExhibitionPo, ExhibitionPo.exhibition_id, ExhibitionPo.museum_id == museum_id, 'exhibition'),
+        ]
+
+    def _exhibition_detail_version_sources(self, exhibition_id: int, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        return [
+            (ExhibitionPo, ExhibitionPo.exhibition_id, ExhibitionPo.exhibition_id == exhibition_id, 'exhibition'),
+            (ExhibitionUnitPo, ExhibitionUnitPo.unit_id, ExhibitionUnitPo.exhibition_id == exhibition_id, 'exhibition_unit'),
+        ]
+
+    def _exhibition_bundle_version_sources(self, exhibition_id: int, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        # 单元引用的藏品保存在JSON字段中，需要先取出各单元引用的藏品ID，其他藏品的变更不影响导览包
+        units = ExhibitionUnitMapper.select_exhibition_units_by_exhibition_id(exhibition_id)
+        collection_ids = list({collection_id for unit in units for collection_id in unit.get_collection_ids()})
+        return [
+            (ExhibitionPo, ExhibitionPo.exhibition_id, ExhibitionPo.exhibition_id == exhibition_id, 'exhibition'),
+            (ExhibitionUnitPo, ExhibitionUnitPo.unit_id, ExhibitionUnitPo.exhibition_id == exhibition_id, 'exhibition_unit'),
+            (CollectionPo, CollectionPo.collection_id, CollectionPo.collection_id.in_(collection_ids), 'collection'),
+        ]
+
+    def _unit_detail_version_sources(self, unit_id: int, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        # 单元关联的藏品保存在JSON字段中，需要先取出藏品ID
+        unit = ExhibitionUnitService().select_exhibition_unit_by_id(unit_id)
+        collection_ids = unit.get_collection_ids() if unit else []
+        exhibition_ids = select(ExhibitionUnitPo.exhibition_id).where(ExhibitionUnitPo.unit_id == unit_id)
+        # 详情中的 sortOrder 是章节内序号，同章节其他单元的增删和排序也会改变它
+        sibling_filter = and_(
+            ExhibitionUnitPo.exhibition_id == unit.exhibition_id,
+            ExhibitionUnitPo.section == unit.section,
+        ) if unit else ExhibitionUnitPo.unit_id == unit_id
+        return [
+            (ExhibitionUnitPo, ExhibitionUnitPo.unit_id, ExhibitionUnitPo.unit_id == unit_id, 'exhibition_unit'),
+            (ExhibitionUnitPo, ExhibitionUnitPo.unit_id, sibling_filter, None),
+            (ExhibitionPo, ExhibitionPo.exhibition_id, ExhibitionPo.exhibition_id.in_(exhibition_ids), None),
+            (CollectionPo, CollectionPo.collection_id, CollectionPo.collection_id.in_(collection_ids), 'collection'),
+        ]
+
+    def _collection_list_by_museum_version_sources(self, museum_id: int, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        return [
+            (CollectionPo, CollectionPo.collection_id, CollectionPo.museum_id == museum_id, 'collection'),
+        ]
+
+    def _collection_detail_version_sources(self, collection_id: int, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        museum_ids = select(CollectionPo.museum_id).where(CollectionPo.collection_id == collection_id)
+        return [
+            (CollectionPo, CollectionPo.collection_id, CollectionPo.collection_id == collection_id, 'collection'),
+            (MuseumPo, MuseumPo.museum_id, MuseumPo.museum_id.in_(museum_ids), None),
+        ]
+
+    def _activity_list_by_museum_version_sources(self, museum_id: int, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        return [
+            (ActivityPo, ActivityPo.activity_id, ActivityPo.museum_id == museum_id, 'activity'),
+        ]
+
+    def _activity_detail_version_sources(self, activity_id: int, wx_user_id: int = None, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        return [
+            (ActivityPo, ActivityPo.activity_id, ActivityPo.activity_id == activity_id, 'activity'),
+            (ActivityReservationPo, ActivityReservationPo.reservation_id, and_(
+                ActivityReservationPo.activity_id == activity_id,
+                ActivityReservationPo.wx_user_id == wx_user_id
+            ), None),
+        ]
+
+    def _activity_detail_version_state(self, activity_id: int, wx_user_id: int = None, **_) -> List[Any]:
+        # 抢报模式下报名先写入名额池再异步落库，名额与是否已报名以名额池为准，未加载时均为None
+        burst_service = ReservationBurstService()
+        return [burst_service.get_seats(activity_id), burst_service.is_reserved(activity_id, wx_user_id)]
+
+    def _wx_my_activity_reservation_list_version_sources(self, wx_user_id: int = None, **_) -> List[Tuple[Any, Any, Any, Optional[str]]]:
+        activity_ids = select(ActivityReservationPo.activity_id).where(ActivityReservationPo.wx_user_id == wx_user_id)
+        return [
+            (ActivityReservationPo, ActivityReservationPo.reservation_id, ActivityReservationPo.wx_user_id == wx_user_id, None),
+            (ActivityPo, ActivityPo.activity_id, ActivityPo.activity_id.in_(activity_ids), 'activity'),
+        ]
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: reservation_burst_service.py
+
+import logging
+import os
+import socket
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from redis.exceptions import ResponseError
+
+from ruoyi_admin.ext import db, redis_cache
+from ruoyi_common.exception import ServiceException
+from ruoyi_common.sqlalchemy.transaction import Transactional, after_commit
+from exb_museum.constant import ReservationBurstConstants, WaitlistConstants
+from exb_museum.domain.entity import Activity
+from exb_museum.mapper.activity_reservation_mapper import ActivityReservationMapper
+from exb_museum.mapper.activity_waitlist_mapper import ActivityWaitlistMapper
+
+
+logger = logging.getLogger(__name__)
+
+# 名额池加载：未加载时以数据库中的报名用户初始化用户集合，再按集合大小计算剩余名额；
+# 已加载时仅按新的最大报名人数重算剩余名额，尚未落库的报名也已计入集合
+LOAD_POOL_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('DEL', KEYS[2])
+    for i = 2, #ARGV, 1000 do
+        redis.call('SADD', KEYS[2], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+    end
+end
+local max_registration = tonumber(ARGV[1])
+local seats = -1
+if max_registration > 0 then
+    seats = math.max(max_registration - redis.call('SCARD', KEYS[2]), 0)
+end
+redis.call('SET', KEYS[1], seats)
+return seats
+"""
+
+# 抢报：校验名额池、去重、扣减名额并写入预约流，返回值与 ReservationBurstConstants.CLAIM_* 一致
+CLAIM_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+if redis.call('SISMEMBER', KEYS[2], ARGV[1]) == 1 then
+    return 0
+end
+local seats = tonumber(redis.call('GET', KEYS[1]))
+if seats == 0 then
+    return -2
+end
+if seats > 0 then
+    redis.call('DECR', KEYS[1])
+end
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('XADD', KEYS[3], '*', 'op', 'add', 'activity_id', ARGV[2], 'wx_user_id', ARGV[1],
+    'phone_number', ARGV[3], 'registration_time', ARGV[4])
+redis.call('INCR', KEYS[4])
+return 1
+"""
+
+# 归还名额：名额池未加载返回-1，用户未报名返回0；候补队列有人时名额直接转给排在最前的用户，
+# 否则剩余名额加1；ARGV[3]为1时写入取消记录，由定时任务删除预约
+RELEASE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+if redis.call('SREM', KEYS[2], ARGV[1]) == 0 then
+    return 0
+end
+if ARGV[3] == '1' then
+    redis.call('XADD', KEYS[3], '*', 'op', 'cancel', 'activity_id', ARGV[2], 'wx_user_id', ARGV[1])
+    redis.call('INCR', KEYS[5])
+end
+while true do
+    local head = redis.call('ZPOPMIN', KEYS[4])
+    if #head == 0 then
+        break
+    end
+    if redis.call('SADD', KEYS[2], head[1]) == 1 then
+        redis.call('XADD', KEYS[3], '*', 'op', 'add', 'activity_id', ARGV[2], 'wx_user_id', head[1],
+            'phone_number', '', 'registration_time', ARGV[4], 'waitlist', '1')
+        redis.call('INCR', KEYS[5])
+        return 1
+    end
+end
+if tonumber(redis.call('GET', KEYS[1])) >= 0 then
+    redis.call('INCR', KEYS[1])
+end
+return 1
+"""
+
+
+# 清除名额池：仍有未落库的预约流条目时拒绝清除并返回0，否则清除后返回1；
+# 与报名脚本互斥执行，清除后的报名回到数据库条件更新，数据库中的报名人数已包含全部抢报预约
+UNLOAD_POOL_SCRIPT = """
+if tonumber(redis.call('GET', KEYS[3]) or '0') > 0 then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[2], KEYS[3])
+return 1
+"""
+
+
+class ReservationBurstService:
+    """
+    活动抢报模式服务类
+
+    开启抢报模式的活动，名额与报名去重放在Redis中，报名请求只需一次Lua脚本调用；
+    报名与取消按顺序写入预约流，由定时任务批量写入活动预约表并同步报名人数
+    """
+
+    # 当前进程是否已创建消费组
+    _group_ready = False
+
+    def __init__(self):
+        self.load_pool_script = redis_cache.register_script(LOAD_POOL_SCRIPT)
+        self.claim_script = redis_cache.register_script(CLAIM_SCRIPT)
+        self.release_script = redis_cache.register_script(RELEASE_SCRIPT)
+        self.unload_pool_script = redis_cache.register_script(UNLOAD_POOL_SCRIPT)
+
+    def sync_pool(self, activity: Activity):
+        """
+        按活动的抢报模式加载或清除名额池，需在活动保存的事务中调用。
+        开启时在事务提交后加载；关闭时立即清除，仍有抢报预约未落库时拒绝关闭，
+        避免清除后的数据库报名人数漏算这些预约而超卖
+
+        Args:
+            activity (Activity): 活动信息表对象
+
+        Raises:
+            ServiceException: 仍有抢报预约未落库
+        """
+        activity_id = activity.activity_id
+        if activity.burst_mode != 1:
+            if not self.try_unload_pool(activity_id):
+                raise ServiceException("仍有抢报预约正在写入，请稍后再关闭抢报模式")
+            return
+        max_registration = activity.max_registration or 0
+        wx_user_ids = []
+        if not redis_cache.exists(self._seats_key(activity_id)):
+            wx_user_ids = ActivityReservationMapper.select_wx_user_ids_by_activity(activity_id)
+        after_commit(db.session, lambda: self.load_pool(activity_id, max_registration, wx_user_ids))
+
+    def load_pool(self, activity_id: int, max_registration: int, wx_user_ids: List[int]) -> int:
+        """
+        加载活动的名额池，已加载时按最大报名人数重算剩余名额
+
+        Args:
+            activity_id (int): 活动ID
+            max_registration (int): 最大报名人数，小于等于0表示不限
+            wx_user_ids (List[int]): 数据库中已报名的微信用户ID，仅在名额池未加载时使用
+
+        Returns:
+            int: 剩余名额，-1表示不限
+        """
+        return int(self.load_pool_script(
+            keys=[self._seats_key(activity_id), self._users_key(activity_id)],
+            args=[max_registration, *wx_user_ids]
+        ))
+
+    def try_unload_pool(self, activity_id: int) -> bool:
+        """
+        清除活动的名额池，之后的报名回到数据库条件更新；仍有未落库的预约流条目时不清除
+
+        Args:
+            activity_id (int): 活动ID
+
+        Returns:
+            bool: 是否已清除（名额池未加载时也返回True）
+        """
+        return int(self.unload_pool_script(
+            keys=[self._seats_key(activity_id), self._users_key(activity_id), self._pending_key(activity_id)]
+        )) == 1
+
+    def unload_pool(self, *activity_ids: int):
+        """
+        直接清除活动的名额池，用于活动已删除的情况；未落库的预约仍由定时任务写入，未落库条目数随之归零
+
+        Args:
+            activity_ids (int): 活动ID
+        """
+        keys = [key for activity_id in activity_ids
+                for key in (self._seats_key(activity_id), self._users_key(activity_id))]
+        if keys:
+            redis_cache.delete(*keys)
+
+    def claim(self, activity_id: int, wx_user_id: int, phone_number: Optional[str]) -> int:
+        """
+        抢报名额
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_id (int): 微信用户ID
+            phone_number (Optional[str]): 手机号码
+
+        Returns:
+            int: ReservationBurstConstants.CLAIM_* 之一
+        """
+        return int(self.claim_script(
+            keys=[
+                self._seats_key(activity_id), self._users_key(activity_id), ReservationBurstConstants.STREAM_KEY,
+                self._pending_key(activity_id)
+            ],
+            args=[wx_user_id, activity_id, phone_number or "", datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
+        ))
+
+    def release(self, activity_id: int, wx_user_id: int, enqueue: bool = True) -> int:
+        """
+        归还名额，候补队列有人时名额转给排在最前的用户
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_id (int): 微信用户ID
+            enqueue (bool): 是否写入取消记录，由定时任务删除预约；预约已直接删除时传False
+
+        Returns:
+            int: 1成功，0用户未报名，-1名额池未加载
+        """
+        return int(self.release_script(
+            keys=[
+                self._seats_key(activity_id), self._users_key(activity_id), ReservationBurstConstants.STREAM_KEY,
+                f"{WaitlistConstants.WAITLIST_KEY}:{activity_id}", self._pending_key(activity_id)
+            ],
+            args=[wx_user_id, activity_id, "1" if enqueue else "0", datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
+        ))
+
+    def get_seats(self, activity_id: int) -> Optional[int]:
+        """
+        查询名额池的剩余名额
+
+        Args:
+            activity_id (int): 活动ID
+
+        Returns:
+            Optional[int]: 剩余名额，-1表示不限，名额池未加载时返回None
+        """
+        seats = redis_cache.get(self._seats_key(activity_id))
+        return int(seats) if seats is not None else None
+
+    def is_reserved(self, activity_id: int, wx_user_id: int) -> Optional[bool]:
+        """
+        查询用户是否已抢报，包含尚未落库的报名
+
+        Args:
+            activity_id (int): 活动ID
+            wx_user_id (int): 微信用户ID
+
+        Returns:
+            Optional[bool]: 是否已报名，名额池未加载时返回None
+        """
+        pipe = redis_cache.pipeline()
+        pipe.exists(self._seats_key(activity_id))
+        pipe.sismember(self._users_key(activity_id), wx_user_id)
+        loaded, reserved = pipe.execute()
+        return bool(reserved) if loaded else None
+
+    def consume(self, batch_size: int = ReservationBurstConstants.BATCH_SIZE) -> int:
+        """
+        批量消费预约流并落库，先接管闲置过久的处理中条目，再读取新条目，直到预约流读空
+
+        Args:
+            batch_size (int): 每批条目数
+
+        Returns:
+            int: 处理的条目数
+        """
+        self._ensure_group()
+        consumer = f"{socket.gethostname()}-{os.getpid()}"
+        total = 0
+        while True:
+            entries = self._claim_idle_entries(consumer, batch_size) \
+                or self._read_new_entries(consumer, batch_size)
+            if not entries:
+                return total
+            self._persist_entries(entries)
+            entry_ids = [entry_id for entry_id, _ in entries]
+            # 确认落库与扣减未落库条目数在同一个事务中完成
+            activity_counts = Counter(int(fields[b"activity_id"]) for _, fields in entries)
+            pipe = redis_cache.pipeline()
+            pipe.xack(ReservationBurstConstants.STREAM_KEY, ReservationBurstConstants.CONSUMER_GROUP, *entry_ids)
+            pipe.xdel(ReservationBurstConstants.STREAM_KEY, *entry_ids)
+            for activity_id, count in activity_counts.items():
+                pipe.decrby(self._pending_key(activity_id), count)
+            pipe.execute()
+            total += len(entries)
+            if len(entries) < batch_size:
+                return total
+
+    @Transactional(db.session)
+    def _persist_entries(self, entries: List[Tuple[bytes, Dict[bytes, bytes]]]):
+        """
+        将一批预约流条目写入活动预约表，同一用户在同一活动下只保留最后一次操作，
+        按实际插入与删除的记录数调整报名人数，候补转正的记录同时更新候补状态
+
+        Args:
+            entries (List[Tuple[bytes, Dict[bytes, bytes]]]): 预约流条目
+        """
+        latest, promoted = {}, defaultdict(list)
+        for _, fields in entries:
+            fields = {key.decode("utf-8"): value.decode("utf-8") for key, value in fields.items()}
+            key = (int(fields["activity_id"]), int(fields["wx_user_id"]))
+            latest.pop(key, None)
+            latest[key] = fields
+
+            if fields.get("waitlist") == "1":
+                promoted[key[0]].append(key[1])
+
+        adds, cancels = defaultdict(list), defaultdict(list)
+        for (activity_id, wx_user_id), fields in latest.items():
+            if fields["op"] == "add":
+                adds[activity_id].append({
+                    "activity_id": activity_id,
+                    "wx_user_id": wx_user_id,
+                    "phone_number": fields["phone_number"] or None,
+                    "registration_time": datetime.strptime(fields["registration_time"], "%Y-%m-%d %H:%M:%S"),
+                })
+            else:
+                cancels[activity_id].append(wx_user_id)
+
+        # 候补转正的预约使用排队时登记的手机号码，并记录转正
+        for activity_id, wx_user_ids in promoted.items():
+            phone_numbers = ActivityWaitlistMapper.select_waiting_phone_numbers(activity_id, wx_user_ids)
+            for row in adds.get(activity_id, []):
+                row["phone_number"] = row["phone_number"] or phone_numbers.get(row["wx_user_id"])
+            ActivityWaitlistMapper.update_waitlist_status(activity_id, wx_user_ids, WaitlistConstants.STATUS_PROMOTED)
+
+        # 活动服务依赖本服务同步名额池，这里延迟导入
+        from exb_museum.service.activity_service import ActivityService
+        activity_service = ActivityService()
+        for activity_id in adds.keys() | cancels.keys():
+            delta = ActivityReservationMapper.insert_ignore_activity_reservations(adds.get(activity_id, [])) \
+                - ActivityReservationMapper.delete_activity_reservation_by_users(activity_id, cancels.get(activity_id, []))
+            if delta:
+                activity_service.adjust_registration_count(activity_id, delta)
+
+    def _ensure_group(self):
+        """
+        创建预约流及消费组，已存在时忽略
+        """
+        if ReservationBurstService._group_ready:
+            return
+        try:
+            redis_cache.xgroup_create(
+                ReservationBurstConstants.STREAM_KEY, ReservationBurstConstants.CONSUMER_GROUP,
+                id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        ReservationBurstService._group_ready = True
+
+    def _claim_idle_entries(self, consumer: str, batch_size: int) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        """
+        接管闲置过久的处理中条目，包括本进程上次落库失败的条目
+        """
+        result = redis_cache.xautoclaim(
+            ReservationBurstConstants.STREAM_KEY, ReservationBurstConstants.CONSUMER_GROUP, consumer,
+            min_idle_time=ReservationBurstConstants.CLAIM_IDLE_MS, count=batch_size
+        )
+        return [(entry_id, fields) for entry_id, fields in result[1] if fields]
+
+    def _read_new_entries(self, consumer: str, batch_size: int) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        """
+        读取尚未分配给消费者的新条目
+        """
+        result = redis_cache.xreadgroup(
+            ReservationBurstConstants.CONSUMER_GROUP, consumer,
+            {ReservationBurstConstants.STREAM_KEY: ">"}, count=batch_size
+        )
+        return result[0][1] if result else []
+
+    @staticmethod
+    def _seats_key(activity_id: int) -> str:
+        return f"{ReservationBurstConstants.SEATS_KEY}:{activity_id}"
+
+    @staticmethod
+    def _users_key(activity_id: int) -> str:
+        return f"{ReservationBurstConstants.USERS_KEY}:{activity_id}"
+
+    @staticmethod
+    def _pending_key(activity_id: int) -> str:
+        return f"{ReservationBurstConstants.PENDING_KEY}:{activity_id}"
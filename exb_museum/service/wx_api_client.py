@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: wx_api_client.py
+
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ruoyi_admin.ext import redis_cache
+from ruoyi_common.utils.base import LogUtil
+
+from exb_museum.constant import WxApiConstants
+
+
+class WxApiException(Exception):
+    """微信接口调用异常，包括网络错误、熔断、并发超限以及微信返回的errcode"""
+
+    def __init__(self, message: str, errcode: Optional[int] = None):
+        super().__init__(message)
+        self.errcode = errcode
+
+
+class CircuitBreaker:
+    """
+    熔断器：连续失败达到阈值后打开，打开期间直接拒绝调用；
+    恢复时间过后放行一次试探调用，成功则关闭，失败则重新打开
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        判断是否放行本次调用
+
+        Returns:
+            bool: 放行返回True
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+                # 只放行一次试探调用，其余调用在试探结束前继续被拒绝
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        """记录一次成功调用"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        """记录一次失败调用"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class WxApiClient:
+    """
+    微信接口HTTP客户端，进程内共享：
+    连接池复用、连接与读取超时、有限重试、并发上限、熔断以及按接口统计的耗时指标
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        retry = Retry(
+            total=WxApiConstants.MAX_RETRIES,
+            connect=WxApiConstants.MAX_RETRIES,
+            read=0,
+            status=WxApiConstants.MAX_RETRIES,
+            status_forcelist=(502, 503, 504),
+            backoff_factor=WxApiConstants.RETRY_BACKOFF,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=WxApiConstants.POOL_SIZE,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
+        self.breaker = CircuitBreaker(
+            WxApiConstants.BREAKER_FAILURE_THRESHOLD,
+            WxApiConstants.BREAKER_RECOVERY_SECONDS,
+        )
+        self._semaphore = threading.BoundedSemaphore(WxApiConstants.MAX_CONCURRENCY)
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+
+    def get_json(self, api_name: str, path: str, params: Dict[str, Any] = None,
+                 timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        以GET方式调用微信接口并解析JSON
+
+        Args:
+            api_name: 接口名称，用于耗时统计与日志
+            path: 接口路径，如 /sns/jscode2session
+            params: 查询参数
+            timeout: 读取超时（秒），为None时使用默认值
+
+        Raises:
+            WxApiException: 熔断、并发超限、网络错误或微信返回errcode
+
+        Returns:
+            Dict[str, Any]: 微信接口返回的JSON
+        """
+        return self._call(api_name, "GET", path, params=params, timeout=timeout)
+
+    def post_json(self, api_name: str, path: str, params: Dict[str, Any] = None,
+                  body: Dict[str, Any] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        以POST方式调用微信接口并解析JSON
+
+        Args:
+            api_name: 接口名称，用于耗时统计与日志
+            path: 接口路径，如 /cgi-bin/message/subscribe/send
+            params: 查询参数，通常为access_token
+            body: 请求体
+            timeout: 读取超时（秒），为None时使用默认值
+
+        Raises:
+            WxApiException: 熔断、并发超限、网络错误或微信返回errcode
+
+        Returns:
+            Dict[str, Any]: 微信接口返回的JSON
+        """
+        return self._call(api_name, "POST", path, params=params, body=body, timeout=timeout)
+
+    def code_to_session(self, app_id: str, app_secret: str, code: str) -> Dict[str, Any]:
+        """
+        使用登录code换取openid、session_key等信息
+
+        Args:
+            app_id: 小程序AppID
+            app_secret: 小程序AppSecret
+            code: 微信登录凭证
+
+        Raises:
+            WxApiException: 调用失败
+
+        Returns:
+            Dict[str, Any]: 包含openid、session_key等信息的字典
+        """
+        return self.get_json("jscode2session", "/sns/jscode2session", params={
+            'appid': app_id,
+            'secret': app_secret,
+            'js_code': code,
+            'grant_type': 'authorization_code'
+        })
+
+    def get_access_token(self, app_id: str, app_secret: str) -> str:
+        """
+        获取接口调用凭证access_token，缓存在Redis中直到凭证过期；
+        过期前 ACCESS_TOKEN_EXPIRE_MARGIN 秒起由抢到锁的进程刷新，其他进程继续使用未过期的旧凭证，不等待刷新
+
+        Args:
+            app_id: 小程序AppID
+            app_secret: 小程序AppSecret
+
+        Raises:
+            WxApiException: 调用失败，或没有可用凭证且其他进程正在刷新
+
+        Returns:
+            str: access_token
+        """
+        cache_key = f"{WxApiConstants.ACCESS_TOKEN_KEY}:{app_id}"
+        cached = redis_cache.get(cache_key)
+        stale_token = None
+        if cached is not None:
+            cached = json.loads(cached)
+            if time.time() < cached['refresh_at']:
+                return cached['access_token']
+            stale_token = cached['access_token']
+
+        # 多进程同时刷新会使先拿到的凭证提前失效，只让抢到锁的进程刷新
+        lock_key = f"{cache_key}:lock"
+        if not redis_cache.set(lock_key, 1, nx=True, ex=WxApiConstants.READ_TIMEOUT * 2):
+            if stale_token is not None:
+                return stale_token
+            raise WxApiException("access_token正在刷新，请稍后重试")
+
+        try:
+            result = self.post_json("stable_token", "/cgi-bin/stable_token", body={
+                'grant_type': 'client_credential',
+                'appid': app_id,
+                'secret': app_secret,
+            })
+            access_token = result['access_token']
+            expires_in = int(result.get('expires_in', 7200))
+            refresh_at = time.time() + max(expires_in - WxApiConstants.ACCESS_TOKEN_EXPIRE_MARGIN, 60)
+            redis_cache.set(
+                cache_key,
+                json.dumps({'access_token': access_token, 'refresh_at': refresh_at}),
+                ex=expires_in,
+            )
+            return access_token
+        finally:
+            redis_cache.delete(lock_key)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        获取按接口统计的调用指标
+
+        Returns:
+            Dict[str, Dict[str, float]]: {接口名称: {count, errors, total_ms, max_ms, avg_ms}}，另含熔断器状态
+        """
+        with self._metrics_lock:
+            metrics = {name: dict(item) for name, item in self._metrics.items()}
+        for item in metrics.values():
+            item['avg_ms'] = round(item['total_ms'] / item['count'], 2) if item['count'] else 0
+        metrics['breaker'] = {'state': self.breaker.state}
+        return metrics
+
+    def _call(self, api_name: str, method: str, path: str, params: Dict[str, Any] = None,
+              body: Dict[str, Any] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        调用微信接口，统一处理熔断、并发上限、超时与耗时统计
+
+        Raises:
+            WxApiException: 调用失败
+
+        Returns:
+            Dict[str, Any]: 微信接口返回的JSON
+        """
+        if not self._semaphore.acquire(timeout=WxApiConstants.ACQUIRE_TIMEOUT):
+            raise WxApiException(f"微信接口并发调用超限: {api_name}")
+        if not self.breaker.allow():
+            self._semaphore.release()
+            raise WxApiException(f"微信接口熔断中: {api_name}")
+
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.request(
+                method,
+                f"{WxApiConstants.BASE_URL}{path}",
+                params=params,
+                json=body,
+                timeout=(WxApiConstants.CONNECT_TIMEOUT, timeout or WxApiConstants.READ_TIMEOUT),
+            )
+            response.raise_for_status()
+            result = response.json()
+            failed = False
+        except (requests.RequestException, ValueError) as e:
+            raise WxApiException(f"请求微信接口失败: {api_name}, {e}") from e
+        finally:
+            self._semaphore.release()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._record(api_name, elapsed_ms, failed)
+            # 熔断只统计网络与服务端错误，微信返回的业务errcode不计入
+            if failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+        if result.get('errcode'):
+            raise WxApiException(f"微信接口返回错误: {api_name}, {result}", result.get('errcode'))
+        return result
+
+    def _record(self, api_name: str, elapsed_ms: float, failed: bool):
+        """记录一次调用的耗时与结果"""
+        with self._metrics_lock:
+            item = self._metrics.setdefault(api_name, {'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            item['count'] += 1
+            item['errors'] += 1 if failed else 0
+            item['total_ms'] += elapsed_ms
+            item['max_ms'] = max(item['max_ms'], elapsed_ms)
+        if elapsed_ms >= WxApiConstants.SLOW_CALL_MS:
+            LogUtil.logger.warning(f"微信接口调用缓慢: {api_name}, 耗时{elapsed_ms:.0f}ms")
+
+
+# 进程内共享的微信接口客户端
+wx_api_client = WxApiClient()
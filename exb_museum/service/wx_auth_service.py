@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 # @Author  : LeeOn123
 
-import requests
-# import json
+import json
+import secrets
+import hmac
+from hashlib import sha1, sha256
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from exb_museum.domain.entity.wx_user import WxUser
@@ -11,17 +13,21 @@ import jwt
 import logging
 # from ruoyi_admin.config.wx_config import WxConfig
 from ruoyi_common.sqlalchemy.transaction import Transactional
-from ruoyi_admin.ext import db
+from ruoyi_admin.ext import db, redis_cache
+from ruoyi_common.utils.base import TtlLruCache
 
+from exb_museum.constant import MuseumCacheConstants, WxTokenConstants, WxSignConstants
 from exb_museum.service.museum_service import MuseumService
+from exb_museum.service.wx_api_client import wx_api_client, WxApiException
 from exb_museum.mapper.wx_user_mapper import WxUserMapper
 
 logger = logging.getLogger(__name__)
 
-# 微信API基础URL
-WX_API_BASE_URL = 'https://api.weixin.qq.com'
-# 登录code换session的API
-WX_LOGIN_URL = f'{WX_API_BASE_URL}/sns/jscode2session'
+# 进程内的微信用户认证状态缓存，键为wx_user_id，值为(status, del_flag, token_version)，用户不存在时为空元组
+_wx_user_state_cache = TtlLruCache(
+    maxsize=MuseumCacheConstants.WX_USER_LOCAL_CACHE_SIZE,
+    ttl=MuseumCacheConstants.WX_USER_LOCAL_CACHE_TTL
+)
 
 class WxAuthService:
     """
@@ -44,46 +50,127 @@ class WxAuthService:
         Returns:
             包含openid、session_key等信息的字典，失败则返回None
         """
-        url = WX_LOGIN_URL
-        params = {
-            'appid': app_id,
-            'secret': app_secret,
-            'js_code': code,
-            'grant_type': 'authorization_code'
-        }
-        
         try:
-            response = requests.get(url, params=params)
-            result = response.json()
-            
-            if 'errcode' in result:
-                logger.error(f"获取session失败: {result}")
-                return None
-                
-            return result
-        except Exception as e:
-            logger.error(f"请求微信API失败: {str(e)}")
+            return wx_api_client.code_to_session(app_id, app_secret, code)
+        except WxApiException as e:
+            logger.error(f"获取session失败: {str(e)}")
             return None
     
-    def generate_access_token(self, open_id: str, app_id: str) -> str:
+    def generate_access_token(self, wx_user: WxUser) -> str:
         """
-        生成JWT访问令牌
+        生成JWT访问令牌，令牌中携带wx_user_id与令牌版本号，认证时无需再查询用户表
         
         Args:
-            user_id: 用户ID
+            wx_user: 微信用户对象
             
         Returns:
             JWT令牌字符串
         """
         payload = {
-            'open_id': open_id, 'app_id': app_id,
-            'exp': datetime.now(timezone.utc) + timedelta(seconds=self.token_config.expire_seconds()),
+            'open_id': wx_user.open_id, 'app_id': wx_user.app_id,
+            'wx_user_id': wx_user.id, 'ver': wx_user.token_version or 0,
+            'exp': datetime.now(timezone.utc) + timedelta(seconds=WxTokenConstants.ACCESS_TOKEN_EXPIRE),
             'iat': datetime.now(timezone.utc)
         }
         
         token = jwt.encode(payload, self.token_config.secret, algorithm='HS256')
         return token
     
+    def generate_refresh_token(self, wx_user: WxUser, family_id: str = None, expire_at: int = None) -> str:
+        """
+        生成刷新令牌并写入Redis，Redis中只保存令牌的sha256；
+        同一次登录轮换出的刷新令牌属于同一令牌族，共用登录时确定的绝对过期时间
+
+        Args:
+            wx_user: 微信用户对象
+            family_id: 令牌族ID，登录时为None，生成新的令牌族
+            expire_at: 令牌族过期时间戳（秒），登录时为None
+
+        Returns:
+            刷新令牌字符串，令牌族已过期时返回None
+        """
+        now = int(datetime.now(timezone.utc).timestamp())
+        family_id = family_id or secrets.token_hex(16)
+        expire_at = expire_at or now + WxTokenConstants.REFRESH_TOKEN_EXPIRE
+        ttl = expire_at - now
+        if ttl <= 0:
+            return None
+
+        refresh_token = secrets.token_urlsafe(32)
+        token_hash = self._refresh_token_hash(refresh_token)
+        record = {
+            'wx_user_id': wx_user.id, 'app_id': wx_user.app_id, 'open_id': wx_user.open_id,
+            'ver': wx_user.token_version or 0, 'family': family_id, 'exp': expire_at
+        }
+        pipe = redis_cache.pipeline()
+        pipe.set(f"{WxTokenConstants.REFRESH_TOKEN_KEY}:{token_hash}", json.dumps(record), ex=ttl)
+        pipe.set(f"{WxTokenConstants.REFRESH_FAMILY_KEY}:{family_id}", token_hash, ex=ttl)
+        pipe.execute()
+        return refresh_token
+
+    def refresh_access_token(self, refresh_token: str) -> Optional[Dict[str, Any]]:
+        """
+        用刷新令牌换取新的访问令牌与刷新令牌，旧刷新令牌随即失效；
+        已轮换过的刷新令牌再次出现视为泄露，整个令牌族随之吊销
+
+        Args:
+            refresh_token: 刷新令牌
+
+        Returns:
+            {access_token, refresh_token, expires_in}，刷新令牌无效、被重放或用户已吊销时返回None
+        """
+        token_hash = self._refresh_token_hash(refresh_token)
+        cached = redis_cache.getdel(f"{WxTokenConstants.REFRESH_TOKEN_KEY}:{token_hash}")
+        if cached is None:
+            family_id = redis_cache.get(f"{WxTokenConstants.REFRESH_USED_KEY}:{token_hash}")
+            if family_id is not None:
+                logger.warning(f"刷新令牌被重放，吊销令牌族: {family_id.decode('utf-8')}")
+                self._revoke_refresh_family(family_id.decode('utf-8'))
+            return None
+
+        record = json.loads(cached)
+        now = int(datetime.now(timezone.utc).timestamp())
+        redis_cache.set(
+            f"{WxTokenConstants.REFRESH_USED_KEY}:{token_hash}",
+            record['family'],
+            ex=max(record['exp'] - now, 1)
+        )
+
+        # 用户被禁用、删除或令牌版本号递增后，刷新令牌一并失效
+        payload = {'wx_user_id': record['wx_user_id'], 'ver': record['ver']}
+        if not self.check_wx_user_state(payload):
+            self._revoke_refresh_family(record['family'])
+            return None
+
+        wx_user = WxUser(
+            id=record['wx_user_id'], app_id=record['app_id'],
+            open_id=record['open_id'], token_version=record['ver']
+        )
+        new_refresh_token = self.generate_refresh_token(wx_user, record['family'], record['exp'])
+        if not new_refresh_token:
+            return None
+        return {
+            'access_token': self.generate_access_token(wx_user),
+            'refresh_token': new_refresh_token,
+            'expires_in': WxTokenConstants.ACCESS_TOKEN_EXPIRE
+        }
+
+    def _revoke_refresh_family(self, family_id: str):
+        """
+        吊销令牌族当前的刷新令牌
+
+        Args:
+            family_id: 令牌族ID
+        """
+        token_hash = redis_cache.getdel(f"{WxTokenConstants.REFRESH_FAMILY_KEY}:{family_id}")
+        if token_hash is not None:
+            redis_cache.delete(f"{WxTokenConstants.REFRESH_TOKEN_KEY}:{token_hash.decode('utf-8')}")
+
+    @staticmethod
+    def _refresh_token_hash(refresh_token: str) -> str:
+        """刷新令牌的sha256，Redis中不保存令牌明文"""
+        return sha256(refresh_token.encode('utf-8')).hexdigest()
+
     def verify_access_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
         验证访问令牌
@@ -104,23 +191,129 @@ class WxAuthService:
             logger.warning("无效令牌")
             return None
     
+    def check_wx_user_state(self, payload: Dict[str, Any]) -> bool:
+        """
+        校验令牌对应的微信用户未被禁用或删除，且令牌版本号未被吊销
+
+        Args:
+            payload: 解码后的令牌payload
+
+        Returns:
+            校验通过返回True，否则返回False
+        """
+        wx_user_id = payload.get('wx_user_id')
+        if wx_user_id is None:
+            return False
+        state = self.get_wx_user_state(wx_user_id)
+        if not state:
+            return False
+        status, del_flag, token_version = state
+        return status == 0 and del_flag == 0 and payload.get('ver') == token_version
+
+    def get_wx_user_state(self, wx_user_id: int) -> tuple:
+        """
+        获取微信用户的认证状态，依次查询进程内缓存、Redis与数据库
+
+        Args:
+            wx_user_id: 微信用户ID
+
+        Returns:
+            (status, del_flag, token_version)，用户不存在时为空元组
+        """
+        state = _wx_user_state_cache.get(wx_user_id)
+        if state is not None:
+            return state
+
+        cached = redis_cache.get(self._wx_user_state_key(wx_user_id))
+        if cached is not None:
+            state = tuple(json.loads(cached))
+        else:
+            state = self._write_wx_user_state(wx_user_id)
+        _wx_user_state_cache.set(wx_user_id, state)
+        return state
+
+    def refresh_wx_user_state(self, wx_user_id: int):
+        """
+        微信用户状态或令牌版本号变更后，以数据库为准重写Redis并清除本进程缓存；
+        其他进程的进程内缓存在 WX_USER_LOCAL_CACHE_TTL 秒内过期
+
+        Args:
+            wx_user_id: 微信用户ID
+        """
+        _wx_user_state_cache.delete(wx_user_id)
+        self._write_wx_user_state(wx_user_id)
+
+    def revoke_wx_user_tokens(self, wx_user_id: int) -> bool:
+        """
+        吊销微信用户已签发的全部访问令牌与刷新令牌，用户需重新登录
+
+        Args:
+            wx_user_id: 微信用户ID
+
+        Returns:
+            用户存在返回True，否则返回False
+        """
+        if not self._increase_token_version(wx_user_id):
+            return False
+        self.refresh_wx_user_state(wx_user_id)
+        return True
+
+    def _write_wx_user_state(self, wx_user_id: int) -> tuple:
+        """
+        从数据库加载微信用户的认证状态并写入Redis
+
+        Args:
+            wx_user_id: 微信用户ID
+
+        Returns:
+            (status, del_flag, token_version)，用户不存在时为空元组
+        """
+        row = self._select_wx_user_state(wx_user_id)
+        state = tuple(row) if row else ()
+        redis_cache.set(
+            self._wx_user_state_key(wx_user_id),
+            json.dumps(state),
+            ex=MuseumCacheConstants.WX_USER_STATE_EXPIRE
+        )
+        return state
+
+    @Transactional(db.session)
+    def _select_wx_user_state(self, wx_user_id: int):
+        """查询微信用户的认证状态"""
+        return WxUserMapper.select_wx_user_state(wx_user_id)
+
+    @Transactional(db.session)
+    def _increase_token_version(self, wx_user_id: int) -> int:
+        """递增微信用户的令牌版本号"""
+        return WxUserMapper.increase_token_version(wx_user_id)
+
+    @staticmethod
+    def _wx_user_state_key(wx_user_id: int) -> str:
+        """微信用户认证状态的Redis Key"""
+        return f"{MuseumCacheConstants.WX_USER_STATE_KEY}:{wx_user_id}"
+    
     def verify_request(self, method: str, path: str, body: str, timestamp: int, nonce: str, sign: str, token: str):
-        # ts = int(req.headers['X-Timestamp'])
-        # nonce = req.headers['X-Nonce']
-        # sign = req.headers['X-Sign']
+        """
+        校验请求签名并防止重放：时间戳须在窗口内，签名须匹配，同一令牌下的nonce只能使用一次
+
+        Args:
+            method: 请求方法
+            path: 请求路径，含查询串
+            body: 请求体
+            timestamp: 客户端时间戳（秒）
+            nonce: 随机串
+            sign: 客户端签名
+            token: 访问令牌
 
-        # 1. 时间窗口（5 分钟）
+        Returns:
+            校验通过返回True，否则返回False
+        """
+        # 1. 时间窗口
         now = int(datetime.now(timezone.utc).timestamp())
-        if abs(now - timestamp) > 300:
+        if abs(now - timestamp) > WxSignConstants.TIMESTAMP_WINDOW or not nonce:
             return False
-            # raise Exception("timestamp expired")
-
-        # 2. nonce 是否已使用
-        # if redis.exists(f"nonce:{payload['openid']}:{nonce}"):
-        #     raise Exception("replay attack")
 
-        # 3. 计算签名
-        # body = req.get_data(as_text=True) or ''
+        # 2. 计算签名，先校验签名，伪造的请求不会写入nonce
         sign_str = "\n".join([
             method,
             path,
@@ -129,19 +322,33 @@ class WxAuthService:
             nonce,
             token
         ])
-        from hashlib import sha256
         expected = sha256(sign_str.encode('utf-8')).hexdigest()
-
-        if sign != expected:
+        if not hmac.compare_digest(sign, expected):
             return False
-            # raise Exception("invalid signature")
-        # 4. 记录 nonce（TTL = 时间窗口）
-        # redis.setex(
-        #     f"nonce:{payload['openid']}:{nonce}",
-        #     300,
-        #     1
-        # )
 
+        # 3. nonce 是否已使用
+        return self._claim_nonce(token, nonce, timestamp, now)
+
+    def _claim_nonce(self, token: str, nonce: str, timestamp: int, now: int) -> bool:
+        """
+        占用nonce，以一次 SET NX EX 原子地检查并记录；
+        nonce保留到时间戳超出窗口为止，之后的重放会被时间窗口拦截
+
+        Args:
+            token: 访问令牌
+            nonce: 随机串
+            timestamp: 客户端时间戳（秒）
+            now: 当前时间戳（秒）
+
+        Returns:
+            nonce首次使用返回True，重放返回False
+        """
+        nonce_id = sha1(f"{token}:{nonce}".encode('utf-8')).hexdigest()
+        ttl = max(timestamp + WxSignConstants.TIMESTAMP_WINDOW - now, 1)
+        claimed = redis_cache.set(f"{WxSignConstants.NONCE_KEY}:{nonce_id}", 1, nx=True, ex=ttl)
+        if not claimed:
+            logger.warning(f"请求nonce重复: {nonce}")
+            return False
         return True
     
     @Transactional(db.session)
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+# @Module: exb_museum/task
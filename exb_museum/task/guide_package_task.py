@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: guide_package_task.py
+
+from exb_museum import reg
+from exb_museum.service.guide_package_service import GuidePackageService
+
+
+def build_exhibition_guide_packages(exhibition_id: int = None):
+    """
+    定时任务：构建展览离线导览包，未指定展览时构建全部正常状态的展览，
+    内容未变化的展览直接跳过
+
+    Args:
+        exhibition_id (int, optional): 展览ID
+    """
+    with reg.app.app_context():
+        service = GuidePackageService()
+        if exhibition_id:
+            service.build_exhibition_package(int(exhibition_id))
+        else:
+            service.build_all_exhibition_packages()
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+# @Author  : leeon
+# @FileName: reservation_burst_task.py
+
+from exb_museum import reg
+from exb_museum.service.reservation_burst_service import ReservationBurstService
+
+
+def persist_burst_reservations():
+    """
+    定时任务：将抢报模式的预约流批量写入活动预约表，并同步活动报名人数
+    """
+    with reg.app.app_context():
+        ReservationBurstService().consume()
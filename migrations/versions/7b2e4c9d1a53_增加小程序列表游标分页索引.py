@@ -0,0 +1,32 @@
+"""增加小程序列表游标分页索引
+
+Revision ID: 7b2e4c9d1a53
+Revises: 5e3dafeeb4dd
+Create Date: 2026-02-10 10:15:32.418265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4c9d1a53'
+down_revision: Union[str, Sequence[str], None] = '5e3dafeeb4dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_museum_status_collection', 'exb_collection', ['museum_id', 'status', 'collection_id'], unique=False)
+    op.create_index('idx_museum_status_start_time', 'exb_exhibition', ['museum_id', 'status', 'start_time', 'exhibition_id'], unique=False)
+    op.create_index('idx_museum_status_start_time', 'exb_activity', ['museum_id', 'status', 'activity_start_time', 'activity_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_museum_status_start_time', table_name='exb_activity')
+    op.drop_index('idx_museum_status_start_time', table_name='exb_exhibition')
+    op.drop_index('idx_museum_status_collection', table_name='exb_collection')
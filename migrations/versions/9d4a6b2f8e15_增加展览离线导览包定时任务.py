@@ -0,0 +1,54 @@
+"""增加展览离线导览包定时任务
+
+Revision ID: 9d4a6b2f8e15
+Revises: c3f81a5e6d27
+Create Date: 2026-02-12 15:06:48.731520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.mysql import insert
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4a6b2f8e15'
+down_revision: Union[str, Sequence[str], None] = 'c3f81a5e6d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    from ruoyi_apscheduler.domain.po import SysJobPo
+    job_table = SysJobPo.__table__
+
+    # 每天凌晨3点构建离线导览包，默认暂停，配置好MinIO后在定时任务页面启用
+    insert_stmt = insert(job_table).values(
+        job_id=100,
+        job_name='展览离线导览包',
+        job_group='DEFAULT',
+        invoke_target='exb_museum.task.guide_package_task.build_exhibition_guide_packages()',
+        cron_expression='0 0 3 * * ?',
+        misfire_policy='3',
+        concurrent='1',
+        status='1',
+        create_by='admin',
+        create_time=sa.func.sysdate(),
+        update_by='',
+        update_time=None,
+        remark='内容未变化的展览不会重复构建'
+    )
+    op.execute(insert_stmt.on_duplicate_key_update(
+        invoke_target=insert_stmt.inserted.invoke_target,
+        cron_expression=insert_stmt.inserted.cron_expression,
+        remark=insert_stmt.inserted.remark
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    from ruoyi_apscheduler.domain.po import SysJobPo
+    job_table = SysJobPo.__table__
+    op.execute(job_table.delete().where(job_table.c.job_id == 100))
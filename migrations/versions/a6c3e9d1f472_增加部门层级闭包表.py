@@ -0,0 +1,51 @@
+"""增加部门层级闭包表
+
+Revision ID: a6c3e9d1f472
+Revises: f2b8d4c6a719
+Create Date: 2026-02-15 10:12:45.218736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c3e9d1f472'
+down_revision: Union[str, Sequence[str], None] = 'f2b8d4c6a719'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    closure_table = op.create_table('sys_dept_closure',
+    sa.Column('ancestor_id', mysql.BIGINT(display_width=20), nullable=False, comment='祖先部门id'),
+    sa.Column('descendant_id', mysql.BIGINT(display_width=20), nullable=False, comment='后代部门id'),
+    sa.Column('depth', mysql.INTEGER(display_width=4), server_default=sa.text("'0'"), nullable=False, comment='层级距离（0为自身）'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    comment='部门层级闭包表'
+    )
+    op.create_index('idx_sys_dept_closure_d', 'sys_dept_closure', ['descendant_id', 'depth'], unique=False)
+
+    # 按 parent_id 回填现有部门的闭包关系，包含已删除部门，与 sys_dept 保持一一对应
+    rows = op.get_bind().execute(sa.text("SELECT dept_id, parent_id FROM sys_dept")).all()
+    parents = {dept_id: parent_id for dept_id, parent_id in rows}
+    closures = []
+    for dept_id in parents:
+        depth, node, seen = 0, dept_id, set()
+        while node in parents and node not in seen:
+            seen.add(node)
+            closures.append({'ancestor_id': node, 'descendant_id': dept_id, 'depth': depth})
+            node = parents[node]
+            depth += 1
+    if closures:
+        op.bulk_insert(closure_table, closures)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_sys_dept_closure_d', table_name='sys_dept_closure')
+    op.drop_table('sys_dept_closure')
@@ -0,0 +1,32 @@
+"""校正活动报名人数
+
+Revision ID: b1e7f4a9c3d2
+Revises: a6c3e9d1f472
+Create Date: 2026-02-16 09:41:27.503184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1e7f4a9c3d2'
+down_revision: Union[str, Sequence[str], None] = 'a6c3e9d1f472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 报名人数改为随预约增减，按现有预约记录校正一次作为起点
+    op.execute(sa.text(
+        "UPDATE exb_activity a SET a.registration_count = ("
+        "SELECT COUNT(*) FROM exb_activity_reservation r WHERE r.activity_id = a.activity_id)"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
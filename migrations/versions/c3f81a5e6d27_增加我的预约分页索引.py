@@ -0,0 +1,28 @@
+"""增加我的预约分页索引
+
+Revision ID: c3f81a5e6d27
+Revises: 7b2e4c9d1a53
+Create Date: 2026-02-11 09:42:07.305914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f81a5e6d27'
+down_revision: Union[str, Sequence[str], None] = '7b2e4c9d1a53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_wxuserid_registration_time', 'exb_activity_reservation', ['wx_user_id', 'registration_time', 'reservation_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_wxuserid_registration_time', table_name='exb_activity_reservation')
@@ -0,0 +1,59 @@
+"""增加活动抢报模式
+
+Revision ID: c8a2d5e7f913
+Revises: b1e7f4a9c3d2
+Create Date: 2026-02-17 14:22:05.917342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects.mysql import insert
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8a2d5e7f913'
+down_revision: Union[str, Sequence[str], None] = 'b1e7f4a9c3d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('exb_activity', sa.Column('burst_mode', mysql.TINYINT(), server_default=sa.text("'0'"), nullable=False, comment='抢报模式（0关闭 1开启）'))
+
+    from ruoyi_apscheduler.domain.po import SysJobPo
+    job_table = SysJobPo.__table__
+
+    # 每5秒将抢报模式的预约流落库，预约流为空时立即返回
+    insert_stmt = insert(job_table).values(
+        job_id=101,
+        job_name='活动抢报预约落库',
+        job_group='DEFAULT',
+        invoke_target='exb_museum.task.reservation_burst_task.persist_burst_reservations()',
+        cron_expression='0/5 * * * * ?',
+        misfire_policy='3',
+        concurrent='1',
+        status='0',
+        create_by='admin',
+        create_time=sa.func.sysdate(),
+        update_by='',
+        update_time=None,
+        remark='开启抢报模式的活动，报名记录由该任务写入活动预约表'
+    )
+    op.execute(insert_stmt.on_duplicate_key_update(
+        invoke_target=insert_stmt.inserted.invoke_target,
+        cron_expression=insert_stmt.inserted.cron_expression,
+        remark=insert_stmt.inserted.remark
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    from ruoyi_apscheduler.domain.po import SysJobPo
+    job_table = SysJobPo.__table__
+    op.execute(job_table.delete().where(job_table.c.job_id == 101))
+
+    op.drop_column('exb_activity', 'burst_mode')
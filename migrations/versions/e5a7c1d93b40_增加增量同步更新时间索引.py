@@ -0,0 +1,38 @@
+"""增加增量同步更新时间索引
+
+Revision ID: e5a7c1d93b40
+Revises: 9d4a6b2f8e15
+Create Date: 2026-02-13 10:21:55.184302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c1d93b40'
+down_revision: Union[str, Sequence[str], None] = '9d4a6b2f8e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_update_time', 'exb_museum', ['update_time'], unique=False)
+    op.create_index('idx_museum_update_time', 'exb_exhibition', ['museum_id', 'update_time'], unique=False)
+    op.create_index('idx_exhibition_update_time', 'exb_exhibition_unit', ['exhibition_id', 'update_time'], unique=False)
+    op.create_index('idx_museum_update_time', 'exb_collection', ['museum_id', 'update_time'], unique=False)
+    op.create_index('idx_museum_update_time', 'exb_activity', ['museum_id', 'update_time'], unique=False)
+    op.create_index('idx_update_time', 'exb_museum_media', ['update_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_update_time', table_name='exb_museum_media')
+    op.drop_index('idx_museum_update_time', table_name='exb_activity')
+    op.drop_index('idx_museum_update_time', table_name='exb_collection')
+    op.drop_index('idx_exhibition_update_time', table_name='exb_exhibition_unit')
+    op.drop_index('idx_museum_update_time', table_name='exb_exhibition')
+    op.drop_index('idx_update_time', table_name='exb_museum')
@@ -0,0 +1,42 @@
+"""展览单元排序值留出间隔
+
+Revision ID: e9c4a7b2d815
+Revises: d4f6b8a1c257
+Create Date: 2026-02-27 15:12:08.416293
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9c4a7b2d815'
+down_revision: Union[str, Sequence[str], None] = 'd4f6b8a1c257'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 与 ExhibitionUnitConstants.SORT_GAP 保持一致
+SORT_GAP = 1024
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 现有排序值按间隔放大，相对顺序不变，移动单元时即可只改写一行
+    op.execute(sa.text(
+        f"UPDATE exb_exhibition_unit SET sort_order = sort_order * {SORT_GAP} WHERE sort_order IS NOT NULL"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 按章节内的顺序恢复为连续序号
+    op.execute(sa.text(
+        "UPDATE exb_exhibition_unit u JOIN ("
+        "SELECT unit_id, ROW_NUMBER() OVER ("
+        "PARTITION BY exhibition_id, section ORDER BY sort_order, unit_id) AS rn "
+        "FROM exb_exhibition_unit WHERE sort_order IS NOT NULL) t ON u.unit_id = t.unit_id "
+        "SET u.sort_order = t.rn"
+    ))
@@ -0,0 +1,28 @@
+"""增加微信用户令牌版本号
+
+Revision ID: f2b8d4c6a719
+Revises: e5a7c1d93b40
+Create Date: 2026-02-14 09:37:12.406518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4c6a719'
+down_revision: Union[str, Sequence[str], None] = 'e5a7c1d93b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('exb_wx_user', sa.Column('token_version', sa.Integer(), server_default=sa.text("'0'"), nullable=False, comment='令牌版本号，递增后已签发的令牌全部失效'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('exb_wx_user', 'token_version')
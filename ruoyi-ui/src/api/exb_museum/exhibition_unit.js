@@ -59,4 +59,13 @@ export function moveDownExhibitionUnit(id) {
     url: '/exb_museum/unit/move_down/' + id,
     method: 'post'
   })
+}
+
+// 按给定顺序重排章节内的展览单元
+export function reorderExhibitionUnit(data) {
+  return request({
+    url: '/exb_museum/unit/reorder',
+    method: 'put',
+    data: data
+  })
 }
\ No newline at end of file
@@ -8,7 +8,6 @@ from ruoyi_common.descriptor.serializer import JsonSerializer
 from ruoyi_common.descriptor.validator import BodyValidator
 from ruoyi_common.utils import security_util as SecurityUtil
 from ruoyi_common.constant import Constants
-from ruoyi_system.service import SysMenuService
 from ruoyi_framework.service import LoginService,SysPermissionService
 from ... import reg
 
@@ -48,10 +47,9 @@ def index_get_routers():
     '''
         获取路由信息接口
     '''
-    user_id = SecurityUtil.get_user_id()
-    menus = SysMenuService.select_menu_tree_by_user_id(user_id)
+    user:SysUser = SecurityUtil.get_login_user().user
     ajax_response = AjaxResponse.from_success(
-        data=SysMenuService.build_menus(menus)
+        data=SysPermissionService.get_routers(user)
     )
     return ajax_response
 
@@ -27,5 +27,5 @@ class ScheduleConstant:
     
     FORBIDDEN_CONCURRENT = "1"
     
-    JOB_WHITELIST_STR = { "ruoyi_apscheduler" }
+    JOB_WHITELIST_STR = { "ruoyi_apscheduler", "exb_museum.task" }
     
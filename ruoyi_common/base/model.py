@@ -544,8 +544,6 @@ class PageModel(VoModel):
     
     total: Annotated[int, Field(default=None)]
     
-    stmt: Annotated[Any, Field(default=None)]
-    
         
 class OrderModel(VoModel):
     
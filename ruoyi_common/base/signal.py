@@ -12,4 +12,4 @@ module_initailize = descriptor_singals.signal('module_initailize')
 
 app_completed = descriptor_singals.signal('app_completed')
 
-
+permission_changed = descriptor_singals.signal('permission_changed')
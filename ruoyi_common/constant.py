@@ -78,8 +78,18 @@ class Constants:
     
     LOGIN_TOKEN_KEY = "login_tokens:"
     
+    LOGIN_TOKEN_VERSION_KEY = "login_token_version:"
+    
+    ROLE_PERMS_KEY = "sys_role_perms"
+    
+    ROLE_ROUTERS_KEY = "sys_role_routers"
+    
+    ROLE_CACHE_EXPIRE = 86400
+    
     REPEAT_SUBMIT_KEY = "repeat_submit:"
     
+    PAGE_COUNT_KEY = "page_count:"
+    
     RATE_LIMIT_KEY = "rate_limit:"
     
     CAPTCHA_EXPIRATION = 2
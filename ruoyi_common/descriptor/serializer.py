@@ -2,8 +2,9 @@
 # @Author  : YY
 
 import functools
+import gzip
 from typing import Any, Callable
-from flask import Response, make_response
+from flask import Response, make_response, request
 from werkzeug.exceptions import HTTPException, InternalServerError
 
 from ruoyi_common.base.model import BaseEntity,VoSerializerContext
@@ -11,9 +12,18 @@ from ruoyi_common.base.signal import log_signal
 from ruoyi_common.exception import ServiceException
 from ruoyi_common.utils.base import DescriptUtil
 
+try:
+    import brotli
+except ImportError:
+    # brotli为可选依赖，未安装时只协商gzip
+    brotli = None
+
 
 class BaseSerializer:
-    
+
+    # 响应体压缩阈值（字节），为None时不压缩
+    compress_min_size: int|None = None
+
     def __call__(self, func) -> Callable:
         
         @functools.wraps(func)
@@ -26,7 +36,7 @@ class BaseSerializer:
             except Exception as e:
                 raise e
             else:
-                response = self.serialize(func, res)
+                response = self.compress(self.serialize(func, res))
                 self.send_success(func, res)
             return response
         return wrapper
@@ -70,6 +80,52 @@ class BaseSerializer:
             response = make_response(res, 200)
         return response
 
+    def compress(self, response:Response) -> Response:
+        """
+        按请求头Accept-Encoding协商压缩响应体，优先brotli，其次gzip；
+        仅压缩不小于阈值的非流式200文本/JSON响应，已编码的响应保持不变
+        
+        Args:
+            response: 序列化后的Response对象
+        
+        Returns:
+            Response: 压缩后的Response对象
+        """
+        if self.compress_min_size is None \
+                or response.status_code != 200 \
+                or response.direct_passthrough \
+                or response.is_streamed \
+                or not (response.is_json or response.mimetype.startswith('text/')) \
+                or 'Content-Encoding' in response.headers:
+            return response
+        data = response.get_data()
+        if len(data) < self.compress_min_size:
+            return response
+
+        # 响应内容随Accept-Encoding变化，缓存需区分
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding()
+        if encoding == 'br':
+            data = brotli.compress(data, quality=5)
+        elif encoding == 'gzip':
+            data = gzip.compress(data, compresslevel=6)
+        else:
+            return response
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def negotiate_encoding() -> str|None:
+    """
+    根据请求头Accept-Encoding协商响应体压缩算法
+    
+    Returns:
+        str|None: br、gzip，客户端不支持压缩时为None
+    """
+    encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(encodings)
+
     
 class JsonSerializer(BaseSerializer):
     
@@ -82,9 +138,11 @@ class JsonSerializer(BaseSerializer):
         success_code: int=200, 
         mimetype: str='application/json', 
         headers: dict={},
+        compress_min_size: int|None=1024,
         ):
 
         self.mimetype = mimetype
+        self.compress_min_size = compress_min_size
         self.headers = headers
         self.success_code = success_code
         self.context = VoSerializerContext(
@@ -6,8 +6,8 @@ from datetime import datetime
 from types import NoneType
 from typing_extensions import Annotated
 from flask_login import UserMixin
-from pydantic import BaseModel, BeforeValidator, Field, Strict, computed_field
-from typing import List, Optional
+from pydantic import BaseModel, BeforeValidator, Field, PrivateAttr, Strict, computed_field
+from typing import Iterable, List, Optional
 from pydantic.types import UUID4
 
 from ruoyi_common.base.model import AuditEntity, VoAccess, strict_base_config
@@ -16,6 +16,94 @@ from ruoyi_common.base.schema_vo import VoField
 from ruoyi_common.base.transformer import int_to_str, to_datetime, str_to_int
 
 
+class PermissionMatcher:
+    """
+    预编译的权限匹配器，登录用户的权限与角色只解析一次：
+    权限转为frozenset，*:*:* 表示全部权限，以 :* 结尾的权限按模块前缀匹配，如 system:* 或 system:user:*
+    """
+
+    ALL_PERMISSION = "*:*:*"
+
+    SUPER_ADMIN = "admin"
+
+    WILDCARD = "*"
+
+    SEPARATOR = ":"
+
+    __slots__ = ("permissions", "prefixes", "all_permission", "roles", "super_admin")
+
+    def __init__(self, permissions: Iterable[str], role_keys: Iterable[str]):
+        self.permissions = frozenset(
+            permission.strip() for permission in permissions or [] if permission and permission.strip()
+        )
+        prefixes = set()
+        all_permission = self.ALL_PERMISSION in self.permissions
+        for permission in self.permissions:
+            segments = permission.split(self.SEPARATOR)
+            if segments[-1] != self.WILDCARD:
+                continue
+            while segments and segments[-1] == self.WILDCARD:
+                segments.pop()
+            if segments:
+                prefixes.add(self.SEPARATOR.join(segments) + self.SEPARATOR)
+            else:
+                all_permission = True
+        self.all_permission = all_permission
+        self.prefixes = tuple(sorted(prefixes))
+        self.roles = frozenset(role.strip() for role in role_keys or [] if role)
+        self.super_admin = self.SUPER_ADMIN in self.roles
+
+    def has_perm(self, permission: str) -> bool:
+        """
+        是否具备某权限
+
+        Args:
+            permission (str): 已去除首尾空白的权限标识
+
+        Returns:
+            bool: 是否具备
+        """
+        return self.all_permission \
+            or permission in self.permissions \
+            or (bool(self.prefixes) and permission.startswith(self.prefixes))
+
+    def any_perm(self, permissions: Iterable[str]) -> bool:
+        """
+        是否具备任意一个权限
+
+        Args:
+            permissions (Iterable[str]): 已去除首尾空白的权限标识
+
+        Returns:
+            bool: 是否具备
+        """
+        return any(self.has_perm(permission) for permission in permissions)
+
+    def has_role(self, role: str) -> bool:
+        """
+        是否具备某角色，超级管理员具备所有角色
+
+        Args:
+            role (str): 已去除首尾空白的角色标识
+
+        Returns:
+            bool: 是否具备
+        """
+        return self.super_admin or role in self.roles
+
+    def any_role(self, roles: Iterable[str]) -> bool:
+        """
+        是否具备任意一个角色，超级管理员具备所有角色
+
+        Args:
+            roles (Iterable[str]): 已去除首尾空白的角色标识
+
+        Returns:
+            bool: 是否具备
+        """
+        return self.super_admin or not self.roles.isdisjoint(roles)
+
+
 class LoginUser(BaseModel, UserMixin):
     model_config = strict_base_config.copy()
 
@@ -45,11 +133,37 @@ class LoginUser(BaseModel, UserMixin):
 
     permissions: Optional[List] = []
 
+    # 登录时解析的数据权限部门ID（自定义、本部门及以下），为None时按角色实时构造子查询
+    data_scope_dept_ids: Optional[List[int]] = None
+
     user: Optional["SysUser"] = None
 
+    _permission_matcher: Optional[PermissionMatcher] = PrivateAttr(default=None)
+
     def get_id(self) -> int:
         return self.user_id
 
+    @property
+    def permission_matcher(self) -> PermissionMatcher:
+        """
+        权限匹配器，首次访问时编译，model_copy 得到的副本共用同一个匹配器
+        """
+        if self._permission_matcher is None:
+            self.compile_permissions()
+        return self._permission_matcher
+
+    def compile_permissions(self) -> PermissionMatcher:
+        """
+        根据当前的权限与角色重新编译权限匹配器，权限或角色变更后调用
+
+        Returns:
+            PermissionMatcher: 权限匹配器
+        """
+        role_keys = [role.role_key for role in self.user.roles] \
+            if self.user and self.user.roles else []
+        self._permission_matcher = PermissionMatcher(self.permissions, role_keys)
+        return self._permission_matcher
+
     @property
     def user_name(self) -> str:
         return self.user.user_name
@@ -1,14 +1,31 @@
+import base64
+import hashlib
+import json
+import logging
 from collections import UserDict,UserList
 from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum
 from threading import Lock
+from typing import Any, Callable, List, Optional, Tuple
+from flask import current_app
 from pydantic.dataclasses import dataclass
 import sqlalchemy.orm as sa_orm
 import sqlalchemy as sa
 from sqlalchemy.orm import Session
 
+from ruoyi_common.constant import Constants
+
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_PAGE_SIZE = 10
 DEFAULT_PAGE_NUM = 1
+MAX_KEYSET_PAGE_SIZE = 100
+# 按过滤条件缓存总数的默认时间（秒）
+DEFAULT_COUNT_CACHE_SECONDS = 60
+# 统计信息中的行数低于该值时仍精确计数，小表的估算误差较大且精确计数代价很低
+MIN_ESTIMATED_ROWS = 10000
 
 
 class WriteReadLock:
@@ -110,6 +127,84 @@ class Pagination:
         count_stmt = sa.select(sa.func.count()).select_from(sub)
         return session.execute(count_stmt).scalar_one_or_none() or 0
     
+    def compute_cached_count(self,stmt:sa.Select,session:Session,cache_seconds:int) -> int:
+        """
+        计算总数，按SQL与参数的哈希在Redis中缓存，Redis不可用时精确计数
+
+        Args:
+            stmt (sa.Select): 选择表达式
+            session (Session): 数据库会话
+            cache_seconds (int): 缓存时间（秒）
+
+        Returns:
+            int: 总数
+        """
+        compiled = stmt.order_by(None).compile(dialect=session.get_bind().dialect)
+        raw = str(compiled) + json.dumps(compiled.params, sort_keys=True, default=str)
+        cache_key = Constants.PAGE_COUNT_KEY + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        try:
+            client = current_app.extensions["redis"]._redis_client
+            cached = client.get(cache_key)
+        except Exception as e:
+            logger.warning("读取分页总数缓存失败: %s", e)
+            return self.compute_count(stmt, session)
+        if cached is not None:
+            return int(cached)
+        total = self.compute_count(stmt, session)
+        try:
+            client.setex(cache_key, cache_seconds, total)
+        except Exception as e:
+            logger.warning("写入分页总数缓存失败: %s", e)
+        return total
+    
+    def compute_estimated_count(self,stmt:sa.Select,session:Session,cache_seconds:int) -> int:
+        """
+        估算总数：单表且无过滤条件时读取 information_schema 的行数统计，
+        统计行数较少时精确计数，有过滤条件时按SQL缓存总数
+
+        Args:
+            stmt (sa.Select): 选择表达式
+            session (Session): 数据库会话
+            cache_seconds (int): 有过滤条件时总数的缓存时间（秒）
+
+        Returns:
+            int: 总数
+        """
+        froms = stmt.get_final_froms()
+        if stmt.whereclause is not None or len(froms) != 1 \
+            or not isinstance(froms[0], sa.Table):
+            return self.compute_cached_count(stmt, session, cache_seconds)
+        estimate_stmt = sa.text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        )
+        estimated = session.execute(estimate_stmt, {"table_name": froms[0].name}).scalar()
+        if estimated is None or estimated < MIN_ESTIMATED_ROWS:
+            return self.compute_count(stmt, session)
+        return int(estimated)
+    
+    def compute_skip_total(self,stmt:sa.Select,session:Session) -> int:
+        """
+        不计总数，只探测下一页是否存在：存在时返回已翻过的条数加一，
+        否则返回已翻过的条数，前端据此显示下一页按钮
+
+        Args:
+            stmt (sa.Select): 选择表达式
+            session (Session): 数据库会话
+
+        Returns:
+            int: 用于翻页的总数
+        """
+        consumed = self.offset + self.page_size
+        probe = stmt.order_by(None).limit(1).offset(consumed).subquery()
+        has_next = session.execute(sa.select(sa.literal(1)).select_from(probe)).first() is not None
+        if has_next:
+            return consumed + 1
+        # 没有下一页时，当前页的条数决定总数，需单独统计当前页
+        sub = stmt.order_by(None).limit(self.page_size).offset(self.offset).subquery()
+        current = session.execute(sa.select(sa.func.count()).select_from(sub)).scalar() or 0
+        return self.offset + current
+    
     def rebuild(self,stmt:sa.Select) -> sa.Select:
         """
         重新构建选择表达式 
@@ -123,3 +218,155 @@ class Pagination:
         new_stmt = stmt.limit(self.page_size).offset(self.offset)
         return new_stmt
 
+
+class CountMode(Enum):
+    
+    # 每页都执行 count(*)
+    EXACT = "exact"
+    
+    # 按SQL与参数的哈希缓存总数，缓存期内新增或删除的数据不会体现在总数中
+    CACHED = "cached"
+    
+    # 无过滤条件时取 information_schema 中的估算行数，有过滤条件时按 CACHED 处理
+    ESTIMATED = "estimated"
+    
+    # 不计总数，只判断是否还有下一页，总数返回为已翻过的条数加一
+    SKIP = "skip"
+
+
+def paginate(
+    stmt:sa.Select,
+    page:Any,
+    count_mode:CountMode=CountMode.EXACT,
+    session:Optional[Session]=None,
+    cache_seconds:int=DEFAULT_COUNT_CACHE_SECONDS
+) -> sa.Result:
+    """
+    执行分页查询，按计数方式计算总数并写回 page.total；page为空时不分页
+
+    Args:
+        stmt (sa.Select): 选择表达式，应包含最终的排序
+        page (PageModel): 分页参数，通常为 g.criterian_meta.page
+        count_mode (CountMode, optional): 计数方式
+        session (Session, optional): 数据库会话，默认使用当前应用的会话
+        cache_seconds (int, optional): CACHED 模式下总数的缓存时间（秒）
+
+    Returns:
+        sa.Result: 当前页的查询结果
+    """
+    session = session or current_app.extensions["sqlalchemy"].session
+    if not page:
+        return session.execute(stmt)
+    
+    pagination = Pagination(page_num=page.page_num, page_size=page.page_size)
+    if count_mode == CountMode.SKIP:
+        page.total = pagination.compute_skip_total(stmt, session)
+    elif count_mode == CountMode.ESTIMATED:
+        page.total = pagination.compute_estimated_count(stmt, session, cache_seconds)
+    elif count_mode == CountMode.CACHED:
+        page.total = pagination.compute_cached_count(stmt, session, cache_seconds)
+    else:
+        page.total = pagination.compute_count(stmt, session)
+    return session.execute(pagination.rebuild(stmt))
+
+
+@dataclass
+class KeysetPagination:
+    
+    """游标分页，按 (排序列, 主键) 定位下一页，不使用 OFFSET 与 count(*)"""
+    
+    page_size: int
+    
+    cursor: Optional[str] = None
+    
+    max_page_size: int = MAX_KEYSET_PAGE_SIZE
+    
+    def __post_init__(self):
+        self.page_size = min(max(self.page_size or DEFAULT_PAGE_SIZE, 1), self.max_page_size)
+    
+    def rebuild(self, stmt:sa.Select, id_column:Any, sort_column:Any=None, descending:bool=False) -> sa.Select:
+        """
+        追加游标条件、排序和 limit，多取一条用于判断是否还有下一页
+
+        Args:
+            stmt (sa.Select): 选择表达式
+            id_column (Any): 主键列，作为排序的最后一列保证顺序唯一
+            sort_column (Any, optional): 排序列，为空时只按主键排序
+            descending (bool, optional): 是否倒序
+
+        Returns:
+            sa.Select: 选择表达式
+        """
+        key = self.decode_cursor(sort_column)
+        if key is not None:
+            sort_value, id_value = key
+            id_after = id_column < id_value if descending else id_column > id_value
+            if sort_column is not None:
+                sort_after = sort_column < sort_value if descending else sort_column > sort_value
+                stmt = stmt.where(sa.or_(sort_after, sa.and_(sort_column == sort_value, id_after)))
+            else:
+                stmt = stmt.where(id_after)
+        
+        order_columns = [sort_column, id_column] if sort_column is not None else [id_column]
+        stmt = stmt.order_by(*[column.desc() if descending else column.asc() for column in order_columns])
+        return stmt.limit(self.page_size + 1)
+    
+    def split(self, rows:List[Any], id_getter:Callable[[Any],Any], sort_getter:Optional[Callable[[Any],Any]]=None) -> Tuple[List[Any], Optional[str]]:
+        """
+        截取当前页数据，并生成下一页游标
+
+        Args:
+            rows (List[Any]): rebuild 后查询出的数据
+            id_getter (Callable): 取主键值的函数
+            sort_getter (Callable, optional): 取排序值的函数
+
+        Returns:
+            Tuple[List[Any], Optional[str]]: (当前页数据, 下一页游标)，没有下一页时游标为None
+        """
+        if len(rows) <= self.page_size:
+            return list(rows), None
+        rows = list(rows[:self.page_size])
+        last = rows[-1]
+        return rows, self.encode_cursor(sort_getter(last) if sort_getter else None, id_getter(last))
+    
+    @staticmethod
+    def encode_cursor(sort_value:Any, id_value:Any) -> str:
+        """
+        编码游标
+
+        Args:
+            sort_value (Any): 排序值
+            id_value (Any): 主键值
+
+        Returns:
+            str: URL安全的游标字符串
+        """
+        if isinstance(sort_value, datetime):
+            sort_value = sort_value.isoformat()
+        raw = json.dumps([sort_value, id_value], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+    
+    def decode_cursor(self, sort_column:Any=None) -> Optional[Tuple[Any, Any]]:
+        """
+        解码游标
+
+        Args:
+            sort_column (Any, optional): 排序列，用于还原日期类型的排序值
+
+        Raises:
+            ValueError: 游标格式错误
+
+        Returns:
+            Optional[Tuple[Any, Any]]: (排序值, 主键值)，没有游标时返回None
+        """
+        if not self.cursor:
+            return None
+        try:
+            padded = self.cursor + "=" * (-len(self.cursor) % 4)
+            sort_value, id_value = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if sort_column is not None and isinstance(sort_column.type, sa.DateTime):
+                sort_value = datetime.fromisoformat(sort_value)
+            return sort_value, int(id_value)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"无效的分页游标: {self.cursor}") from e
+
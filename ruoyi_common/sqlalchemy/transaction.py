@@ -1,10 +1,17 @@
+import logging
 from functools import wraps
-from typing import Any
+from typing import Any, Callable
 from enum import Enum
+from sqlalchemy import event
 from sqlalchemy.orm.scoping import scoped_session
 from sqlalchemy.orm.session import Session
 
 
+logger = logging.getLogger(__name__)
+
+AFTER_COMMIT_CALLBACKS = 'after_commit_callbacks'
+
+
 class Propagation(Enum):
     
     # 不存在事务，则创建事务，如果存在事务，则加入该事务
@@ -115,4 +122,42 @@ class TransactionWrapper:
             rv = self.func(None, *args, **kwargs)
         else:
             raise ValueError(f"Unknown propagation level: {self.propagation}")            
-        return rv
\ No newline at end of file
+        return rv
+
+
+def after_commit(session:scoped_session | Session, callback:Callable[[], Any]):
+    '''
+    在当前事务提交后执行回调，事务回滚则丢弃；不存在事务时立即执行。
+    回调执行时事务已结束，不能再通过该会话访问数据库
+    
+    :param session: 会话
+    :param callback: 无参回调
+    '''
+    session = session._proxied \
+        if isinstance(session, scoped_session) else session
+    if not session.in_transaction():
+        callback()
+        return
+    session.info.setdefault(AFTER_COMMIT_CALLBACKS, []).append(callback)
+
+
+@event.listens_for(Session, 'after_commit')
+def _run_after_commit(session:Session):
+    '''
+    顶层事务提交后，依次执行登记的回调，单个回调失败不影响其他回调
+    '''
+    callbacks = session.info.pop(AFTER_COMMIT_CALLBACKS, None)
+    for callback in callbacks or []:
+        try:
+            callback()
+        except Exception as e:
+            logger.exception("事务提交后回调执行失败: %s", e)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_after_commit(session:Session, previous_transaction):
+    '''
+    顶层事务回滚后，丢弃登记的回调
+    '''
+    if previous_transaction.parent is None:
+        session.info.pop(AFTER_COMMIT_CALLBACKS, None)
@@ -3,4 +3,5 @@
 
 from .base import StringUtil, FileUtil, DictUtil, Base64Util, IpUtil, \
     AddressUtil, MimeTypeUtil, FileUploadUtil, MessageUtil, \
-    TokenUtil, DateUtil,ExcelUtil
+    TokenUtil, DateUtil,ExcelUtil, TtlLruCache, \
+    TreeUtil
@@ -7,6 +7,7 @@ import json
 import os,socket,threading,re,base64,ipaddress,math,psutil
 from zipfile import is_zipfile
 import time
+from collections import OrderedDict
 from typing import Any, Callable, Dict, List, Literal, Optional, Type, \
     get_args, get_origin
 from datetime import datetime
@@ -991,6 +992,107 @@ class AtomicInteger:
             return self._value
 
 
+class TtlLruCache:
+    """
+    线程安全的进程内LRU缓存，条目写入超过ttl秒后失效，容量满时淘汰最久未访问的条目
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        '''
+        获取缓存值
+
+        Args:
+            key: 缓存键
+            default: 未命中或已过期时的返回值
+
+        Returns:
+            Any: 缓存值
+        '''
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expire_at, value = item
+            if expire_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        '''
+        写入缓存值
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+        '''
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        '''
+        删除缓存值
+
+        Args:
+            key: 缓存键
+        '''
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        '''
+        清空缓存
+        '''
+        with self._lock:
+            self._data.clear()
+
+
+class TreeUtil:
+    
+    @classmethod
+    def build_tree(cls, nodes:List[Any], id_field:str, parent_field:str="parent_id",
+        children_field:str="children", root_id:Any=None) -> List[Any]:
+        '''
+        构建树结构：按父节点ID分组一次，再从根节点逐层挂载子节点，时间复杂度O(n)；
+        同一父节点下的子节点保持原列表中的顺序，只有从根节点可达的节点会被设置子节点
+
+        Args:
+            nodes (List[Any]): 节点列表
+            id_field (str): 节点ID属性名
+            parent_field (str): 父节点ID属性名
+            children_field (str): 子节点列表属性名
+            root_id (Any): 根节点的父节点ID，为None时以父节点不在列表中的节点为根
+
+        Returns:
+            List[Any]: 根节点列表
+        '''
+        groups:Dict[Any, List[Any]] = {}
+        for node in nodes:
+            groups.setdefault(getattr(node, parent_field), []).append(node)
+        if root_id is not None:
+            roots = groups.get(root_id, [])
+        else:
+            ids = {getattr(node, id_field) for node in nodes}
+            roots = [node for node in nodes if getattr(node, parent_field) not in ids]
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            children = groups.get(getattr(node, id_field), [])
+            setattr(node, children_field, children)
+            stack.extend(children)
+        return roots
+
+
 class Seq:
 
     common_seq_type = "common"
@@ -24,7 +24,8 @@ class MinioUtil:
         object_name: str,
         file_stream,
         content_type: str,
-        bucket_name: str = CONFIG_CACHE.get('flask.MINIO_BUCKET')
+        bucket_name: str = CONFIG_CACHE.get('flask.MINIO_BUCKET'),
+        metadata: dict = None
     ):
         client = cls.get_client()
 
@@ -38,10 +39,53 @@ class MinioUtil:
             data=file_stream,
             length=-1,
             part_size=10 * 1024 * 1024,
-            content_type=content_type
+            content_type=content_type,
+            metadata=metadata
         )
 
         return client.stat_object(bucket_name, object_name)
+
+    # 下载对象到本地文件，返回对象信息
+    @classmethod
+    def download_file(
+        cls,
+        object_name: str,
+        file_path: str,
+        bucket_name: str = CONFIG_CACHE.get('flask.MINIO_BUCKET')
+    ):
+        client = cls.get_client()
+        return client.fget_object(bucket_name, object_name, file_path)
+
+    # 读取对象内容，适合小文件
+    @classmethod
+    def get_object_bytes(
+        cls,
+        object_name: str,
+        bucket_name: str = CONFIG_CACHE.get('flask.MINIO_BUCKET')
+    ) -> bytes:
+        client = cls.get_client()
+        response = client.get_object(bucket_name, object_name)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    # 查询对象信息，对象不存在时返回None
+    @classmethod
+    def stat_object_or_none(
+        cls,
+        object_name: str,
+        bucket_name: str = CONFIG_CACHE.get('flask.MINIO_BUCKET')
+    ):
+        from minio.error import S3Error
+        client = cls.get_client()
+        try:
+            return client.stat_object(bucket_name, object_name)
+        except S3Error as e:
+            if e.code in ('NoSuchKey', 'NoSuchBucket', 'NoSuchObject'):
+                return None
+            raise
         
     # 通过ffmpeg获取一个音频文件的时长
     @classmethod
@@ -3,20 +3,20 @@
 
 from enum import Enum
 from functools import wraps
-from typing import Any, Literal
+from typing import Any, List, Literal, Optional
 from flask import g
 from pydantic import ConfigDict, Field, validate_call
 from pydantic.dataclasses import dataclass
 from sqlalchemy.orm.util import AliasedClass
 from sqlalchemy.sql.expression import or_
-from sqlalchemy import func, select, text
+from sqlalchemy import select, text
 
 from ruoyi_common.base.model import CriterianMeta
 from ruoyi_common.descriptor.validator import ValidatorScopeFunction
 from ruoyi_common.base.schema_vo import BaseEntity
 from ruoyi_common.domain.entity import LoginUser, SysUser
 from ruoyi_common.utils import security_util as SecurityUtil
-from ruoyi_system.domain.po import SysDeptPo, SysRoleDeptPo, SysUserPo
+from ruoyi_system.domain.po import SysDeptClosurePo, SysDeptPo, SysRoleDeptPo, SysUserPo
 
 
 class DataScopeEnum(Enum):
@@ -81,7 +81,7 @@ class DataScope:
             current_user:SysUser = login_user.user
             # 检查用户是否为超级管理员（用户ID为1或者具有admin角色）
             if not SecurityUtil.is_admin(login_user.user_id) and not self.is_user_admin(current_user):
-                self.filter_data_scope(current_user)
+                self.filter_data_scope(current_user, login_user.data_scope_dept_ids)
             else:
                 # print(g.criterian_meta.scope) ## 这里非常奇怪，不知道什么地方会把这个criterian_meta.scope初始化成[]
                 # 所以必须设置成None，否则会报错
@@ -105,15 +105,18 @@ class DataScope:
                     return True
         return False
     
-    def filter_data_scope(self,user: SysUser):
+    def filter_data_scope(self,user: SysUser, dept_ids: Optional[List[int]] = None):
         """
         过滤数据权限范围
         
         Args:
             user (SysUser): 当前用户
+            dept_ids (Optional[List[int]]): 登录时已解析的自定义、本部门及以下数据权限部门ID，
+                为None时按角色构造闭包表子查询
         """
 
         criterions = []
+        resolved = False
         for role in user.roles:
             if role.data_scope == DataScopeEnum.ALL.value:
                 # 全部数据权限
@@ -121,13 +124,13 @@ class DataScope:
                    g.criterian_meta.scope = None
                 return
             elif role.data_scope == DataScopeEnum.CUSTOM.value:
+                if dept_ids is not None:
+                    resolved = True
+                    continue
                 subquery = select(SysRoleDeptPo.dept_id) \
                     .where(SysRoleDeptPo.role_id == role.role_id) \
                     .subquery()
-                if self.dept is True:
-                    criterions.append(SysDeptPo.dept_id.in_(subquery))
-                elif isinstance(self.dept, AliasedClass):
-                    criterions.append(self.dept.dept_id.in_(subquery))
+                self.append_dept_criterion(criterions, subquery)
             elif role.data_scope == DataScopeEnum.DEPT.value:
                 # 本部门数据权限
                 if self.dept is True:
@@ -135,20 +138,13 @@ class DataScope:
                 elif isinstance(self.dept, AliasedClass):
                     criterions.append(self.dept.dept_id == user.dept_id)
             elif role.data_scope == DataScopeEnum.DEPT_AND_CHILD.value:
-                # 本部门及子部门数据权限
-                subquery = (
-                    select(SysDeptPo.dept_id)
-                    .where(
-                        or_(
-                            SysDeptPo.dept_id == user.dept_id,
-                            func.find_in_set(user.dept_id, SysDeptPo.ancestors),
-                        )
-                    )
-                )
-                if self.dept is True:
-                    criterions.append(SysDeptPo.dept_id.in_(subquery))
-                elif isinstance(self.dept, AliasedClass):
-                    criterions.append(self.dept.dept_id.in_(subquery))
+                # 本部门及子部门数据权限，闭包表按祖先部门走主键索引
+                if dept_ids is not None:
+                    resolved = True
+                    continue
+                subquery = select(SysDeptClosurePo.descendant_id) \
+                    .where(SysDeptClosurePo.ancestor_id == user.dept_id)
+                self.append_dept_criterion(criterions, subquery)
             elif role.data_scope == DataScopeEnum.SELF.value:
                 # 仅本人数据权限
                 if self.user is True:
@@ -157,6 +153,8 @@ class DataScope:
                     criterions.append(self.user.user_id == user.user_id)
             else:
                 print(ValueError("Invalid data_scope value: {}".format(role.data_scope)))
+        if resolved:
+            self.append_dept_criterion(criterions, dept_ids)
         
         if len(criterions) > 0:
             data_scope = or_(*criterions)
@@ -168,3 +166,16 @@ class DataScope:
             criterian_meta.scope = data_scope
         else:
             print("Warning: No criterian_meta found in g. Data scope not set.")
+    
+    def append_dept_criterion(self, criterions: List, dept_ids: Any):
+        """
+        追加部门过滤条件
+
+        Args:
+            criterions (List): 过滤条件列表
+            dept_ids (Any): 部门ID列表或子查询
+        """
+        if self.dept is True:
+            criterions.append(SysDeptPo.dept_id.in_(dept_ids))
+        elif isinstance(self.dept, AliasedClass):
+            criterions.append(self.dept.dept_id.in_(dept_ids))
@@ -2,10 +2,10 @@
 # @Author  : YY
 
 from functools import wraps
-from typing import Callable
+from typing import Callable, Iterable, Optional, Tuple
 from flask_login import UserMixin
 
-from ruoyi_common.domain.entity import LoginUser
+from ruoyi_common.domain.entity import LoginUser, PermissionMatcher
 from ruoyi_common.utils import security_util as SecurityUtil
 from ruoyi_common.utils.base import UtilException
 from ruoyi_common.constant import HttpStatus
@@ -17,15 +17,44 @@ class PermissionService:
     """
 
     # 所有权限标识
-    ALL_PERMISSION = "*:*:*"
+    ALL_PERMISSION = PermissionMatcher.ALL_PERMISSION
 
     # 管理员角色权限标识
-    SUPER_ADMIN = "admin"
+    SUPER_ADMIN = PermissionMatcher.SUPER_ADMIN
 
     ROLE_DELIMETER = ","
 
     PERMISSION_DELIMETER = ","
 
+    @classmethod
+    def get_matcher(cls) -> Optional[PermissionMatcher]:
+        """
+        获取当前登录用户的权限匹配器
+
+        Returns:
+            PermissionMatcher: 权限匹配器，未登录时为None
+        """
+        login_user: LoginUser = SecurityUtil.get_login_user()
+        if not login_user or not isinstance(login_user, UserMixin):
+            return None
+        return login_user.permission_matcher
+
+    @staticmethod
+    def split(value: str | Iterable[str], delimeter: str) -> Tuple[str, ...]:
+        """
+        拆分以分隔符连接的标识，已拆分的标识原样返回
+
+        Args:
+            value (str | Iterable[str]): 标识字符串或标识列表
+            delimeter (str): 分隔符
+
+        Returns:
+            Tuple[str, ...]: 去除首尾空白后的标识
+        """
+        if isinstance(value, str):
+            value = value.split(delimeter)
+        return tuple(item.strip() for item in value if item and item.strip())
+
     @classmethod
     def has_perm(cls, permission: str) -> bool:
         """
@@ -39,16 +68,10 @@ class PermissionService:
         """
         if not permission:
             return False
-        login_user: LoginUser = SecurityUtil.get_login_user()
-        if not login_user:
+        matcher = cls.get_matcher()
+        if not matcher:
             return False
-        else:
-            if not isinstance(login_user, UserMixin):
-                return False
-            user_authorities = login_user.permissions
-            if not user_authorities: return False
-        return cls.ALL_PERMISSION in user_authorities \
-            or permission.strip() in user_authorities
+        return matcher.has_perm(permission.strip())
 
     @classmethod
     def no_perm(cls, permission: str) -> bool:
@@ -64,27 +87,21 @@ class PermissionService:
         return not cls.has_perm(permission)
 
     @classmethod
-    def any_perm(cls, permissions: str) -> bool:
+    def any_perm(cls, permissions: str | Iterable[str]) -> bool:
         """
         验证用户是否具备某权限列表中的任意一个权限
 
         Args:
-            permissions (str): 权限标识列表，多个权限标识以逗号分隔
+            permissions (str | Iterable[str]): 权限标识列表，多个权限标识以逗号分隔
 
         Returns:
             bool: True:具备任意一个权限，False:不具备任何一个权限
         """
         if not permissions: return False
-        login_user: LoginUser = SecurityUtil.get_login_user()
-        if not login_user:
+        matcher = cls.get_matcher()
+        if not matcher:
             return False
-        else:
-            user_authorities = login_user.permissions
-            if not user_authorities: return False
-        for permission in permissions.split(cls.PERMISSION_DELIMETER):
-            if permission.strip() in user_authorities:
-                return True
-        return False
+        return matcher.any_perm(cls.split(permissions, cls.PERMISSION_DELIMETER))
 
     @classmethod
     def has_role(cls, role: str) -> bool:
@@ -99,14 +116,10 @@ class PermissionService:
         """
         if not role:
             return False
-        login_user: LoginUser = SecurityUtil.get_login_user()
-        if not login_user or not login_user.user.roles:
+        matcher = cls.get_matcher()
+        if not matcher:
             return False
-        for sys_role in login_user.user.roles:
-            if sys_role.role_key == cls.SUPER_ADMIN \
-                    or sys_role.role_key == role.strip():
-                return True
-        return False
+        return matcher.has_role(role.strip())
 
     @classmethod
     def no_role(cls, role: str) -> bool:
@@ -122,32 +135,28 @@ class PermissionService:
         return not cls.has_role(role)
 
     @classmethod
-    def any_role(cls, roles: str) -> bool:
+    def any_role(cls, roles: str | Iterable[str]) -> bool:
         """
         验证用户是否具备某角色列表中的任意一个角色
 
         Args:
-            roles (str): 角色标识列表，多个角色标识以逗号分隔
+            roles (str | Iterable[str]): 角色标识列表，多个角色标识以逗号分隔
 
         Returns:
             bool: True:具备任意一个角色，False:不具备任何一个角色
         """
         if not roles: return False
-        login_user: LoginUser = SecurityUtil.get_login_user()
-        if not login_user or not login_user.user.roles:
+        matcher = cls.get_matcher()
+        if not matcher:
             return False
-        for role in roles.split(cls.ROLE_DELIMETER):
-            for sys_role in login_user.user.roles:
-                if sys_role.role_key == cls.SUPER_ADMIN \
-                        or sys_role.role_key == role.strip():
-                    return True
-        return False
+        return matcher.any_role(cls.split(roles, cls.ROLE_DELIMETER))
 
 
 class AuthorityCaller:
 
     def __init__(self, value: str) -> None:
-        self._value = value
+        # 装饰时即完成解析，请求时不再处理字符串
+        self._value = value.strip() if value else value
 
     def __call__(self) -> bool:
         NotImplementedError()
@@ -198,8 +207,12 @@ class AnyPerm(AuthorityCaller):
 
     """
 
+    def __init__(self, value: str) -> None:
+        super().__init__(value)
+        self._values = PermissionService.split(value or "", PermissionService.PERMISSION_DELIMETER)
+
     def __call__(self) -> bool:
-        return PermissionService.any_perm(self._value)
+        return PermissionService.any_perm(self._values)
 
 
 class HasRole(AuthorityCaller):
@@ -221,7 +234,7 @@ class NoRole(AuthorityCaller):
     """
 
     def __call__(self) -> bool:
-        return PermissionService.no_role(self._role)
+        return PermissionService.no_role(self._value)
 
 
 class AnyRole(AuthorityCaller):
@@ -231,21 +244,25 @@ class AnyRole(AuthorityCaller):
 
     """
 
+    def __init__(self, value: str) -> None:
+        super().__init__(value)
+        self._values = PermissionService.split(value or "", PermissionService.ROLE_DELIMETER)
+
     def __call__(self) -> bool:
-        return PermissionService.any_role(self._role)
+        return PermissionService.any_role(self._values)
 
 
 class PreAuthorize:
 
     def __init__(self, auth: AuthorityCaller | Callable):
+        if not callable(auth):
+            raise UtilException("权限验证器必须是可调用对象", HttpStatus.ERROR)
         self._auth = auth
 
     def __call__(self, func) -> Callable:
 
         @wraps(func)
         def wrapper(*args, **kwargs):
-            if not callable(self._auth):
-                raise UtilException("权限验证器必须是可调用对象", HttpStatus.ERROR)
             if not self._auth():
                 raise UtilException("无访问权限", HttpStatus.FORBIDDEN)
             return func(*args, **kwargs)
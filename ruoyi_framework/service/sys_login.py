@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import datetime
-from flask import  Request, request
+from typing import Dict, List, Optional
+from flask import  Flask, Request, request
 
+from ruoyi_common.base.signal import permission_changed
 from ruoyi_common.constant import Constants
 from ruoyi_common.domain.vo import LoginBody
 from ruoyi_common.utils import AddressUtil, IpUtil, MessageUtil
@@ -10,13 +12,14 @@ from ruoyi_common.utils import security_util as SecurityUtil
 from ruoyi_common.domain.entity import LoginUser, SysUser
 from ruoyi_common.domain.enum import UserStatus
 from ruoyi_common.exception import ServiceException
+from ruoyi_common.sqlalchemy.transaction import after_commit
 from ruoyi_common.utils.base import UserAgentUtil
 from ruoyi_framework.asyncsched.manager import TaskManager
 from ruoyi_framework.asyncsched.task import record_logininfor
 from ruoyi_system.domain.entity import SysLogininfor
-from ruoyi_system.service import SysConfigService,SysUserService
+from ruoyi_system.service import SysConfigService,SysDeptService,SysMenuService,SysUserService
 from ruoyi_system.service.sys_post import SysPostService
-from ruoyi_admin.ext import lm,redis_cache
+from ruoyi_admin.ext import db,lm,redis_cache
 from .token import TokenService
 from .sys_permission import SysPermissionService
 
@@ -104,10 +107,65 @@ class LoginService:
             user_id=user.user_id,
             dept_id=user.dept_id,
             permissions=SysPermissionService.get_menu_permission(user),
+            data_scope_dept_ids=SysDeptService.select_data_scope_dept_ids(user),
             user=user,
         )
         return login_user
 
+    @classmethod
+    def refresh_login_users(
+        cls,
+        role_ids:Optional[List[int]]=None,
+        user_ids:Optional[List[int]]=None,
+        menu_ids:Optional[List[int]]=None,
+        dept_ids:Optional[List[int]]=None
+    ) -> int:
+        """
+        角色、菜单、部门或用户授权变更后，重新加载受影响的已登录用户并写回Redis，无需重新登录即可生效；
+        菜单与部门层级变更影响所有用户，用户已删除或停用时强制退出
+
+        Args:
+            role_ids (Optional[List[int]]): 变更的角色ID列表
+            user_ids (Optional[List[int]]): 变更授权的用户ID列表
+            menu_ids (Optional[List[int]]): 变更的菜单ID列表
+            dept_ids (Optional[List[int]]): 层级变更的部门ID列表
+
+        Returns:
+            int: 刷新的登录用户数量
+        """
+        role_set = set(role_ids or [])
+        user_set = set(user_ids or [])
+        reloaded:Dict[int, Optional[LoginUser]] = {}
+        num = 0
+        for key in redis_cache.scan_iter(match=Constants.LOGIN_TOKEN_KEY + "*", count=200):
+            user_json = redis_cache.get(key)
+            if not user_json:
+                continue
+            login_user = LoginUser.model_validate_json(user_json)
+            user = login_user.user
+            if not user or not login_user.token:
+                continue
+            if not menu_ids and not dept_ids and user.user_id not in user_set \
+                and role_set.isdisjoint(user.role_ids or []):
+                continue
+            if user.user_id not in reloaded:
+                sysuser = SysUserService.select_user_by_id(user.user_id)
+                try:
+                    reloaded[user.user_id] = cls.load_user(sysuser) if sysuser else None
+                except ServiceException:
+                    reloaded[user.user_id] = None
+            fresh_user = reloaded[user.user_id]
+            if fresh_user is None:
+                TokenService.del_login_user(login_user.token.hex)
+                continue
+            login_user.dept_id = fresh_user.dept_id
+            login_user.permissions = fresh_user.permissions
+            login_user.data_scope_dept_ids = fresh_user.data_scope_dept_ids
+            login_user.user = fresh_user.user
+            if TokenService.update_login_user(login_user):
+                num += 1
+        return num
+
     @classmethod
     def validate_captcha(cls, username:str, code:str, uuid:str):
         """
@@ -233,3 +291,47 @@ def load_request(request:Request) -> LoginUser:
     """
     login_user = TokenService.get_login_user(request)
     return login_user
+
+
+def refresh_login_users(app:Flask, **kwargs) -> int:
+    """
+    异步刷新已登录用户的角色与权限
+
+    Args:
+        app (Flask): flask应用
+        **kwargs: 变更的角色、用户、菜单ID列表
+
+    Returns:
+        int: 刷新的登录用户数量
+    """
+    with app.app_context():
+        return LoginService.refresh_login_users(**kwargs)
+
+
+@permission_changed.connect
+def on_permission_changed(sender, role_ids=None, user_ids=None, menu_ids=None,
+    dept_ids=None, **kwargs):
+    """
+    角色、菜单、部门或用户授权变更的信号处理：事务提交后清理受影响角色集合的权限与路由缓存，
+    并异步刷新已登录用户
+
+    Args:
+        sender: 信号发送者
+        role_ids: 变更的角色ID列表
+        user_ids: 变更授权的用户ID列表
+        menu_ids: 变更的菜单ID列表
+        dept_ids: 层级变更的部门ID列表
+    """
+    def on_committed():
+        if menu_ids:
+            SysMenuService.evict_role_cache()
+        elif role_ids:
+            SysMenuService.evict_role_cache(role_ids)
+        TaskManager.execute(
+            refresh_login_users,
+            role_ids=role_ids,
+            user_ids=user_ids,
+            menu_ids=menu_ids,
+            dept_ids=dept_ids
+        )
+    after_commit(db.session, on_committed)
@@ -3,6 +3,7 @@
 from typing import List, Set
 from ruoyi_common.domain.entity import SysUser
 from ruoyi_common.utils import security_util as SecurityUtil
+from ruoyi_system.domain.vo import RouterVo
 from ruoyi_system.service import SysMenuService,SysRoleService
 
 
@@ -39,5 +40,32 @@ class SysPermissionService:
         if SecurityUtil.is_admin(user.user_id):
             perms = ["*:*:*"]
         else:
-            perms = SysMenuService.select_menu_perms_by_user_id(user.user_id)
+            perms = SysMenuService.select_menu_perms_by_role_key(cls.get_role_key(user))
         return perms
+    
+    @classmethod
+    def get_routers(cls, user:SysUser) -> List[RouterVo]:
+        """
+        获取用户路由
+
+        Args:
+            user (SysUser): 用户信息
+
+        Returns:
+            List[RouterVo]: 路由列表
+        """
+        return SysMenuService.select_routers_by_role_key(cls.get_role_key(user))
+    
+    @classmethod
+    def get_role_key(cls, user:SysUser) -> str:
+        """
+        获取用户的角色集合标识，权限与路由均按角色集合缓存
+
+        Args:
+            user (SysUser): 用户信息
+
+        Returns:
+            str: 角色集合标识
+        """
+        role_ids = user.role_ids or [role.role_id for role in user.roles or []]
+        return SysMenuService.get_role_key(user.user_id, role_ids)
@@ -6,7 +6,7 @@ from flask import Request, request
 
 from ruoyi_common.exception import ServiceException
 from ruoyi_common.utils import AddressUtil, IpUtil, TokenUtil
-from ruoyi_common.utils.base import UserAgentUtil
+from ruoyi_common.utils.base import TtlLruCache, UserAgentUtil
 from ruoyi_common.constant import Constants
 from ruoyi_common.domain.entity import LoginUser
 from ruoyi_framework.config import TokenConfig
@@ -21,6 +21,10 @@ class TokenService:
 
     refresh_threshold_minutes = 20
     
+    # 进程内已解码的登录用户缓存，键为token的uuid，值为(登录用户, 版本号)；
+    # 每次请求只从Redis读取版本号，版本号未变化时不再读取和解析登录用户JSON
+    login_user_cache = TtlLruCache(maxsize=2048, ttl=300)
+    
     @classmethod
     def create_token(cls, user:LoginUser) -> str:
         """
@@ -82,10 +86,15 @@ class TokenService:
         expire_delta = TokenConfig.expire_time()
         user.expire_time = user.login_time + expire_delta
         expire_seconds = TokenConfig.expire_seconds()
-        usertoken_key = cls.get_token_key(user.token.hex)
+        token_uuid = user.token.hex
+        cls.login_user_cache.delete(token_uuid)
         if redis_cache:
             user_json = user.model_dump_json()
-            redis_cache.set(usertoken_key, user_json, ex=expire_seconds)
+            pipe = redis_cache.pipeline()
+            pipe.set(cls.get_token_key(token_uuid), user_json, ex=expire_seconds)
+            pipe.incr(cls.get_token_version_key(token_uuid))
+            pipe.expire(cls.get_token_version_key(token_uuid), expire_seconds)
+            pipe.execute()
         
     @classmethod
     def set_useragent(cls, user:LoginUser):
@@ -145,20 +154,63 @@ class TokenService:
             except Exception:
                 return None
             token_uuid = claims.get(Constants.LOGIN_USER_KEY)
-            usertoken_key = cls.get_token_key(token_uuid)
-            if redis_cache:
-                jsoned_user = redis_cache.get(usertoken_key)
-            else:
-                jsoned_user = None
-            if not jsoned_user:
+            if not redis_cache or not token_uuid:
                 return None
-            login_user = LoginUser.model_validate_json(jsoned_user)
+            login_user = cls.load_login_user(token_uuid)
             if login_user:
                 # 根据剩余有效期选择性刷新TTL，避免每次请求都重写缓存
                 cls.verify_token(login_user)
                 return login_user
-            else:
-                raise ServiceException("Token信息不存在")
+            return None
+
+    @classmethod
+    def load_login_user(cls, token_uuid:str) -> Optional[LoginUser]:
+        '''
+        加载登录用户信息，优先使用进程内缓存；
+        以token版本号校验缓存，版本号变化或token已删除时重新从Redis读取
+
+        Args:
+            token_uuid(str): token的uuid
+
+        Returns:
+            LoginUser: 登录用户信息，token不存在时返回None
+        '''
+        token_version = redis_cache.get(cls.get_token_version_key(token_uuid))
+        cached = cls.login_user_cache.get(token_uuid)
+        if cached and token_version is not None and cached[1] == token_version:
+            return cls._copy_login_user(cached[0])
+
+        jsoned_user = redis_cache.get(cls.get_token_key(token_uuid))
+        if not jsoned_user:
+            cls.login_user_cache.delete(token_uuid)
+            return None
+        login_user = LoginUser.model_validate_json(jsoned_user)
+        if not login_user:
+            raise ServiceException("Token信息不存在")
+        # 权限匹配器每次加载只编译一次，进程内缓存的副本共用
+        login_user.compile_permissions()
+        if token_version is not None:
+            cls.login_user_cache.set(token_uuid, (login_user, token_version))
+        return cls._copy_login_user(login_user)
+
+    @classmethod
+    def _copy_login_user(cls, login_user:LoginUser) -> LoginUser:
+        '''
+        复制进程内缓存的登录用户：嵌套的用户信息与列表字段深拷贝，
+        修改头像、密码等就地赋值不会影响同进程的其他请求；编译好的权限匹配器只读，副本共用
+
+        Args:
+            login_user(LoginUser): 缓存中的登录用户信息
+
+        Returns:
+            LoginUser: 登录用户信息副本
+        '''
+        return login_user.model_copy(update={
+            "user": login_user.user.model_copy(deep=True) if login_user.user else None,
+            "permissions": list(login_user.permissions or []),
+            "data_scope_dept_ids": list(login_user.data_scope_dept_ids)
+                if login_user.data_scope_dept_ids is not None else None,
+        })
             
     @classmethod
     def get_token(cls,request:Request) -> str:
@@ -190,6 +242,19 @@ class TokenService:
         '''
         return Constants.LOGIN_TOKEN_KEY + uuid
     
+    @classmethod
+    def get_token_version_key(cls, uuid:str) -> str:
+        '''
+        获取token版本号缓存key，登录用户信息每次写入Redis时递增
+
+        Args:
+            uuid(str): token的uuid
+
+        Returns:
+            str: token版本号缓存key
+        '''
+        return Constants.LOGIN_TOKEN_VERSION_KEY + uuid
+    
     @classmethod
     def set_login_user(cls, user:LoginUser):
         '''
@@ -201,6 +266,31 @@ class TokenService:
         if user and user.token:
             cls.refresh_token(user)
     
+    @classmethod
+    def update_login_user(cls, user:LoginUser) -> bool:
+        '''
+        覆盖已登录用户信息，保留原有效期并递增token版本号，token已失效时不写入
+
+        Args:
+            user(LoginUser): 登录用户信息
+
+        Returns:
+            bool: 是否写入成功
+        '''
+        if not user or not user.token or not redis_cache:
+            return False
+        token_uuid = user.token.hex
+        cls.login_user_cache.delete(token_uuid)
+        written = redis_cache.set(
+            cls.get_token_key(token_uuid),
+            user.model_dump_json(),
+            keepttl=True,
+            xx=True
+        )
+        if written:
+            redis_cache.incr(cls.get_token_version_key(token_uuid))
+        return bool(written)
+    
     @classmethod
     def del_login_user(cls, token:str):
         '''
@@ -211,5 +301,6 @@ class TokenService:
         '''
         if token:
             user_key:str = cls.get_token_key(token)
+            cls.login_user_cache.delete(token)
             if redis_cache:
-                redis_cache.delete(user_key)
+                redis_cache.delete(user_key, cls.get_token_version_key(token))
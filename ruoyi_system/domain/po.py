@@ -46,6 +46,18 @@ class SysDeptPo(db.Model):
     update_time: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime, comment='更新时间')
 
 
+class SysDeptClosurePo(db.Model):
+    __tablename__ = 'sys_dept_closure'
+    __table_args__ = (
+        Index('idx_sys_dept_closure_d', 'descendant_id', 'depth'),
+        {'comment': '部门层级闭包表'}
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(BIGINT(20), primary_key=True, comment='祖先部门id')
+    descendant_id: Mapped[int] = mapped_column(BIGINT(20), primary_key=True, comment='后代部门id')
+    depth: Mapped[int] = mapped_column(INTEGER(4), server_default=text("'0'"), comment='层级距离（0为自身）')
+
+
 class SysDictDataPo(db.Model):
     __tablename__ = 'sys_dict_data'
     __table_args__ = {'comment': '字典数据表'}
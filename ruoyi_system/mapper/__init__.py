@@ -1,5 +1,6 @@
 from .sys_config import SysConfigMapper
 from .sys_dept import SysDeptMapper
+from .sys_dept_closure import SysDeptClosureMapper
 from .sys_dict_data import SysDictDataMapper
 from .sys_dict_type import SysDictTypeMapper
 from .sys_logininfor import SysLogininforMapper
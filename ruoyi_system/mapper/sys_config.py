@@ -9,6 +9,7 @@ from ruoyi_admin.ext import db
 from ruoyi_common.base.model import ExtraModel
 from ruoyi_common.sqlalchemy.model import ColumnEntityList
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_common.sqlalchemy.query import paginate
 from ruoyi_system.domain.entity import SysConfig
 from ruoyi_system.domain.po import SysConfigPo
 
@@ -80,10 +81,9 @@ class SysConfigMapper:
         stmt = select(*cls.default_columns) \
             .where(*criterions) \
             .order_by(SysConfigPo.config_id.desc())
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
         
-        rows = db.session.execute(stmt).all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        rows = paginate(stmt, page).all()
         eos = list()
         for row in rows:
             eos.append(cls.default_columns.cast(row,SysConfig))
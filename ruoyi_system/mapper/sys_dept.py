@@ -9,7 +9,8 @@ from sqlalchemy.orm import aliased
 from ruoyi_common.domain.entity import SysDept
 from ruoyi_common.sqlalchemy.model import ColumnEntityList
 from ruoyi_common.sqlalchemy.transaction import Transactional
-from ruoyi_system.domain.po import SysDeptPo, SysRoleDeptPo, SysUserPo
+from ruoyi_common.sqlalchemy.query import paginate
+from ruoyi_system.domain.po import SysDeptClosurePo, SysDeptPo, SysRoleDeptPo, SysUserPo
 from ruoyi_admin.ext import db
 
 
@@ -51,10 +52,9 @@ class SysDeptMapper:
             criterions.append(g.criterian_meta.scope)
         
         stmt = select(*cls.default_columns).where(*criterions)
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
         
-        rows = db.session.execute(stmt).all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        rows = paginate(stmt, page).all()
         return [cls.default_columns.cast(row, SysDept) for row in rows]
         
     @classmethod
@@ -137,7 +137,8 @@ class SysDeptMapper:
         columns = ColumnEntityList(SysDeptPo, fields, alia_prefix=False)
         
         stmt = select(*columns) \
-            .where(func.find_in_set(dept_id, SysDeptPo.ancestors))
+            .join(SysDeptClosurePo, SysDeptClosurePo.descendant_id == SysDeptPo.dept_id) \
+            .where(SysDeptClosurePo.ancestor_id == dept_id, SysDeptClosurePo.depth > 0)
         rows = db.session.execute(stmt).all()
         
         return [columns.cast(row, SysDept) for row in rows]
@@ -154,9 +155,11 @@ class SysDeptMapper:
             int: 部门数量
         """
         criterions = [SysDeptPo.status==0, SysDeptPo.del_flag=="0"]
-        criterions.append(func.find_in_set(dept_id, SysDeptPo.ancestors))
+        criterions.append(SysDeptClosurePo.ancestor_id == dept_id)
+        criterions.append(SysDeptClosurePo.depth > 0)
         
         stmt = select(func.count()).select_from(SysDeptPo) \
+            .join(SysDeptClosurePo, SysDeptClosurePo.descendant_id == SysDeptPo.dept_id) \
             .where(*criterions)
         return db.session.execute(stmt).scalar() or 0
 
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+from typing import Iterable, List
+
+from sqlalchemy import delete, insert, literal, select, union
+
+from ruoyi_admin.ext import db
+from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_system.domain.po import SysDeptClosurePo, SysRoleDeptPo
+
+
+class SysDeptClosureMapper:
+
+    """
+    部门层级闭包表数据访问层，每个部门与自身及所有祖先部门各有一行
+    """
+
+    @classmethod
+    @Transactional(db.session)
+    def insert_dept_closure(cls, dept_id: int, parent_id: int) -> int:
+        """
+        新增部门的闭包关系：自身一行，外加父部门每个祖先（含父部门自身）各一行
+
+        Args:
+            dept_id (int): 新部门ID
+            parent_id (int): 父部门ID
+
+        Returns:
+            int: 新增记录数
+        """
+        columns = ["ancestor_id", "descendant_id", "depth"]
+        ancestors = select(
+            SysDeptClosurePo.ancestor_id,
+            literal(dept_id),
+            SysDeptClosurePo.depth + 1
+        ).where(SysDeptClosurePo.descendant_id == parent_id)
+        num = db.session.execute(
+            insert(SysDeptClosurePo).from_select(columns, ancestors)
+        ).rowcount
+        num += db.session.execute(
+            insert(SysDeptClosurePo).values(ancestor_id=dept_id, descendant_id=dept_id, depth=0)
+        ).rowcount
+        return num
+
+    @classmethod
+    @Transactional(db.session)
+    def move_dept_closure(cls, dept_id: int, parent_id: int) -> int:
+        """
+        部门更换父部门后，整棵子树与原祖先断开，再与新父部门的祖先逐一建立关系
+
+        Args:
+            dept_id (int): 移动的部门ID
+            parent_id (int): 新的父部门ID
+
+        Returns:
+            int: 新增记录数
+        """
+        subtree = db.session.execute(
+            select(SysDeptClosurePo.descendant_id, SysDeptClosurePo.depth)
+            .where(SysDeptClosurePo.ancestor_id == dept_id)
+        ).all()
+        subtree_ids = [row.descendant_id for row in subtree]
+        db.session.execute(
+            delete(SysDeptClosurePo).where(
+                SysDeptClosurePo.descendant_id.in_(subtree_ids),
+                SysDeptClosurePo.ancestor_id.not_in(subtree_ids)
+            )
+        )
+        ancestors = db.session.execute(
+            select(SysDeptClosurePo.ancestor_id, SysDeptClosurePo.depth)
+            .where(SysDeptClosurePo.descendant_id == parent_id)
+        ).all()
+        rows = [
+            {
+                "ancestor_id": ancestor.ancestor_id,
+                "descendant_id": node.descendant_id,
+                "depth": ancestor.depth + 1 + node.depth,
+            }
+            for ancestor in ancestors for node in subtree
+        ]
+        if not rows:
+            return 0
+        return db.session.execute(insert(SysDeptClosurePo).values(rows)).rowcount
+
+    @classmethod
+    def select_scope_dept_ids(
+        cls,
+        ancestor_ids: Iterable[int],
+        role_ids: Iterable[int]
+        ) -> List[int]:
+        """
+        一次查询解析数据权限范围内的部门ID：指定部门及其所有下级部门、角色自定义部门的并集
+
+        Args:
+            ancestor_ids (Iterable[int]): 本部门及以下数据权限的部门ID
+            role_ids (Iterable[int]): 自定义数据权限的角色ID
+
+        Returns:
+            List[int]: 部门ID列表
+        """
+        stmts = []
+        ancestor_ids, role_ids = list(ancestor_ids), list(role_ids)
+        if ancestor_ids:
+            stmts.append(
+                select(SysDeptClosurePo.descendant_id)
+                .where(SysDeptClosurePo.ancestor_id.in_(ancestor_ids))
+            )
+        if role_ids:
+            stmts.append(
+                select(SysRoleDeptPo.dept_id)
+                .where(SysRoleDeptPo.role_id.in_(role_ids))
+            )
+        if not stmts:
+            return []
+        stmt = union(*stmts) if len(stmts) > 1 else stmts[0].distinct()
+        return sorted(db.session.execute(stmt).scalars().all())
@@ -8,6 +8,7 @@ from sqlalchemy import delete, insert, select, update
 from ruoyi_common.domain.entity import SysDictType
 from ruoyi_common.sqlalchemy.model import ColumnEntityList
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_common.sqlalchemy.query import paginate
 from ruoyi_system.domain.po import SysDictTypePo
 from ruoyi_admin.ext import db
 
@@ -58,12 +59,12 @@ class SysDictTypeMapper:
             
             stmt = select(*cls.default_columns) \
                 .where(*criterions)
-            if "criterian_meta" in g and g.criterian_meta.page:
-                g.criterian_meta.page.stmt = stmt
+            page = g.criterian_meta.page if "criterian_meta" in g else None
         else:
             stmt = select(*cls.default_columns)
+            page = None
         
-        rows = db.session.execute(stmt).all()
+        rows = paginate(stmt, page).all()
         eos = list()
         for row in rows:
             eos.append(cls.default_columns.cast(row,SysDictType))
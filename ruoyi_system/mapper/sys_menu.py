@@ -8,6 +8,7 @@ from sqlalchemy import and_, delete, func, insert, select, update
 from ruoyi_common.domain.entity import SysMenu
 from ruoyi_common.sqlalchemy.model import ColumnEntityList
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_common.sqlalchemy.query import paginate
 from ruoyi_system.domain.po import SysMenuPo, SysRoleMenuPo, SysRolePo, SysUserPo, SysUserRolePo
 from ruoyi_admin.ext import db
 
@@ -51,10 +52,9 @@ class SysMenuMapper:
         stmt = select(*cls.default_columns) \
             .where(*criterions) \
             .order_by(SysMenuPo.parent_id, SysMenuPo.order_num)
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
         
-        rows = db.session.execute(stmt).all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        rows = paginate(stmt, page).all()
         return [cls.default_columns.cast(row, SysMenu) for row in rows]
 
     @classmethod
@@ -114,6 +114,27 @@ class SysMenuMapper:
             .where(and_(*coritations))
         return db.session.execute(stmt).scalars().all()
 
+    @classmethod
+    def select_menu_perms_by_role_ids(cls, role_ids: List[int]) -> List[str]:
+        """
+        根据角色ID列表，查询正常状态角色的权限
+        
+        Args:
+            role_ids (List[int]): 角色ID列表
+        
+        Returns:
+            List[str]: 权限列表
+        """
+        coritations = [SysMenuPo.status == "0"]
+        coritations.append(SysRolePo.status == "0")
+        coritations.append(SysRoleMenuPo.role_id.in_(role_ids))
+
+        stmt = select(SysMenuPo.perms).distinct() \
+            .join(SysRoleMenuPo, SysRoleMenuPo.menu_id == SysMenuPo.menu_id) \
+            .join(SysRolePo, SysRolePo.role_id == SysRoleMenuPo.role_id) \
+            .where(and_(*coritations))
+        return db.session.execute(stmt).scalars().all()
+
     @classmethod
     def select_menu_tree_all(cls) -> List[SysMenu]:
         """
@@ -173,6 +194,38 @@ class SysMenuMapper:
         rows = db.session.execute(stmt).all()
         return [columns.cast(row, SysMenu) for row in rows]
 
+    @classmethod
+    def select_menu_tree_by_role_ids(cls, role_ids: List[int]) -> List[SysMenu]:
+        """
+        根据角色ID列表，查询正常状态角色的菜单树
+        
+        Args:
+            role_ids (List[int]): 角色ID列表
+        
+        Returns:
+            List[SysMenu]: 菜单列表
+        """
+        fields = {
+            "menu_id", "parent_id", "menu_name", "path", "component", 
+            "query", "visible", "status", "perms", "is_frame", 
+            "is_cache", "menu_type", "icon", "order_num", "create_time"
+        }
+        columns = ColumnEntityList(SysMenuPo, fields, False)
+        
+        coritations = [SysMenuPo.status == "0"]
+        coritations.append(SysRolePo.status=="0")
+        coritations.append(SysMenuPo.menu_type.in_(['M', 'C']))
+        coritations.append(SysRoleMenuPo.role_id.in_(role_ids))
+        
+        stmt = select(*columns).distinct() \
+            .join(SysRoleMenuPo, SysRoleMenuPo.menu_id == SysMenuPo.menu_id) \
+            .join(SysRolePo, SysRolePo.role_id == SysRoleMenuPo.role_id) \
+            .where(*coritations) \
+            .order_by(SysMenuPo.parent_id, SysMenuPo.order_num)
+        
+        rows = db.session.execute(stmt).all()
+        return [columns.cast(row, SysMenu) for row in rows]
+
     @classmethod
     def select_menu_list_by_user_id(cls, menu: SysMenu, user_id: int) -> List[SysMenu]:
         """
@@ -7,6 +7,7 @@ from flask import g
 from sqlalchemy import delete, insert, select, update
 
 from ruoyi_common.sqlalchemy.model import ColumnEntityList
+from ruoyi_common.sqlalchemy.query import paginate
 from ruoyi_system.domain.entity import SysNotice
 from ruoyi_system.domain.po import SysNoticePo
 from ruoyi_admin.ext import db
@@ -54,6 +55,7 @@ class SysNoticeMapper:
         """
         if notice is None:
             stmt = select(*cls.default_columns)
+            page = None
         else:
             criterions = []
             if notice.notice_title:
@@ -70,9 +72,8 @@ class SysNoticeMapper:
                 )
             stmt = select(*cls.default_columns) \
                 .where(*criterions)
-            if "criterian_meta" in g and g.criterian_meta.page:
-                g.criterian_meta.page.stmt = stmt
-        rows = db.session.execute(stmt).all()
+            page = g.criterian_meta.page if "criterian_meta" in g else None
+        rows = paginate(stmt, page).all()
         return [cls.default_columns.cast(row,SysNotice) for row in rows]
         
     @classmethod
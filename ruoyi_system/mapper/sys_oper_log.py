@@ -9,6 +9,7 @@ from sqlalchemy import delete, insert, select
 from ruoyi_common.base.model import ExtraModel
 from ruoyi_common.sqlalchemy.model import ColumnEntityList
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_common.sqlalchemy.query import CountMode, paginate
 from ruoyi_system.domain.entity import SysOperLog
 from ruoyi_admin.ext import db
 from ruoyi_system.domain.po import SysOperLogPo
@@ -53,11 +54,9 @@ class SysOperLogMapper:
         if criterions:
             stmt = stmt.where(*criterions)
         stmt = cls._apply_sorting(stmt)
-        
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
-        
-        rows = db.session.execute(stmt).all()
+
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        rows = paginate(stmt, page, CountMode.ESTIMATED).all()
         return [cls.default_columns.cast(row, SysOperLog) for row in rows]
     
     @classmethod
@@ -7,6 +7,7 @@ from sqlalchemy import delete, insert, select, update
 
 from ruoyi_common.sqlalchemy.model import ColumnEntityList
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_common.sqlalchemy.query import paginate
 from ruoyi_system.domain.entity import SysPost
 from ruoyi_admin.ext import db
 from ruoyi_system.domain.po import SysPostPo, SysUserPo, SysUserPostPo
@@ -43,10 +44,9 @@ class SysPostMapper:
             criterions.append(SysPostPo.post_status == post.status)
 
         stmt = select(*cls.default_columns).where(*criterions)
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
 
-        rows = db.session.execute(stmt).all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        rows = paginate(stmt, page).all()
         return [cls.default_columns.cast(row, SysPost) for row in rows]
 
     @classmethod
@@ -10,6 +10,7 @@ from ruoyi_common.domain.entity import SysRole
 from ruoyi_admin.ext import db
 from ruoyi_common.sqlalchemy.model import ColumnEntityList
 from ruoyi_common.sqlalchemy.transaction import Transactional
+from ruoyi_common.sqlalchemy.query import paginate
 from ruoyi_system.domain.po import SysDeptPo, SysRolePo, SysUserPo, SysUserRolePo
 
 class SysRoleMapper:
@@ -61,10 +62,9 @@ class SysRoleMapper:
             criterions.append(g.criterian_meta.scope)
 
         stmt = cls.default_select.where(*criterions)
-        if "criterian_meta" in g and g.criterian_meta.page:
-            g.criterian_meta.page.stmt = stmt
 
-        rows = db.session.execute(stmt).all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        rows = paginate(stmt, page).all()
 
         eos = list()
         for row in rows:
@@ -9,10 +9,11 @@ from ruoyi_common.base.model import ExtraModel
 from ruoyi_common.domain.entity import SysDept, SysRole, SysUser
 from ruoyi_common.sqlalchemy.model import ColumnEntityList
 from ruoyi_common.sqlalchemy.transaction import Transactional
-from ruoyi_system.domain.po import SysDeptPo, SysRolePo, SysUserPo, \
+from ruoyi_system.domain.po import SysDeptClosurePo, SysDeptPo, SysRolePo, SysUserPo, \
     SysUserRolePo
 from ruoyi_admin.ext import db
 from ruoyi_common.utils import security_util as SecurityUtil
+from ruoyi_common.sqlalchemy.query import paginate
 
 
 class SysUserMapper:
@@ -55,10 +56,8 @@ class SysUserMapper:
         if user.phonenumber is not None and user.phonenumber != '':
             criterions.append(SysUserPo.phonenumber.like(f"%{user.phonenumber}%"))
         if user.dept_id is not None and user.dept_id != 0:
-            subquery = select(SysDeptPo.dept_id).where(or_(
-                SysDeptPo.dept_id == user.dept_id,
-                func.find_in_set(user.dept_id, SysDeptPo.ancestors)
-            )).subquery()
+            subquery = select(SysDeptClosurePo.descendant_id) \
+                .where(SysDeptClosurePo.ancestor_id == user.dept_id)
             criterions.append(SysUserPo.dept_id.in_(subquery))
         if g.criterian_meta.extra:
             extra: ExtraModel = g.criterian_meta.extra
@@ -77,10 +76,8 @@ class SysUserMapper:
         print("Generated SQL:")
         print(stmt.compile(db.session.bind, compile_kwargs={"literal_binds": True}))
 
-        if g.criterian_meta.page:
-                    g.criterian_meta.page.stmt = stmt
-
-        rows = db.session.execute(stmt).all()
+        page = g.criterian_meta.page if "criterian_meta" in g else None
+        rows = paginate(stmt, page).all()
 
         eos = list()
         for row in rows:
@@ -2,15 +2,16 @@
 # @Author  : YY
 
 from types import NoneType
-from typing import Any, List, Literal
+from typing import List, Literal, Optional
 
+from ruoyi_common.base.signal import permission_changed
 from ruoyi_common.sqlalchemy.transaction import Transactional
-from ruoyi_common.utils import security_util as SecurityUtil
+from ruoyi_common.utils import security_util as SecurityUtil, TreeUtil
 from ruoyi_common.constant import UserConstants
-from ruoyi_common.domain.entity import SysDept, SysRole, TreeSelect
+from ruoyi_common.domain.entity import SysDept, SysRole, SysUser, TreeSelect
 from ruoyi_common.exception import ServiceException
-from ruoyi_system.mapper import SysDeptMapper, SysRoleMapper
-from ruoyi_framework.descriptor.datascope import DataScope
+from ruoyi_system.mapper import SysDeptClosureMapper, SysDeptMapper, SysRoleMapper
+from ruoyi_framework.descriptor.datascope import DataScope, DataScopeEnum
 from ruoyi_admin.ext import db
 
 
@@ -55,14 +56,7 @@ class SysDeptService:
         Returns:
             List[SysDept]: 部门树列表
         """
-        return_list = []
-        temp_list = []
-        for dept in depts:
-            temp_list.append(dept.dept_id)
-        for dept in depts:
-            if dept.parent_id not in temp_list:
-                cls.recursion_fn(depts, dept)
-                return_list.append(dept)
+        return_list = TreeUtil.build_tree(depts, "dept_id")
         if not return_list:
             return_list = depts
         return return_list
@@ -186,6 +180,7 @@ class SysDeptService:
                 raise ServiceException("没有权限访问部门数据！")
             
     @classmethod
+    @Transactional(db.session)
     def insert_dept(cls, dept:SysDept) -> int:
         """
         新增部门信息
@@ -200,7 +195,10 @@ class SysDeptService:
         if not UserConstants.DEPT_NORMAL == parent.status:
             raise ServiceException("部门停用，不允许新增")
         dept.ancestors = f"{parent.ancestors},{dept.parent_id}"
-        return SysDeptMapper.insert_dept(dept)
+        dept_id = SysDeptMapper.insert_dept(dept)
+        SysDeptClosureMapper.insert_dept_closure(dept_id, dept.parent_id)
+        permission_changed.send(cls, dept_ids=[dept_id])
+        return dept_id
 
     @classmethod
     @Transactional(db.session)
@@ -221,12 +219,37 @@ class SysDeptService:
             old_ancestors = old_dept.ancestors
             dept.ancestors = new_ancestors
             cls.update_dept_children(dept.dept_id, new_ancestors, old_ancestors)
+            if old_dept.parent_id != parent_dept.dept_id:
+                SysDeptClosureMapper.move_dept_closure(dept.dept_id, parent_dept.dept_id)
+                permission_changed.send(cls, dept_ids=[dept.dept_id])
         num = SysDeptMapper.update_dept(dept)
         if UserConstants.DEPT_NORMAL == dept.status and dept.ancestors and dept.ancestors != "0":
             # 如果该部门是启用状态，则启用该部门的所有上级部门
             cls.update_parent_dept_status_normal(dept)
         return num
 
+    @classmethod
+    def select_data_scope_dept_ids(cls, user:SysUser) -> Optional[List[int]]:
+        """
+        解析用户自定义、本部门及以下数据权限覆盖的部门ID，登录时解析一次并随登录用户缓存
+
+        Args:
+            user (SysUser): 用户信息
+
+        Returns:
+            Optional[List[int]]: 部门ID列表，超级管理员不做数据权限过滤，返回None
+        """
+        if SecurityUtil.is_admin(user.user_id):
+            return None
+        ancestor_ids = []
+        role_ids = []
+        for role in user.roles or []:
+            if role.data_scope == DataScopeEnum.CUSTOM.value:
+                role_ids.append(role.role_id)
+            elif role.data_scope == DataScopeEnum.DEPT_AND_CHILD.value and user.dept_id:
+                ancestor_ids.append(user.dept_id)
+        return SysDeptClosureMapper.select_scope_dept_ids(ancestor_ids, role_ids)
+
     @classmethod
     def update_parent_dept_status_normal(cls, dept:SysDept):
         """
@@ -266,53 +289,3 @@ class SysDeptService:
             int: 数量
         """
         return SysDeptMapper.delete_dept_by_id(dept_id)
-
-    @classmethod
-    def recursion_fn(cls, list:List[SysDept], t:SysDept):
-        """
-        递归列表
-        
-        Args:
-            list (List[SysDept]): 部门列表
-            t (SysDept): 父节点
-        """
-        child_list = cls.get_child_list(list, t)
-        t.children = child_list
-        for t_child in child_list:
-            if cls.has_child(list, t_child):
-                cls.recursion_fn(list, t_child)
-
-    @classmethod
-    def get_child_list(cls, list:List[SysDept], t:SysDept) -> List[Any]:
-        """
-        获取子节点列表
-        
-        Args:
-            list (List[SysDept]): 部门列表
-            t (SysDept): 父节点
-
-        Returns:
-            List[Any]: 子节点列表
-        """
-        tlist = []
-        for n in list:
-            if n.parent_id is not None and n.parent_id==t.dept_id:
-                tlist.append(n)
-        return tlist
-
-    @classmethod
-    def has_child(cls, list:List[SysDept], t:SysDept) -> bool:
-        """
-        判断是否有子节点
-        
-        Args:
-            list (List[SysDept]): 部门列表
-            t (SysDept): 父节点
-
-        Returns:
-            bool: 是否有子节点
-        """
-        for n in list:
-            if n.parent_id is not None and n.parent_id==t.dept_id:
-                return True
-        return False
@@ -1,16 +1,19 @@
 # -*- coding: utf-8 -*-
 # @Author  : YY
 
-from typing import List, Literal, Optional, Set
+from typing import Iterable, List, Literal, Optional, Set
 
 from ruoyi_common.constant import Constants, UserConstants
+from ruoyi_common.base.signal import permission_changed
 from ruoyi_common.domain.entity import SysRole, TreeSelect
 from ruoyi_system.domain.vo import RouterMetaVo, RouterVo
 from ruoyi_system.mapper import SysMenuMapper
-from ruoyi_common.utils import security_util as SecurityUtil, StringUtil
+from ruoyi_common.utils import security_util as SecurityUtil, StringUtil, TreeUtil
 from ruoyi_common.domain.entity import SysMenu
 from ruoyi_system.mapper.sys_role import SysRoleMapper
 from ruoyi_system.mapper.sys_role_menu import SysRoleMenuMapper
+from ruoyi_framework.descriptor import custom_cacheable
+from ruoyi_admin.ext import redis_cache
 
 
 class SysMenuService:
@@ -100,6 +103,111 @@ class SysMenuService:
             eos: List[SysMenu] = SysMenuMapper.select_menu_tree_by_user_id(user_id)
         return cls.get_child_perms(eos, 0)
 
+    @classmethod
+    def get_role_key(cls, user_id:int, role_ids:Optional[Iterable[int]]) -> str:
+        '''
+        获取角色集合标识，作为权限与路由缓存的Key：
+        超级管理员为admin，其他用户为去重排序后的角色ID，无角色时为0
+
+        Args:
+            user_id(int): 用户ID
+            role_ids(Optional[Iterable[int]]): 用户角色ID列表
+
+        Returns:
+            str: 角色集合标识
+        '''
+        if SecurityUtil.is_admin(user_id):
+            return "admin"
+        ids = sorted({int(role_id) for role_id in role_ids or [] if role_id})
+        return ",".join(str(role_id) for role_id in ids) or "0"
+
+    @classmethod
+    def parse_role_key(cls, role_key:str) -> List[int]:
+        '''
+        解析角色集合标识中的角色ID
+
+        Args:
+            role_key(str): 角色集合标识
+
+        Returns:
+            List[int]: 角色ID列表，超级管理员与无角色时为空
+        '''
+        if role_key in ("admin", "0"):
+            return []
+        return [int(role_id) for role_id in role_key.split(",")]
+
+    @classmethod
+    @custom_cacheable(
+        key_prefix=Constants.ROLE_PERMS_KEY,
+        key_field="role_key",
+        expire_time=Constants.ROLE_CACHE_EXPIRE,
+    )
+    def select_menu_perms_by_role_key(cls, role_key:str) -> List[str]:
+        '''
+        根据角色集合标识，查询菜单权限列表，按角色集合缓存在Redis中
+
+        Args:
+            role_key(str): 角色集合标识
+
+        Returns:
+            List[str]: 菜单权限列表
+        '''
+        if role_key == "admin":
+            return ["*:*:*"]
+        role_ids = cls.parse_role_key(role_key)
+        if not role_ids:
+            return []
+        perms: List[str] = SysMenuMapper.select_menu_perms_by_role_ids(role_ids)
+        perm_set = set()
+        for perm in perms:
+            if perm:
+                perm_set |= set(perm.strip().split(','))
+        return sorted(perm_set)
+
+    @classmethod
+    @custom_cacheable(
+        key_prefix=Constants.ROLE_ROUTERS_KEY,
+        key_field="role_key",
+        expire_time=Constants.ROLE_CACHE_EXPIRE,
+    )
+    def select_routers_by_role_key(cls, role_key:str) -> List[RouterVo]:
+        '''
+        根据角色集合标识，构建路由列表，按角色集合缓存在Redis中
+
+        Args:
+            role_key(str): 角色集合标识
+
+        Returns:
+            List[RouterVo]: 路由列表
+        '''
+        if role_key == "admin":
+            eos: List[SysMenu] = SysMenuMapper.select_menu_tree_all()
+        else:
+            role_ids = cls.parse_role_key(role_key)
+            eos: List[SysMenu] = SysMenuMapper.select_menu_tree_by_role_ids(role_ids) \
+                if role_ids else []
+        return cls.build_menus(cls.get_child_perms(eos, 0))
+
+    @classmethod
+    def evict_role_cache(cls, role_ids:Optional[Iterable[int]]=None):
+        '''
+        清理角色集合的权限与路由缓存，指定角色ID时只清理包含这些角色的集合，
+        否则全部清理（菜单变更会影响所有角色集合）
+
+        Args:
+            role_ids(Optional[Iterable[int]]): 变更的角色ID列表
+        '''
+        targets = {int(role_id) for role_id in role_ids} if role_ids is not None else None
+        for prefix in (Constants.ROLE_PERMS_KEY, Constants.ROLE_ROUTERS_KEY):
+            keys = []
+            for key in redis_cache.scan_iter(match=f"{prefix}:*", count=200):
+                role_key = key.decode() if isinstance(key, bytes) else key
+                role_key = role_key[len(prefix) + 1:]
+                if targets is None or not targets.isdisjoint(cls.parse_role_key(role_key)):
+                    keys.append(key)
+            if keys:
+                redis_cache.delete(*keys)
+
     @classmethod
     def select_menu_list_by_role_id(cls, role_id:int):
         '''
@@ -283,14 +391,7 @@ class SysMenuService:
         Returns:
             List[SysMenu]: 菜单树结构
         '''
-        return_list = []
-        temp_list = []
-        for menu in menus:
-            temp_list.append(menu.menu_id)
-        for menu in menus:
-            if menu.parent_id not in temp_list:
-                cls.recursion_fn(menus, menu)
-                return_list.append(menu)
+        return_list = TreeUtil.build_tree(menus, "menu_id")
         if not return_list:
             return_list = menus
         return return_list
@@ -361,7 +462,9 @@ class SysMenuService:
         Returns:
             int: 新增菜单ID
         '''
-        return SysMenuMapper.insert_menu(menu)
+        menu_id = SysMenuMapper.insert_menu(menu)
+        permission_changed.send(cls, menu_ids=[menu_id])
+        return menu_id
 
     @classmethod
     def update_menu(cls, menu:SysMenu) -> int:
@@ -374,7 +477,9 @@ class SysMenuService:
         Returns:
             int: 修改菜单的数量
         '''
-        return SysMenuMapper.update_menu(menu)
+        num = SysMenuMapper.update_menu(menu)
+        permission_changed.send(cls, menu_ids=[menu.menu_id])
+        return num
 
     @classmethod
     def delete_menu_by_id(cls, menu_id:int) -> int:
@@ -387,7 +492,9 @@ class SysMenuService:
         Returns:
             int: 删除菜单的数量
         '''
-        return SysMenuMapper.delete_menu_by_id(menu_id)
+        num = SysMenuMapper.delete_menu_by_id(menu_id)
+        permission_changed.send(cls, menu_ids=[menu_id])
+        return num
 
     @classmethod
     def check_menu_name_unique(cls, menu:SysMenu) -> Literal["0","1"]:
@@ -438,62 +545,7 @@ class SysMenuService:
         Returns:
             List[SysMenu]: 子菜单列表
         '''
-        return_list = []
-        for menu in menus:
-            if menu.parent_id == parent_id:
-                cls.recursion_fn(menus, menu)
-                return_list.append(menu)
-        return return_list
-
-    @classmethod
-    def recursion_fn(cls, list:List[SysMenu], t:SysMenu):
-        """
-        递归菜单列表
-
-        Args:
-            list(List[SysMenu]): 菜单列表
-            t(SysMenu): 父菜单信息
-        """
-        child_list = cls.get_child_list(list, t)
-        t.children = child_list
-        for t_child in child_list:
-            if cls.has_child(list, t_child):
-                cls.recursion_fn(list, t_child)
-
-    @classmethod
-    def get_child_list(cls, list:List[SysMenu], t:SysMenu) -> List[SysMenu]:
-        """
-        子菜单列表
-
-        Args:
-            list(List[SysMenu]): 菜单列表
-            t(SysMenu): 父菜单信息
-
-        Returns:
-            List[SysMenu]: 子菜单列表
-        """
-        tlist = []
-        for n in list:
-            if n.parent_id is not None and n.parent_id == t.menu_id:
-                tlist.append(n)
-        return tlist
-
-    @classmethod
-    def has_child(cls, list:List[SysMenu], t:SysMenu) -> bool:
-        """
-        判断是否有子菜单
-
-        Args:
-            list(List[SysMenu]): 菜单列表
-            t(SysMenu): 父菜单信息
-
-        Returns:
-            bool: 是否有子菜单
-        """
-        for n in list:
-            if n.parent_id is not None and n.parent_id==t.menu_id:
-                return True
-        return False
+        return TreeUtil.build_tree(menus, "menu_id", root_id=parent_id)
 
     @classmethod
     def inner_link_replace_each(cls, path:str) -> str:
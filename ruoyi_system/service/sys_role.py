@@ -4,6 +4,7 @@
 from typing import List, Literal, Optional
 
 from ruoyi_common.constant import UserConstants
+from ruoyi_common.base.signal import permission_changed
 from ruoyi_common.domain.entity import SysRole
 from ruoyi_common.sqlalchemy.transaction import Transactional
 from ruoyi_common.exception import ServiceException
@@ -226,7 +227,9 @@ class SysRoleService:
         """
         SysRoleMapper.update_role(role)
         SysRoleMenuMapper.delete_role_menu_by_role_id(role.role_id)
-        return cls.insert_role_menu(role) > 0
+        flag = cls.insert_role_menu(role) > 0
+        permission_changed.send(cls, role_ids=[role.role_id])
+        return flag
 
     @classmethod
     @Transactional(db.session)
@@ -240,7 +243,9 @@ class SysRoleService:
         Returns:
             bool: 修改结果
         """
-        return SysRoleMapper.update_role(role) > 0
+        flag = SysRoleMapper.update_role(role) > 0
+        permission_changed.send(cls, role_ids=[role.role_id])
+        return flag
 
     @classmethod
     @Transactional(db.session)
@@ -258,6 +263,7 @@ class SysRoleService:
         SysRoleMapper.update_role(role)
         # 2. 清理原有角色-部门关联
         SysRoleDeptMapper.delete_role_dept_by_role_id(role.role_id)
+        permission_changed.send(cls, role_ids=[role.role_id])
         # 3. 只有“自定义数据权限”(通常为 '2') 时才维护角色-部门表
         # 其他类型的数据范围（全部、本部门、本部门及以下、仅本人）都不需要 sys_role_dept 记录
         if role.data_scope == "2" and role.dept_ids:
@@ -320,7 +326,9 @@ class SysRoleService:
         """
         SysRoleMenuMapper.delete_role_menu_by_role_id(role_id)
         SysRoleDeptMapper.delete_role_dept_by_role_id(role_id)
-        return SysRoleMapper.delete_role_by_id(role_id)  > 0
+        flag = SysRoleMapper.delete_role_by_id(role_id)  > 0
+        permission_changed.send(cls, role_ids=[role_id])
+        return flag
 
     @classmethod
     @Transactional(db.session)
@@ -342,7 +350,9 @@ class SysRoleService:
                 raise ServiceException("角色{}已分配用户，不能删除".format(role.role_name))
         SysRoleMenuMapper.delete_role_menu(role_ids)
         SysRoleDeptMapper.delete_role_dept(role_ids)
-        return SysRoleMapper.delete_role_by_ids(role_ids) > 0
+        flag = SysRoleMapper.delete_role_by_ids(role_ids) > 0
+        permission_changed.send(cls, role_ids=role_ids)
+        return flag
 
     @classmethod
     @Transactional(db.session)
@@ -356,7 +366,9 @@ class SysRoleService:
         Returns:
             bool: 取消授权结果
         """
-        return SysUserRoleMapper.delete_user_role_info(user_role) > 0
+        flag = SysUserRoleMapper.delete_user_role_info(user_role) > 0
+        permission_changed.send(cls, user_ids=[user_role.user_id])
+        return flag
 
     @classmethod
     @Transactional(db.session)
@@ -371,7 +383,9 @@ class SysRoleService:
         Returns:
             bool: 取消授权结果
         """
-        return SysUserRoleMapper.delete_user_role_infos(role_id, user_ids) > 0
+        flag = SysUserRoleMapper.delete_user_role_infos(role_id, user_ids) > 0
+        permission_changed.send(cls, user_ids=user_ids)
+        return flag
 
     @classmethod
     @Transactional(db.session)
@@ -389,6 +403,7 @@ class SysRoleService:
         user_roles = [SysUserRole(user_id=user_id, role_id=role_id) \
             for user_id in user_ids]
         num = SysUserRoleMapper.batch_user_role(user_roles)
+        permission_changed.send(cls, user_ids=user_ids)
         return num > 0
     
 
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import List, Literal, Optional
 
 from ruoyi_common.constant import UserConstants
+from ruoyi_common.base.signal import permission_changed
 from ruoyi_common.exception import ServiceException
 from ruoyi_common.sqlalchemy.transaction import Transactional
 from ruoyi_common.domain.entity import SysRole, SysUser
@@ -267,7 +268,9 @@ class SysUserService:
         SysUserPostMapper.delete_user_post_by_user_id(user.user_id)
         # 新增用户岗位关联
         cls.insert_user_post_by_user(user)
-        return SysUserMapper.update_user(user)
+        flag = SysUserMapper.update_user(user)
+        permission_changed.send(cls, user_ids=[user.user_id])
+        return flag
 
     @classmethod
     def update_user_login_info(cls, user: SysUser) -> bool:
@@ -294,6 +297,7 @@ class SysUserService:
             role_ids: 角色id列表
         """
         cls.insert_user_role(user_id, role_ids)
+        permission_changed.send(cls, user_ids=[user_id])
 
     @classmethod
     @Transactional(db.session)
@@ -469,6 +473,7 @@ class SysUserService:
         """
         SysUserRoleMapper.delete_user_role_by_user_id(user_id)
         cls.insert_user_role(user_id, role_ids)
+        permission_changed.send(cls, user_ids=[user_id])
         return True
 
     @classmethod
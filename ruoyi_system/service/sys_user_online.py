@@ -141,5 +141,6 @@ class SysUserOnlineService:
         Returns:
             bool: 是否成功
         """
-        redis_cache.delete(Constants.LOGIN_TOKEN_KEY + token_id)
+        # 同时删除token版本号，各进程缓存的登录用户随之失效
+        redis_cache.delete(Constants.LOGIN_TOKEN_KEY + token_id, Constants.LOGIN_TOKEN_VERSION_KEY + token_id)
         return True